@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, Float, String, Date, DateTime, Text, JSON, Boolean, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.ext.mutable import MutableDict, MutableList
 from sqlalchemy.orm import relationship
@@ -23,9 +23,11 @@ class Assessment(Base):
     learning_velocity = Column(Integer, default=0)  # Skills learned per month
     career_transition_probability = Column(MutableDict.as_mutable(JSON), default=dict)  # Career path probabilities
     ai_generated_insights = Column(MutableList.as_mutable(JSON), default=list)  # AI insights
+    matches_version = Column(Integer)  # SCORING_VERSION of the user's materialized job matches, NULL when stale
+    dashboard_version = Column(Integer, default=0)  # bumped when dashboard inputs change; part of the dashboard cache key
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)  # benchmark sync watermark
     
     # Add relationship
     user = relationship("User", back_populates="assessments")
@@ -59,15 +61,24 @@ class UserSkill(Base):
 
 class JobMatch(Base):
     __tablename__ = "job_matches"
+    __table_args__ = (
+        UniqueConstraint("user_id", "job_id", name="uq_job_matches_user_job"),
+        Index("ix_job_matches_user_rank", "user_id", "rank_key"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
-    match_score = Column(Integer)  # DECIMAL(5,2) stored as Integer (score 0-100)
+    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False, index=True)
+    match_score = Column(Float)  # 0-100, one decimal
+    rank_key = Column(BigInteger)  # MatchScores.rank_keys(); ascending == best first
+    score_breakdown = Column(JSON)  # calculate_score_breakdown output
+    score_signals = Column(JSON)  # experience_match, location/interest bonus, preliminary_score
+    scoring_version = Column(Integer)  # SCORING_VERSION that produced the row
     skill_gaps = Column(MutableList.as_mutable(JSON), default=list)
     match_reasons = Column(MutableList.as_mutable(JSON), default=list)  # Text array stored as JSON
     recommended = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Add relationships
     user = relationship("User", back_populates="job_matches")
@@ -143,3 +154,35 @@ class LearningProgress(Base):
     # Add relationships
     learning_path = relationship("LearningPath", back_populates="progress")
     resource = relationship("LearningResource", back_populates="progress")
+
+
+class LearningActivity(Base):
+    """Append-only log of learning time; the rollup tables below are kept in step on write"""
+    __tablename__ = "learning_activity"
+    __table_args__ = (
+        Index("ix_learning_activity_user_time", "user_id", "occurred_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    resource_id = Column(Integer, ForeignKey("learning_resources.id"))
+    delta_minutes = Column(Integer, nullable=False)
+    occurred_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class LearningActivityDaily(Base):
+    """Learning minutes per user and UTC day"""
+    __tablename__ = "learning_activity_daily"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    minutes = Column(Integer, nullable=False, default=0)
+
+
+class LearningActivityWeekly(Base):
+    """Learning minutes per user and week, keyed by the week's Monday"""
+    __tablename__ = "learning_activity_weekly"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    week_start = Column(Date, primary_key=True)
+    minutes = Column(Integer, nullable=False, default=0)
@@ -1,20 +1,29 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Boolean, UniqueConstraint
 from sqlalchemy.sql import func
-from sqlalchemy.ext.mutable import MutableList
+from sqlalchemy.ext.mutable import MutableDict, MutableList
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        UniqueConstraint("source", "source_url", name="uq_jobs_source_url"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(500), nullable=False, index=True)
     company = Column(String(255), nullable=False, index=True)
+    headline = Column(String(500))
     description = Column(Text)
     requirements = Column(Text)
     location = Column(String(255))
     salary = Column(String(100))
+    # Parsed from salary on write; amounts are annualized
+    salary_min = Column(Integer, index=True)
+    salary_max = Column(Integer, index=True)
+    salary_currency = Column(String(3))
+    salary_period = Column(String(10))  # year, month, week, day, hour as posted
     job_type = Column(String(100))  # Full-time, Part-time, Contract, etc.
     remote_status = Column(String(50))  # Remote, On-site, Hybrid
     experience_level = Column(String(100))  # Entry Level, Mid Level, Senior Level
@@ -23,7 +32,17 @@ class Job(Base):
     required_skills = Column(MutableList.as_mutable(JSON), default=list)  # Array of required skills
     preferred_skills = Column(MutableList.as_mutable(JSON), default=list)  # Array of preferred skills
     benefits = Column(MutableList.as_mutable(JSON), default=list)  # Array of benefits
+    company_stage = Column(String(50))  # Seed, Series A, Series B, Private, etc.
+    team_size = Column(Integer)
+    culture_values = Column(MutableList.as_mutable(JSON), default=list)  # Array of culture tags
+    growth_signals = Column(MutableDict.as_mutable(JSON), default=dict)  # revenue_growth, headcount_growth, runway_months
+    # Derived features, recomputed on write only when features_fingerprint changes
+    culture_analysis = Column(JSON)  # culture type -> "high" / "medium"
+    growth_potential = Column(JSON)  # evaluate_growth_potential output
+    salary_position = Column(String(20))  # above_average, average, below_average
+    features_fingerprint = Column(String(40))  # sha1 of the fields the features read
     is_active = Column(Boolean, default=True)
+    import_run_id = Column(String(32), index=True)  # Last bulk import run that wrote this row
     posted_at = Column(DateTime(timezone=True))
     expires_at = Column(DateTime(timezone=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,10 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
+from functools import cached_property
 from app.core.database import get_db
-from app.models.assessment import Assessment, UserSkill, LearningPath, JobMatch
+from app.models.assessment import Assessment, UserSkill, LearningPath
+from app.services.benchmark_percentiles import benchmark_index, experience_level_of, user_metrics
 from app.services.career_intelligence import CareerIntelligenceService
+from app.services.dashboard_cache import dashboard_cache
+from app.services.learning_activity import ActivitySummary, load_activity_summaries, path_total_hours
+from app.services.market_data import MarketSnapshot, market_data
+from app.services.response_sections import SectionRegistry, SectionRun
+from app.services.skill_canonicalizer import skill_canonicalizer
+from app.services.skill_taxonomy import skill_taxonomy
+from app.services.skill_trajectory import store_trajectories, stored_trajectories
+from app.services.user_context import UserContext
 
 router = APIRouter()
 
@@ -13,9 +23,183 @@ def get_career_intelligence_service(db: Session = Depends(get_db)) -> CareerInte
     return CareerIntelligenceService(db)
 
 
+# Dashboard sections of a user without an assessment
+EMPTY_DASHBOARD_SECTIONS: Dict[str, Any] = {
+    "market_readiness_score": 0,
+    "skill_gaps": {
+        "total_gaps": 0,
+        "critical_gaps": 0,
+        "total_learning_hours": 0,
+        "gaps": [],
+        "categories_with_gaps": [],
+        "skills_covered": 0,
+        "skills_required": 0,
+    },
+    "market_pulse": {
+        "trending_skills": [],
+        "opportunities": [],
+        "market_alignment_score": 0,
+        "current_salary_premium": 0,
+        "potential_salary_premium": 0,
+        "salary_benchmark": {"min": 0, "avg": 0, "max": 0},
+        "experience_level": "Entry Level (0-2 years)",
+        "demand_signals": {
+            "high_demand_skills_count": 0,
+            "growing_skills_count": 0,
+            "market_opportunities": 0,
+        },
+    },
+    "progress_velocity": {
+        "paths_completed": 0,
+        "paths_in_progress": 0,
+        "paths_total": 0,
+        "average_completion_rate": 0,
+        "skills_acquired_last_30_days": 0,
+        "learning_velocity": 0,
+        "hours_learned_last_30_days": 0,
+        "weekly_learning_hours": 0,
+        "total_hours_completed": 0,
+        "total_hours_planned": 0,
+        "projected_completion_date": None,
+    },
+    "benchmarks": {
+        "experience_level": "Entry Level (0-2 years)",
+        "user_metrics": {
+            "skills_count": 0,
+            "avg_match_score": 0,
+            "learning_paths_count": 0,
+            "avg_completion_rate": 0,
+        },
+        "industry_benchmarks": {
+            "avg_skills": 5,
+            "avg_match_score": 65,
+            "avg_learning_paths": 2,
+            "avg_completion_rate": 45,
+        },
+        "percentile_rankings": {
+            "skills": 0,
+            "match_score": 0,
+            "learning_paths": 0,
+            "completion_rate": 0,
+            "overall": 0,
+        },
+        "comparison": {
+            "skills_vs_peers": "below",
+            "match_score_vs_peers": "below",
+            "learning_paths_vs_peers": "below",
+            "completion_rate_vs_peers": "below",
+        },
+    },
+    "skill_trajectories": {},
+    "predictive_summary": {
+        "promotion_probability": 0,
+        "time_to_promotion": "N/A",
+        "security_score": 0,
+        "automation_risk": 0,
+        "pivot_readiness": 0,
+        "time_to_pivot": "N/A",
+    },
+}
+
+
+class DashboardContext:
+    """Per-request dashboard inputs, loaded on first use by a section that needs them.
+
+    The user's rows are loaded once into a UserContext shared by the
+    dashboard calculations and every CareerIntelligenceService analysis.
+    """
+
+    def __init__(self, db: Session, user_id: int, assessment: Assessment, market: MarketSnapshot):
+        self.db = db
+        self.user_id = user_id
+        self.assessment = assessment
+        self.market = market  # one market data version for every section of the request
+        self.current_year = datetime.now().year
+
+    @cached_property
+    def user_context(self) -> UserContext:
+        return UserContext.load(self.db, self.user_id, self.assessment)
+
+    @property
+    def user_skills_data(self) -> List[UserSkill]:
+        return self.user_context.skills
+
+    @cached_property
+    def user_skills(self) -> Dict[str, str]:
+        return self.user_context.skill_levels
+
+    @property
+    def learning_paths(self) -> List[LearningPath]:
+        return self.user_context.learning_paths
+
+    @property
+    def match_scores(self) -> List[float]:
+        return self.user_context.match_scores
+
+    @cached_property
+    def intelligence_service(self) -> CareerIntelligenceService:
+        return CareerIntelligenceService(self.db)
+
+    @cached_property
+    def learning_activity(self) -> ActivitySummary:
+        return load_activity_summaries(self.db, [self.user_id])[self.user_id]
+
+    @cached_property
+    def peer_percentiles(self) -> Dict[str, float]:
+        """Percentiles of the user's benchmark metrics among peers of the same experience level"""
+        metrics = user_metrics(len(self.user_skills), self.match_scores, self.learning_paths)
+        return benchmark_index.percentiles(experience_level_of(self.assessment), metrics)
+
+
+def build_predictive_summary(context: DashboardContext) -> Dict[str, Any]:
+    """Headline predictive numbers; errors from the service count as zero / N/A"""
+    service = context.intelligence_service
+    promotion = service.calculate_promotion_probability(context.user_id, context=context.user_context)
+    security = service.calculate_job_security_signals(context.user_id, context=context.user_context)
+    pivot = service.calculate_pivot_readiness(context.user_id, context=context.user_context)
+    
+    return {
+        "promotion_probability": promotion.get("promotion_probability", 0) if "error" not in promotion else 0,
+        "time_to_promotion": promotion.get("time_to_promotion", "N/A") if "error" not in promotion else "N/A",
+        "security_score": security.get("security_score", 0) if "error" not in security else 0,
+        "automation_risk": security.get("automation_risk", 0) if "error" not in security else 0,
+        "pivot_readiness": pivot.get("overall_readiness", 0) if "error" not in pivot else 0,
+        "time_to_pivot": pivot.get("time_to_pivot", "N/A") if "error" not in pivot else "N/A",
+    }
+
+
+# Dashboard sections, in response order
+dashboard_sections = SectionRegistry([
+    ("market_readiness_score", lambda ctx: ctx.intelligence_service.calculate_market_readiness_score(ctx.user_id, ctx.user_context)),
+    ("skill_gaps", lambda ctx: calculate_skill_gaps(ctx.user_skills, ctx.assessment, ctx.market)),
+    ("market_pulse", lambda ctx: calculate_market_pulse(ctx.user_skills, ctx.assessment, ctx.market)),
+    ("progress_velocity", lambda ctx: calculate_progress_velocity(ctx.learning_paths, ctx.user_skills_data, ctx.learning_activity)),
+    ("benchmarks", lambda ctx: calculate_benchmarks(ctx.user_skills, ctx.assessment, ctx.learning_paths, ctx.match_scores, ctx.peer_percentiles)),
+    ("skill_trajectories", lambda ctx: ctx.intelligence_service.generate_skill_trajectory_predictions(
+        ctx.user_id, ctx.user_context, ctx.market, ctx.current_year, store=False
+    )),
+    ("predictive_summary", build_predictive_summary),
+])
+
+
 @router.get("/{user_id}")
-async def get_dashboard(user_id: str, db: Session = Depends(get_db)):
-    """Get comprehensive career intelligence dashboard"""
+async def get_dashboard(
+    user_id: str,
+    fields: Optional[str] = Query(None, description="Comma-separated dashboard sections to return (default: all)"),
+    include: Optional[str] = Query(None, description="Alias of fields; both lists are combined"),
+    response: Response = None,
+    db: Session = Depends(get_db)
+):
+    """Get comprehensive career intelligence dashboard.
+
+    ``fields``/``include`` limit the response to the named sections, and
+    only those sections are computed. Results are cached per user until
+    their skills, assessment or learning progress change.
+
+    Sections are computed concurrently off the event loop; one that times
+    out or fails returns its empty state. Per-section durations are sent
+    in the ``Server-Timing`` header.
+    """
     
     # Convert string user_id to integer
     try:
@@ -23,6 +207,11 @@ async def get_dashboard(user_id: str, db: Session = Depends(get_db)):
     except (ValueError, TypeError):
         raise HTTPException(status_code=400, detail=f"Invalid user_id: {user_id}")
     
+    try:
+        sections = dashboard_sections.select(fields, include)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     # Get user assessment
     assessment = db.query(Assessment).filter(Assessment.user_id == user_id_int).first()
     if not assessment:
@@ -30,155 +219,65 @@ async def get_dashboard(user_id: str, db: Session = Depends(get_db)):
         return {
             "user_id": user_id_int,
             "has_assessment": False,
-            "market_readiness_score": 0,
-            "skill_gaps": {
-                "total_gaps": 0,
-                "critical_gaps": 0,
-                "total_learning_hours": 0,
-                "gaps": [],
-                "categories_with_gaps": [],
-                "skills_covered": 0,
-                "skills_required": 0,
-            },
-            "market_pulse": {
-                "trending_skills": [],
-                "opportunities": [],
-                "market_alignment_score": 0,
-                "current_salary_premium": 0,
-                "potential_salary_premium": 0,
-                "salary_benchmark": {"min": 0, "avg": 0, "max": 0},
-                "experience_level": "Entry Level (0-2 years)",
-                "demand_signals": {
-                    "high_demand_skills_count": 0,
-                    "growing_skills_count": 0,
-                    "market_opportunities": 0,
-                },
-            },
-            "progress_velocity": {
-                "paths_completed": 0,
-                "paths_in_progress": 0,
-                "paths_total": 0,
-                "average_completion_rate": 0,
-                "skills_acquired_last_30_days": 0,
-                "learning_velocity": 0,
-                "hours_learned_last_30_days": 0,
-                "total_hours_completed": 0,
-                "total_hours_planned": 0,
-                "projected_completion_date": None,
-            },
-            "benchmarks": {
-                "experience_level": "Entry Level (0-2 years)",
-                "user_metrics": {
-                    "skills_count": 0,
-                    "avg_match_score": 0,
-                    "learning_paths_count": 0,
-                    "avg_completion_rate": 0,
-                },
-                "industry_benchmarks": {
-                    "avg_skills": 5,
-                    "avg_match_score": 65,
-                    "avg_learning_paths": 2,
-                    "avg_completion_rate": 45,
-                },
-                "percentile_rankings": {
-                    "skills": 0,
-                    "match_score": 0,
-                    "learning_paths": 0,
-                    "completion_rate": 0,
-                    "overall": 0,
-                },
-                "comparison": {
-                    "skills_vs_peers": "below",
-                    "match_score_vs_peers": "below",
-                    "learning_paths_vs_peers": "below",
-                    "completion_rate_vs_peers": "below",
-                },
-            },
-            "skill_trajectories": {},
-            "predictive_summary": {
-                "promotion_probability": 0,
-                "time_to_promotion": "N/A",
-                "security_score": 0,
-                "automation_risk": 0,
-                "pivot_readiness": 0,
-                "time_to_pivot": "N/A",
-            },
+            **{name: EMPTY_DASHBOARD_SECTIONS[name] for name in sections},
             "last_updated": datetime.now().isoformat(),
         }
     
-    # Get user skills
-    user_skills_data = db.query(UserSkill).filter(UserSkill.user_id == user_id_int).all()
-    user_skills = {skill.skill_name: skill.proficiency_level for skill in user_skills_data}
-    
-    # Get learning paths
-    learning_paths = db.query(LearningPath).filter(LearningPath.user_id == user_id_int).all()
-    
-    # Get job matches
-    job_matches = db.query(JobMatch).filter(JobMatch.user_id == user_id_int).all()
-    
-    # Initialize career intelligence service
-    intelligence_service = CareerIntelligenceService(db)
-    
-    # Calculate skill gap metrics
-    skill_gaps = calculate_skill_gaps(user_skills, assessment)
-    
-    # Get market pulse
-    market_pulse = calculate_market_pulse(user_skills, assessment)
-    
-    # Calculate progress velocity
-    progress_velocity = calculate_progress_velocity(learning_paths, user_skills_data)
-    
-    # Get benchmarks
-    benchmarks = calculate_benchmarks(user_skills, assessment, learning_paths, job_matches)
-    
-    # Get market readiness score
-    market_readiness = intelligence_service.calculate_market_readiness_score(user_id_int)
-    
-    # Get skill trajectory predictions
-    skill_trajectories = intelligence_service.generate_skill_trajectory_predictions(user_id_int)
-    
-    # Get predictive analytics summary
-    promotion = intelligence_service.calculate_promotion_probability(user_id_int)
-    security = intelligence_service.calculate_job_security_signals(user_id_int)
-    pivot = intelligence_service.calculate_pivot_readiness(user_id_int)
-    
-    # Extract summary data (handle errors gracefully)
-    predictive_summary = {
-        "promotion_probability": promotion.get("promotion_probability", 0) if "error" not in promotion else 0,
-        "time_to_promotion": promotion.get("time_to_promotion", "N/A") if "error" not in promotion else "N/A",
-        "security_score": security.get("security_score", 0) if "error" not in security else 0,
-        "automation_risk": security.get("automation_risk", 0) if "error" not in security else 0,
-        "pivot_readiness": pivot.get("overall_readiness", 0) if "error" not in pivot else 0,
-        "time_to_pivot": pivot.get("time_to_pivot", "N/A") if "error" not in pivot else "N/A",
-    }
-    
-    return {
+    market = market_data.current()
+    cache_key = dashboard_cache.key(user_id_int, assessment.dashboard_version, sections, market.version)
+    cached = dashboard_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    context = DashboardContext(db, user_id_int, assessment, market)
+    # All database reads happen here; the section builders only compute
+    context.user_context
+    if "progress_velocity" in sections:
+        context.learning_activity
+    if "benchmarks" in sections:
+        benchmark_index.sync(db)
+    section_run = await dashboard_sections.build_concurrently(context, sections, EMPTY_DASHBOARD_SECTIONS)
+    if response is not None:
+        response.headers["Server-Timing"] = section_run.server_timing()
+    store_skill_trajectories(db, context, section_run)
+
+    dashboard = {
         "user_id": user_id_int,
         "has_assessment": True,
-        "market_readiness_score": market_readiness,
-        "skill_gaps": skill_gaps,
-        "market_pulse": market_pulse,
-        "progress_velocity": progress_velocity,
-        "benchmarks": benchmarks,
-        "skill_trajectories": skill_trajectories,
-        "predictive_summary": predictive_summary,
+        **section_run.values,
         "last_updated": datetime.now().isoformat()
     }
+    # A degraded dashboard is served once, not cached
+    if not section_run.degraded:
+        dashboard_cache.set(cache_key, dashboard)
+    return dashboard
+
 
+def store_skill_trajectories(db: Session, context: DashboardContext, section_run: SectionRun) -> None:
+    """Store trajectories the skill_trajectories section recomputed, on the request thread.
 
-def calculate_skill_gaps(user_skills: Dict[str, str], assessment: Assessment) -> Dict[str, Any]:
+    Builders never write, so only a section that finished is stored. A
+    timed-out builder may still be reading the assessment in the pool, and
+    committing would expire it under that thread, so nothing is stored
+    until a later request completes in time.
+    """
+    if "skill_trajectories" not in section_run.values or "skill_trajectories" in section_run.degraded:
+        return
+    if "timeout" in section_run.degraded.values():
+        return
+    assessment = context.assessment
+    if stored_trajectories(assessment, context.current_year, context.market) is not None:
+        return
+    store_trajectories(assessment, section_run.values["skill_trajectories"], context.current_year, context.market)
+    db.commit()
+
+
+def calculate_skill_gaps(user_skills: Dict[str, str], assessment: Assessment, market: MarketSnapshot) -> Dict[str, Any]:
     """Calculate skill gap metrics"""
     
     # In-demand skills by category (mock data - would come from market APIs)
-    in_demand_skills = {
-        "Frontend": ["React", "TypeScript", "Next.js", "Vue.js", "Angular"],
-        "Backend": ["Python", "Node.js", "Go", "Java", "Rust"],
-        "DevOps": ["AWS", "Docker", "Kubernetes", "Terraform", "CI/CD"],
-        "Data": ["Python", "SQL", "MongoDB", "PostgreSQL", "Redis"],
-        "AI/ML": ["Python", "TensorFlow", "PyTorch", "Machine Learning", "Data Science"],
-        "Mobile": ["React Native", "Flutter", "Swift", "Kotlin"],
-        "Security": ["Cybersecurity", "Encryption", "Penetration Testing"]
-    }
+    in_demand = skill_taxonomy["in_demand"]
+    in_demand_skills = {in_demand.category_name(category_id): in_demand.skills(category_id) for category_id in in_demand.category_ids}
     
     # Get user's career interests to prioritize relevant skills
     career_interests = assessment.career_interests or {}
@@ -201,21 +300,21 @@ def calculate_skill_gaps(user_skills: Dict[str, str], assessment: Assessment) ->
     
     # Find gaps
     gaps = []
-    user_skill_names = set(user_skills.keys())
+    user_skill_ids = skill_canonicalizer.id_set(user_skills)
     
     for category in priority_categories:
         category_skills = in_demand_skills.get(category, [])
         for skill in category_skills:
-            if skill not in user_skill_names:
+            if skill_canonicalizer.skill_id(skill) not in user_skill_ids:
                 # Calculate market value for this skill
-                market_value = calculate_skill_market_value(skill, category)
+                market_value = calculate_skill_market_value(skill, category, market)
                 gaps.append({
                     "skill": skill,
                     "category": category,
                     "market_value": market_value,
                     "priority": "high" if market_value > 80 else "medium" if market_value > 60 else "low",
-                    "estimated_learning_hours": estimate_learning_hours(skill),
-                    "salary_impact": estimate_salary_impact(skill, category)
+                    "estimated_learning_hours": estimate_learning_hours(skill, market),
+                    "salary_impact": estimate_salary_impact(skill, category, market)
                 })
     
     # Sort by market value and priority
@@ -232,71 +331,39 @@ def calculate_skill_gaps(user_skills: Dict[str, str], assessment: Assessment) ->
         "total_learning_hours": total_learning_hours,
         "gaps": gaps[:10],  # Top 10 gaps
         "categories_with_gaps": list(set(g["category"] for g in gaps)),
-        "skills_covered": len(user_skill_names),
+        "skills_covered": len(user_skills),
         "skills_required": len(set().union(*[in_demand_skills.get(cat, []) for cat in priority_categories]))
     }
 
 
-def calculate_skill_market_value(skill: str, category: str) -> int:
+def calculate_skill_market_value(skill: str, category: str, market: MarketSnapshot) -> int:
     """Calculate market value score for a skill (0-100)"""
-    # Mock market value data
-    high_value_skills = {
-        "React": 95, "TypeScript": 92, "Python": 90, "AWS": 88, "Docker": 85,
-        "Kubernetes": 87, "Machine Learning": 94, "TensorFlow": 91, "Node.js": 86,
-        "Go": 84, "Rust": 83, "GraphQL": 82, "Next.js": 89
-    }
-    
-    return high_value_skills.get(skill, 70)
+    return market.skill_figure("market_value", skill)
 
 
-def estimate_learning_hours(skill: str) -> int:
+def estimate_learning_hours(skill: str, market: MarketSnapshot) -> int:
     """Estimate learning hours for a skill"""
-    # Mock estimates based on skill complexity
-    estimates = {
-        "React": 80, "TypeScript": 60, "Python": 100, "AWS": 120, "Docker": 40,
-        "Kubernetes": 80, "Machine Learning": 150, "TensorFlow": 100, "Node.js": 60,
-        "Go": 70, "Rust": 90, "GraphQL": 40, "Next.js": 50
-    }
-    
-    return estimates.get(skill, 60)
+    return market.skill_figure("learning_hours", skill)
 
 
-def estimate_salary_impact(skill: str, category: str) -> int:
+def estimate_salary_impact(skill: str, category: str, market: MarketSnapshot) -> int:
     """Estimate salary impact in dollars"""
-    # Mock salary impact data
-    impact_map = {
-        "React": 8000, "TypeScript": 10000, "Python": 12000, "AWS": 15000,
-        "Docker": 8000, "Kubernetes": 12000, "Machine Learning": 20000,
-        "TensorFlow": 18000, "Node.js": 7000, "Go": 10000, "Rust": 12000,
-        "GraphQL": 6000, "Next.js": 9000
-    }
-    
-    return impact_map.get(skill, 5000)
+    return market.skill_figure("salary_impact", skill)
 
 
-def calculate_market_pulse(user_skills: Dict[str, str], assessment: Assessment) -> Dict[str, Any]:
+def calculate_market_pulse(user_skills: Dict[str, str], assessment: Assessment, market: MarketSnapshot) -> Dict[str, Any]:
     """Calculate market pulse - trending skills, salary insights, demand signals"""
     
-    # Mock market data (would come from real market APIs)
-    trending_skills = [
-        {"skill": "React", "growth": 0.15, "demand": 95, "salary_premium": 8000},
-        {"skill": "TypeScript", "growth": 0.18, "demand": 92, "salary_premium": 10000},
-        {"skill": "Python", "growth": 0.12, "demand": 88, "salary_premium": 12000},
-        {"skill": "AWS", "growth": 0.25, "demand": 90, "salary_premium": 15000},
-        {"skill": "Docker", "growth": 0.20, "demand": 85, "salary_premium": 8000},
-        {"skill": "Kubernetes", "growth": 0.22, "demand": 87, "salary_premium": 12000},
-        {"skill": "Machine Learning", "growth": 0.35, "demand": 94, "salary_premium": 20000},
-        {"skill": "GraphQL", "growth": 0.14, "demand": 82, "salary_premium": 6000}
-    ]
-    
-    user_skill_names = set(user_skills.keys())
+    trending_skills = [dict(s) for s in market.trending_skills]
+    user_skill_ids = skill_canonicalizer.id_set(user_skills)
+    held = [skill_id in user_skill_ids for skill_id in market.trending_skill_ids]
     
     # Filter trending skills user doesn't have
-    opportunities = [s for s in trending_skills if s["skill"] not in user_skill_names]
+    opportunities = [s for s, has_skill in zip(trending_skills, held) if not has_skill]
     opportunities.sort(key=lambda x: x["demand"], reverse=True)
     
     # Calculate user's market alignment
-    user_trending_skills = [s for s in trending_skills if s["skill"] in user_skill_names]
+    user_trending_skills = [s for s, has_skill in zip(trending_skills, held) if has_skill]
     market_alignment_score = (len(user_trending_skills) / len(trending_skills)) * 100 if trending_skills else 0
     
     # Salary insights
@@ -305,14 +372,7 @@ def calculate_market_pulse(user_skills: Dict[str, str], assessment: Assessment)
     
     # Market trends
     experience_level = (assessment.career_interests or {}).get("experience_level", "Entry Level")
-    salary_benchmarks = {
-        "Entry Level (0-2 years)": {"min": 60000, "avg": 70000, "max": 85000},
-        "Mid Level (2-5 years)": {"min": 80000, "avg": 100000, "max": 120000},
-        "Senior Level (5+ years)": {"min": 120000, "avg": 150000, "max": 180000},
-        "Lead/Principal Level": {"min": 160000, "avg": 200000, "max": 250000}
-    }
-    
-    salary_benchmark = salary_benchmarks.get(experience_level, salary_benchmarks["Entry Level (0-2 years)"])
+    salary_benchmark = dict(market.salary_benchmark(experience_level))
     
     return {
         "trending_skills": trending_skills[:8],
@@ -330,8 +390,11 @@ def calculate_market_pulse(user_skills: Dict[str, str], assessment: Assessment)
     }
 
 
-def calculate_progress_velocity(learning_paths: List[LearningPath], user_skills: List[UserSkill]) -> Dict[str, Any]:
-    """Calculate progress velocity - learning path completion, skill acquisition speed"""
+def calculate_progress_velocity(learning_paths: List[LearningPath], user_skills: List[UserSkill], activity: ActivitySummary) -> Dict[str, Any]:
+    """Calculate progress velocity - learning path completion, skill acquisition speed.
+
+    Learning hours come from the user's learning activity rollups.
+    """
     
     if not learning_paths:
         return {
@@ -341,7 +404,8 @@ def calculate_progress_velocity(learning_paths: List[LearningPath], user_skills:
             "average_completion_rate": 0,
             "skills_acquired_last_30_days": 0,
             "learning_velocity": 0,
-            "hours_learned_last_30_days": 0,
+            "hours_learned_last_30_days": round(activity.hours_last_30_days, 1),
+            "weekly_learning_hours": round(activity.hours_per_week, 1),
             "projected_completion_date": None
         }
     
@@ -368,17 +432,18 @@ def calculate_progress_velocity(learning_paths: List[LearningPath], user_skills:
     else:
         learning_velocity = 0
     
-    # Calculate hours learned (mock - would track from learning path progress)
-    total_hours = sum(p.total_hours or 0 for p in learning_paths)
-    completed_hours = sum((p.total_hours or 0) * (p.progress_percentage / 100) for p in learning_paths)
-    hours_learned_last_30_days = completed_hours * 0.1  # Mock: 10% of completed hours in last 30 days
+    # Planned hours of the paths, and the share their progress covers
+    total_hours = sum(path_total_hours(p) for p in learning_paths)
+    completed_hours = sum(path_total_hours(p) * (p.progress_percentage / 100) for p in learning_paths)
     
-    # Projected completion date (for in-progress paths)
+    # Projected completion date (for in-progress paths), at the recent daily pace or else the planned one
     projected_completion = None
     if in_progress_paths:
-        avg_hours_per_day = 5  # Default
-        remaining_hours = sum((p.total_hours or 0) * (1 - p.progress_percentage / 100) for p in in_progress_paths)
-        days_to_complete = remaining_hours / avg_hours_per_day if avg_hours_per_day > 0 else 0
+        hours_per_day = activity.hours_per_day or (
+            sum(p.hours_per_day or 5 for p in in_progress_paths) / len(in_progress_paths)
+        )
+        remaining_hours = sum(path_total_hours(p) * (1 - p.progress_percentage / 100) for p in in_progress_paths)
+        days_to_complete = remaining_hours / hours_per_day if hours_per_day > 0 else 0
         projected_completion = (datetime.now() + timedelta(days=days_to_complete)).isoformat()
     
     return {
@@ -388,17 +453,22 @@ def calculate_progress_velocity(learning_paths: List[LearningPath], user_skills:
         "average_completion_rate": round(total_progress, 1),
         "skills_acquired_last_30_days": skills_acquired_last_30_days,
         "learning_velocity": round(learning_velocity, 1),
-        "hours_learned_last_30_days": round(hours_learned_last_30_days, 1),
+        "hours_learned_last_30_days": round(activity.hours_last_30_days, 1),
+        "weekly_learning_hours": round(activity.hours_per_week, 1),
         "total_hours_completed": round(completed_hours, 1),
         "total_hours_planned": round(total_hours, 1),
         "projected_completion_date": projected_completion
     }
 
 
-def calculate_benchmarks(user_skills: Dict[str, str], assessment: Assessment, learning_paths: List[LearningPath], job_matches: List[JobMatch]) -> Dict[str, Any]:
-    """Calculate benchmarks - peer comparisons, industry standards"""
+def calculate_benchmarks(user_skills: Dict[str, str], assessment: Assessment, learning_paths: List[LearningPath], match_scores: List[float], peer_percentiles: Dict[str, float]) -> Dict[str, Any]:
+    """Calculate benchmarks - peer comparisons, industry standards.
+
+    ``peer_percentiles`` are the user's percentiles among users of the same
+    experience level, as returned by ``benchmark_index.percentiles``.
+    """
     
-    experience_level = (assessment.career_interests or {}).get("experience_level", "Entry Level")
+    experience_level = experience_level_of(assessment)
     
     # Industry benchmarks (mock data)
     industry_benchmarks = {
@@ -431,16 +501,17 @@ def calculate_benchmarks(user_skills: Dict[str, str], assessment: Assessment, le
     benchmark = industry_benchmarks.get(experience_level, industry_benchmarks["Entry Level (0-2 years)"])
     
     # Calculate user metrics
-    user_skills_count = len(user_skills)
-    avg_match_score = sum(m.match_score for m in job_matches) / len(job_matches) if job_matches else 0
-    learning_paths_count = len(learning_paths)
-    avg_completion_rate = sum(p.progress_percentage for p in learning_paths) / len(learning_paths) if learning_paths else 0
-    
-    # Calculate percentile rankings
-    skills_percentile = min(100, (user_skills_count / benchmark["avg_skills"]) * 50) if benchmark["avg_skills"] > 0 else 50
-    match_score_percentile = min(100, (avg_match_score / benchmark["avg_match_score"]) * 50) if benchmark["avg_match_score"] > 0 else 50
-    learning_paths_percentile = min(100, (learning_paths_count / benchmark["avg_learning_paths"]) * 50) if benchmark["avg_learning_paths"] > 0 else 50
-    completion_percentile = min(100, (avg_completion_rate / benchmark["avg_completion_rate"]) * 50) if benchmark["avg_completion_rate"] > 0 else 50
+    metrics = user_metrics(len(user_skills), match_scores, learning_paths)
+    user_skills_count = metrics["skills"]
+    avg_match_score = metrics["match_score"]
+    learning_paths_count = metrics["learning_paths"]
+    avg_completion_rate = metrics["completion_rate"]
+    
+    # Percentile rankings among peers
+    skills_percentile = peer_percentiles["skills"]
+    match_score_percentile = peer_percentiles["match_score"]
+    learning_paths_percentile = peer_percentiles["learning_paths"]
+    completion_percentile = peer_percentiles["completion_rate"]
     
     # Overall percentile
     overall_percentile = (skills_percentile + match_score_percentile + learning_paths_percentile + completion_percentile) / 4
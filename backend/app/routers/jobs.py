@@ -1,323 +1,178 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+from functools import cached_property
+import base64
+import binascii
+import json
 from app.core.database import get_db
-from app.models.assessment import Assessment, UserSkill
+from app.models.assessment import Assessment, JobMatch, UserSkill
 from app.models.job import Job
 from app.services.hidden_gem_matcher import HiddenGemMatcher
+from app.services.job_index import job_index, job_to_dict
+from app.services.job_search import search_jobs
+from app.services.match_analysis import (
+    calculate_market_intelligence,
+    derive_culture_fit,
+    describe_match,
+    generate_negotiation_playbook,
+)
+from app.services.match_materializer import match_from_row, match_materializer
+from app.services.match_scoring import SCORING_VERSION, UserMatchProfile, score_candidates
+from app.services.response_sections import SectionRegistry
+from app.services.semantic_matcher import load_resume_vectors
+from app.services.similar_jobs import similar_jobs_index
 
 router = APIRouter()
 hidden_gem_matcher = HiddenGemMatcher()
 
-# Mock job database for now
-MOCK_JOBS = [
-    {
-        "id": 1,
-        "title": "Senior Frontend Developer",
-        "company": "TechCorp",
-        "headline": "Scale design systems and motion for a product that ships weekly.",
-        "description": "We're looking for a senior frontend developer to join our team and evolve our design system, micro-interactions, and accessibility story across millions of users.",
-        "location": "San Francisco, CA / Remote",
-        "salary": "$120k - $180k base + equity",
-        "job_type": "Full-time",
-        "remote_status": "Remote",
-        "experience_level": "Senior Level",
-        "required_skills": ["React", "TypeScript", "JavaScript", "CSS"],
-        "preferred_skills": ["Next.js", "GraphQL", "AWS"],
-        "benefits": ["Health insurance", "401k", "Remote work", "Learning budget"],
-        "posted_at": "2024-01-15",
-        "source": "LinkedIn",
-        "company_stage": "Series C",
-        "team_size": 180,
-        "culture_values": ["fast_paced", "innovative", "collaborative"],
-        "growth_signals": {
-            "revenue_growth": 0.32,
-            "headcount_growth": 0.18,
-            "runway_months": 30
-        }
-    },
-    {
-        "id": 2,
-        "title": "Full Stack Engineer",
-        "company": "StartupXYZ",
-        "headline": "Own product verticals end-to-end in a hungry, product-led startup.",
-        "description": "Join our fast-growing startup as a full stack engineer owning customer-facing features, experimentation, and shipping impact weekly.",
-        "location": "New York, NY",
-        "salary": "$90k - $140k + equity",
-        "job_type": "Full-time",
-        "remote_status": "Hybrid",
-        "experience_level": "Mid Level",
-        "required_skills": ["JavaScript", "Node.js", "React", "SQL"],
-        "preferred_skills": ["Docker", "AWS", "MongoDB"],
-        "benefits": ["Equity", "Health insurance", "Flexible hours"],
-        "posted_at": "2024-01-10",
-        "source": "Indeed",
-        "company_stage": "Series B",
-        "team_size": 85,
-        "culture_values": ["collaborative", "growth_focused", "innovative"],
-        "growth_signals": {
-            "revenue_growth": 0.24,
-            "headcount_growth": 0.22,
-            "runway_months": 24
-        }
-    },
-    {
-        "id": 3,
-        "title": "Junior Web Developer",
-        "company": "Digital Agency",
-        "headline": "Ship high-visibility client work while you build your stack.",
-        "description": "Looking for junior developers to work on exciting client projects, landing pages, and interactive experiences across multiple industries.",
-        "location": "Austin, TX",
-        "salary": "$60k - $80k",
-        "job_type": "Full-time",
-        "remote_status": "On-site",
-        "experience_level": "Entry Level",
-        "required_skills": ["HTML", "CSS", "JavaScript"],
-        "preferred_skills": ["React", "WordPress", "SEO"],
-        "benefits": ["Training program", "Health insurance"],
-        "posted_at": "2024-01-12",
-        "source": "Company website",
-        "company_stage": "Private",
-        "team_size": 45,
-        "culture_values": ["structured", "collaborative", "client_service"],
-        "growth_signals": {
-            "revenue_growth": 0.12,
-            "headcount_growth": 0.1,
-            "runway_months": 18
-        }
-    }
-]
-
-def calculate_skill_match(user_skills: Dict[str, str], job_required: List[str], job_preferred: List[str]) -> Dict[str, Any]:
-    """Calculate skill match score and analysis"""
-    user_skill_names = set(user_skills.keys())
-    
-    # Required skills match (most important)
-    required_matches = len([skill for skill in job_required if skill in user_skill_names])
-    required_score = (required_matches / len(job_required)) if job_required else 0
-    
-    # Preferred skills match (bonus)
-    preferred_matches = len([skill for skill in job_preferred if skill in user_skill_names])
-    preferred_score = (preferred_matches / len(job_preferred)) if job_preferred else 0
-    
-    # Overall skill score (70% required, 30% preferred)
-    skill_score = (required_score * 0.7) + (preferred_score * 0.3)
-    
-    # Identify skill gaps
-    skill_gaps = [skill for skill in job_required if skill not in user_skill_names]
-    
-    # Identify matching reasons
-    match_reasons = []
-    if required_matches >= len(job_required) * 0.8:
-        match_reasons.append(f"Strong skill match ({required_matches}/{len(job_required)} required skills)")
-    
-    if preferred_matches >= len(job_preferred) * 0.5:
-        match_reasons.append(f"Bonus skills ({preferred_matches} preferred skills)")
-    
-    return {
-        "score": skill_score * 100,
-        "required_matches": required_matches,
-        "preferred_matches": preferred_matches,
-        "skill_gaps": skill_gaps,
-        "match_reasons": match_reasons
-    }
 
-def calculate_experience_match(user_experience: str, job_experience: str) -> float:
-    """Calculate experience level match"""
-    experience_map = {
-        "Entry Level (0-2 years)": 1,
-        "Mid Level (2-5 years)": 3.5,
-        "Senior Level (5+ years)": 7,
-        "Lead/Principal Level": 10
-    }
-    
-    user_level = experience_map.get(user_experience, 0)
-    job_level = experience_map.get(job_experience, 0)
-    
-    # Perfect match = 1.0
-    if abs(user_level - job_level) <= 1:
-        return 1.0
-    # Close match = 0.7
-    elif abs(user_level - job_level) <= 2:
-        return 0.7
-    # Overqualified = 0.5
-    elif user_level > job_level:
-        return 0.5
-    # Underqualified = 0.3
-    else:
-        return 0.3
-
-def analyze_company_culture(job_description: str) -> Dict[str, str]:
-    """Analyze company culture from job description"""
-    description_lower = job_description.lower()
-    
-    culture_indicators = {
-        "fast_paced": ["fast-paced", "dynamic", "rapidly", "quickly", "startup", "agile"],
-        "innovative": ["innovative", "cutting-edge", "forward-thinking", "creative", "disrupt"],
-        "collaborative": ["team", "collaborative", "together", "cross-functional", "partnership"],
-        "structured": ["established", "process", "methodology", "structured", "formal"],
-        "growth_focused": ["growth", "learn", "develop", "mentor", "training", "career"]
-    }
-    
-    culture_scores = {}
-    for culture_type, keywords in culture_indicators.items():
-        score = sum(1 for keyword in keywords if keyword in description_lower)
-        if score > 0:
-            culture_scores[culture_type] = "high" if score >= 2 else "medium"
-    
-    return culture_scores
-
-def calculate_market_intelligence(job: Dict[str, Any], match_score: float) -> Dict[str, Any]:
-    """Calculate market intelligence for the job match"""
-    # Mock market data (in real app, this would come from market APIs)
-    avg_salaries = {
-        "Senior Level": 150000,
-        "Mid Level": 100000, 
-        "Entry Level": 70000
-    }
-    
-    job_exp = job.get("experience_level", "")
-    avg_salary = avg_salaries.get(job_exp, 100000)
-    job_salary_range = job.get("salary", "")
-    
-    # Extract max salary for comparison
-    import re
-    salary_match = re.search(r'\$(\d+)k', job_salary_range)
-    job_max_salary = int(salary_match.group(1)) * 1000 if salary_match else avg_salary
-    
-    salary_position = "average"
-    if job_max_salary > avg_salary * 1.2:
-        salary_position = "above_average"
-    elif job_max_salary < avg_salary * 0.8:
-        salary_position = "below_average"
-    
-    # Competition analysis (mock data)
-    competition_level = "high" if match_score > 80 else "medium" if match_score > 60 else "low"
+class MatchContext:
+    """Per-job inputs of a match payload; shared intermediate results are computed on first use"""
+
+    def __init__(self, job: Dict[str, Any], features: Dict[str, Any], match: Dict[str, Any], user_skills: Dict[str, str], answers: Dict[str, Any]):
+        self.job = job
+        self.features = features
+        self.match = match
+        self.user_skills = user_skills
+        self.answers = answers
+
+    @cached_property
+    def description(self) -> Dict[str, Any]:
+        return describe_match(self.job, self.features, self.match, self.user_skills, self.answers)
+
+    @cached_property
+    def culture_fit(self) -> Dict[str, Any]:
+        # Same value as description["culture_fit"], without the skill analysis
+        return derive_culture_fit(self.answers.get("work_culture", []), self.features["culture_analysis"])
+
+    @cached_property
+    def market_intel(self) -> Dict[str, Any]:
+        return calculate_market_intelligence(self.job, self.match["preliminary_score"])
+
+
+# Fields of one match payload, in response order
+match_fields = SectionRegistry([
+    ("id", lambda ctx: ctx.job["id"]),
+    ("title", lambda ctx: ctx.job["title"]),
+    ("company", lambda ctx: ctx.job["company"]),
+    ("location", lambda ctx: ctx.job["location"]),
+    ("salary", lambda ctx: ctx.job["salary"]),
+    ("headline", lambda ctx: ctx.job.get("headline") or ctx.job["description"][:160]),
+    ("match_score", lambda ctx: ctx.match["match_score"]),
+    ("skill_gaps", lambda ctx: ctx.description["skill_analysis"]["skill_gaps"]),
+    ("match_reasons", lambda ctx: ctx.description["match_reasons"]),
+    ("posted_date", lambda ctx: ctx.job["posted_at"]),
+    ("type", lambda ctx: ctx.job["remote_status"].lower()),
+    ("difficulty", lambda ctx: ctx.job["experience_level"].lower().replace(" level", "")),
+    ("market_intelligence", lambda ctx: ctx.market_intel),
+    ("culture_analysis", lambda ctx: ctx.features["culture_analysis"]),
+    ("required_skills_matched", lambda ctx: ctx.description["skill_analysis"]["required_matches"]),
+    ("total_required_skills", lambda ctx: len(ctx.job["required_skills"])),
+    ("preferred_skills_matched", lambda ctx: ctx.description["skill_analysis"]["preferred_matches"]),
+    ("total_preferred_skills", lambda ctx: len(ctx.job["preferred_skills"])),
+    ("required_skills", lambda ctx: ctx.job["required_skills"]),
+    ("preferred_skills", lambda ctx: ctx.job["preferred_skills"]),
+    ("culture_fit", lambda ctx: ctx.culture_fit),
+    ("growth_potential", lambda ctx: ctx.features["growth_potential"]),
+    ("negotiation_plan", lambda ctx: generate_negotiation_playbook(ctx.job, ctx.market_intel, ctx.description["skill_analysis"])),
+    ("score_breakdown", lambda ctx: ctx.match["score_breakdown"]),
+    ("location_alignment", lambda ctx: ctx.match["location_bonus"] > 0),
+    ("interest_alignment", lambda ctx: ctx.match["interest_bonus"] > 0),
+])
+
+# Match fields HiddenGemMatcher reads; cheap enough to build for every candidate
+HIDDEN_GEM_FIELDS = ["id", "match_score", "posted_date", "required_skills", "preferred_skills", "culture_fit", "growth_potential"]
+
+# Keys HiddenGemMatcher adds to each gem
+HIDDEN_GEM_KEYS = ["hidden_gem_score", "hidden_gem_reasons", "is_hidden_gem", "urgency"]
+
+
+def build_job_match(job: Dict[str, Any], features: Dict[str, Any], match: Dict[str, Any], user_skills: Dict[str, str], answers: Dict[str, Any], fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Build the match payload for a scored job, limited to ``fields`` when given.
+
+    ``match`` holds the job's match_score, score_breakdown and the
+    MatchScores.signals() terms, as materialized in JobMatch. Only the
+    requested fields are computed.
+    """
+    context = MatchContext(job, features, match, user_skills, answers)
+    return match_fields.build(context, match_fields.names if fields is None else fields)
+
+def encode_match_cursor(rank_key: int) -> str:
+    """Opaque cursor pointing just after the given ranking key"""
+    return base64.urlsafe_b64encode(str(rank_key).encode()).decode()
+
+
+def decode_match_cursor(cursor: str) -> int:
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {cursor}")
+
+
+def find_match_gems(
+    user_skills: Dict[str, str], answers: Dict[str, Any], candidates: List[Tuple[int, Dict[str, Any]]], fields: Iterable[str]
+) -> List[Dict[str, Any]]:
+    """Hidden gems among all of a user's scored jobs, as match payloads limited to ``fields``.
+
+    ``candidates`` are (job id, match) pairs in rank order. All of them go
+    through one batch pass over the few fields the gem signals read; full
+    payloads are built only for the gems kept. Failures only cost the gems.
+    """
+    jobs = {}
+    for job_id, match in candidates:
+        job = job_index.get(job_id)
+        if job:
+            jobs[job_id] = (job, match)
+    if not jobs:
+        return []
+    
+    # Personality profile is stored with the assessment answers when available
+    personality_profile = answers.get("personality_profile") or {}
+    try:
+        views = [
+            build_job_match(job, job_index.features(job_id), match, user_skills, answers, HIDDEN_GEM_FIELDS)
+            for job_id, (job, match) in jobs.items()
+        ]
+        gems = hidden_gem_matcher.find_hidden_gems(
+            user_skills,
+            personality_profile,
+            views,
+            {
+                "experience_level": answers.get("experience_level", ""),
+                "career_interests": answers.get("career_interests", []),
+                "location_preferences": answers.get("location_preferences", [])
+            }
+        )
+    except Exception as e:
+        print(f"Warning: Failed to find hidden gems: {e}")
+        return []
     
-    return {
-        "salary_comparison": {
-            "position": salary_position,
-            "industry_average": avg_salary,
-            "job_max": job_max_salary
-        },
-        "competition_level": competition_level,
-        "success_probability": min(95, max(20, match_score + 10)),
-        "time_to_hire": "2-4 weeks" if competition_level == "low" else "4-6 weeks" if competition_level == "medium" else "6-8 weeks"
-    }
-
-
-def derive_culture_fit(user_preferences: List[str], culture_analysis: Dict[str, str]) -> Dict[str, Any]:
-    """Derive cultural compatibility insights."""
-    if not user_preferences:
-        user_preferences = ["fast_paced", "innovative", "collaborative"]
-
-    overlaps = [value for value in culture_analysis.values() if value in user_preferences]
-    gaps = [pref for pref in user_preferences if pref not in culture_analysis.values()]
-
-    score = 60 + len(overlaps) * 10 - len(gaps) * 5
-    score = max(30, min(95, score))
-
-    summary = "Aligned" if score >= 75 else "Worth a conversation" if score >= 55 else "Probe during interviews"
-
-    highlights = [f"Company leans {value.replace('_', ' ')}" for value in overlaps]
-    watchouts = [f"Culture may be lighter on {gap.replace('_', ' ')}" for gap in gaps]
-
-    return {
-        "score": round(score, 1),
-        "summary": summary,
-        "highlights": highlights[:3],
-        "watchouts": watchouts[:3]
-    }
-
-
-def evaluate_growth_potential(job: Dict[str, Any]) -> Dict[str, Any]:
-    """Evaluate growth potential based on company signals."""
-    signals = job.get("growth_signals", {})
-    revenue_growth = signals.get("revenue_growth", 0.15)
-    headcount_growth = signals.get("headcount_growth", 0.1)
-    runway = signals.get("runway_months", 18)
-
-    score = (revenue_growth * 150) + (headcount_growth * 120) + (runway / 36 * 20)
-    score = max(20, min(95, score))
-
-    momentum = "rocket" if revenue_growth > 0.3 else "growing" if revenue_growth > 0.15 else "steady"
-    runway_class = "healthy" if runway >= 24 else "moderate" if runway >= 18 else "tight"
-
-    metrics = {
-        "revenue_growth_pct": round(revenue_growth * 100, 1),
-        "headcount_growth_pct": round(headcount_growth * 100, 1),
-        "runway_months": runway,
-        "momentum": momentum,
-        "runway_health": runway_class,
-    }
-
-    narrative = "Series C rocketship" if momentum == "rocket" else "Confident climb" if momentum == "growing" else "Measured pace"
-
-    return {
-        "score": round(score, 1),
-        "narrative": narrative,
-        "metrics": metrics,
-        "signal": {
-            "career_ceiling": "Leadership potential" if score > 70 else "Solid IC growth",
-            "team_visibility": "High" if job.get("team_size", 50) < 120 else "Medium"
-        }
-    }
-
-
-def generate_negotiation_playbook(job: Dict[str, Any], market_intel: Dict[str, Any], skill_analysis: Dict[str, Any]) -> Dict[str, Any]:
-    """Generate salary negotiation guidance."""
-    salary_comparison = market_intel.get("salary_comparison", {})
-    max_offer = salary_comparison.get("job_max", 0)
-    industry_avg = salary_comparison.get("industry_average", max_offer)
-    anchor = int(max(max_offer, industry_avg * 1.1))
+    payloads = []
+    for gem in gems:
+        job, match = jobs[gem["id"]]
+        payload = build_job_match(job, job_index.features(gem["id"]), match, user_skills, answers, fields)
+        payloads.append({**payload, **{key: gem[key] for key in HIDDEN_GEM_KEYS}})
+    return payloads
 
-    leverage = []
-    if skill_analysis.get("score", 0) > 80:
-        leverage.append("You cover nearly every critical skill they asked for")
-    if salary_comparison.get("position") == "below_average":
-        leverage.append("Market data shows peers at a higher band")
-    if job.get("company_stage") in {"Series C", "Series B"}:
-        leverage.append("High growth stage typically budgets aggressively for top talent")
-
-    red_flags = []
-    if salary_comparison.get("position") == "below_average":
-        red_flags.append("Salary band trends below market average")
-    if market_intel.get("competition_level") == "high":
-        red_flags.append("Competition is intense – speed will matter")
-
-    closing = "Frame an ask around the upper band with evidence and offer to review comp again at the 6-month mark"
-
-    return {
-        "salary_anchor": f"${anchor:,}",
-        "counter_floor": f"${int(anchor * 0.95):,}",
-        "leverage_points": leverage[:3],
-        "risk_flags": red_flags[:2],
-        "closing_move": closing
-    }
-
-
-def calculate_score_breakdown(skill_analysis: Dict[str, Any], experience_match: float, culture_fit: Dict[str, Any], growth: Dict[str, Any], market_intel: Dict[str, Any]) -> Dict[str, float]:
-    """Provide a normalized score breakdown for UI."""
-    skills = min(100, skill_analysis.get("score", 0))
-    experience = round(experience_match * 100, 1)
-    culture = culture_fit.get("score", 60)
-    growth_score = growth.get("score", 60)
-    compensation = 80 if market_intel.get("salary_comparison", {}).get("position") == "above_average" else 65
-
-    total = min(100, round(skills * 0.45 + experience * 0.2 + culture * 0.15 + growth_score * 0.1 + compensation * 0.1, 1))
-
-    return {
-        "skills": round(skills, 1),
-        "experience": round(experience, 1),
-        "culture": round(culture, 1),
-        "growth": round(growth_score, 1),
-        "compensation": round(compensation, 1),
-        "total": total
-    }
 
 @router.get("/matches/{user_id}")
-async def get_job_matches(user_id: str, db: Session = Depends(get_db)):
-    """Get intelligent job matches for a user"""
+async def get_job_matches(
+    user_id: str,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated match fields to return (default: all)"),
+    include: Optional[str] = Query(None, description="Alias of fields; both lists are combined"),
+    min_salary: Optional[int] = Query(None, ge=0, description="Only jobs whose annual salary band reaches this amount"),
+    db: Session = Depends(get_db)
+):
+    """Get intelligent job matches for a user, best first, one page at a time.
+
+    ``fields``/``include`` limit each match to the named fields, and only
+    those are computed; list views can skip market intelligence and the
+    negotiation plan entirely.
+    """
     
     # Convert string user_id to integer for database
     try:
@@ -332,6 +187,7 @@ async def get_job_matches(user_id: str, db: Session = Depends(get_db)):
         return {
             "matches": [],
             "total": 0,
+            "next_cursor": None,
             "has_assessment": False,
             "user_profile": {
                 "skills_count": 0,
@@ -349,127 +205,46 @@ async def get_job_matches(user_id: str, db: Session = Depends(get_db)):
     user_experience = answers.get("experience_level", "")
     career_interests = answers.get("career_interests", [])
     
+    after_key = decode_match_cursor(cursor) if cursor else None
+    try:
+        selected_fields = match_fields.select(fields, include)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Matches are materialized per user; recompute them only when stale
+    if assessment.matches_version != SCORING_VERSION:
+        match_materializer.refresh_user(db, user_id_int)
+    job_index.ensure_loaded(db)
+    
+    match_query = db.query(JobMatch).filter(JobMatch.user_id == user_id_int)
+    if min_salary is not None:
+        match_query = match_query.join(Job, Job.id == JobMatch.job_id).filter(Job.salary_max >= min_salary)
+    total = match_query.count()
+    if after_key is not None:
+        match_query = match_query.filter(JobMatch.rank_key > after_key)
+    rows = match_query.order_by(JobMatch.rank_key).limit(limit + 1).all()
+    next_cursor = encode_match_cursor(rows[limit - 1].rank_key) if len(rows) > limit else None
+    
+    # Only the requested page pays for enrichment, and only for the selected fields
     matches = []
+    for row in rows[:limit]:
+        job = job_index.get(row.job_id)
+        if not job:
+            continue
+        matches.append(build_job_match(job, job_index.features(row.job_id), match_from_row(row), user_skills, answers, selected_fields))
     
-    for job in MOCK_JOBS:
-        # Calculate multi-dimensional match
-        skill_analysis = calculate_skill_match(
-            user_skills, 
-            job["required_skills"], 
-            job["preferred_skills"]
-        )
-        
-        experience_match = calculate_experience_match(user_experience, job["experience_level"])
-        
-        # Location preference matching
-        location_bonus = 0
-        location_preferences = answers.get("location_preferences", [])
-        if job["remote_status"].lower() in [pref.lower() for pref in location_preferences]:
-            location_bonus = 10
-        
-        # Career interest matching
-        interest_bonus = 0
-        if "Frontend Developer" in career_interests and "Frontend" in job["title"]:
-            interest_bonus = 15
-        elif "Backend Developer" in career_interests and "Backend" in job["title"]:
-            interest_bonus = 15
-        elif "Full Stack" in career_interests and "Full Stack" in job["title"]:
-            interest_bonus = 15
-        
-        # Calculate overall match score
-        overall_score = (
-            skill_analysis["score"] * 0.6 +  # 60% skills
-            experience_match * 100 * 0.25 +  # 25% experience
-            location_bonus +  # 10% location
-            interest_bonus  # 5% interest
-        )
-        
-        # Generate match reasons
-        all_match_reasons = skill_analysis["match_reasons"].copy()
-        if experience_match >= 0.7:
-            all_match_reasons.append("Experience level aligns well")
-        if location_bonus > 0:
-            all_match_reasons.append("Matches your location preferences")
-        if interest_bonus > 0:
-            all_match_reasons.append("Aligns with your career interests")
-        if culture_fit["score"] >= 70:
-            all_match_reasons.append(f"Culture fit looks {culture_fit['summary'].lower()}")
-        if growth_potential["score"] >= 70:
-            all_match_reasons.append("High trajectory role with strong growth signals")
-        
-        # Market intelligence
-        market_intel = calculate_market_intelligence(job, overall_score)
-        
-        # Company culture analysis
-        culture_analysis = analyze_company_culture(job["description"])
-        user_culture_preferences = answers.get("work_culture", [])
-        culture_fit = derive_culture_fit(user_culture_preferences, culture_analysis)
-        growth_potential = evaluate_growth_potential(job)
-        negotiation_plan = generate_negotiation_playbook(job, market_intel, skill_analysis)
-        score_breakdown = calculate_score_breakdown(skill_analysis, experience_match, culture_fit, growth_potential, market_intel)
-        base_score = score_breakdown["total"]
-        overall_score = min(100, base_score + (5 if location_bonus else 0) + min(5, interest_bonus))
-        
-        matches.append({
-            "id": job["id"],
-            "title": job["title"],
-            "company": job["company"],
-            "location": job["location"],
-            "salary": job["salary"],
-            "headline": job.get("headline", job["description"][:160]),
-            "match_score": round(overall_score, 1),
-            "skill_gaps": skill_analysis["skill_gaps"],
-            "match_reasons": all_match_reasons,
-            "posted_date": job["posted_at"],
-            "type": job["remote_status"].lower(),
-            "difficulty": job["experience_level"].lower().replace(" level", ""),
-            "market_intelligence": market_intel,
-            "culture_analysis": culture_analysis,
-            "required_skills_matched": skill_analysis["required_matches"],
-            "total_required_skills": len(job["required_skills"]),
-            "preferred_skills_matched": skill_analysis["preferred_matches"],
-            "total_preferred_skills": len(job["preferred_skills"]),
-            "required_skills": job["required_skills"],
-            "preferred_skills": job["preferred_skills"],
-            "culture_fit": culture_fit,
-            "growth_potential": growth_potential,
-            "negotiation_plan": negotiation_plan,
-            "score_breakdown": score_breakdown,
-            "location_alignment": location_bonus > 0,
-            "interest_alignment": interest_bonus > 0
-        })
-    
-    # Sort by match score
-    matches.sort(key=lambda x: x["match_score"], reverse=True)
-    
-    # Find hidden gems if we have enough data
+    # Hidden gems (first page only) are searched among all of the user's matches, not just this page
     hidden_gems = []
-    personality_profile = None
-    
-    # Try to get personality profile from assessment (if stored)
-    if assessment.career_interests and "personality_profile" in assessment.career_interests:
-        personality_profile = assessment.career_interests.get("personality_profile")
-    
-    # Find hidden gems
-    if matches and len(matches) > 0:
-        try:
-            hidden_gems = hidden_gem_matcher.find_hidden_gems(
-                user_skills,
-                personality_profile or {},
-                matches,
-                {
-                    "experience_level": user_experience,
-                    "career_interests": career_interests,
-                    "location_preferences": answers.get("location_preferences", [])
-                }
-            )
-        except Exception as e:
-            print(f"Warning: Failed to find hidden gems: {e}")
+    if after_key is None:
+        candidates = ranked_match_candidates(db, assessment, user_skills, min_salary=min_salary)
+        hidden_gems = find_match_gems(user_skills, answers, candidates, selected_fields)
     
     return {
         "matches": matches,
         "hidden_gems": hidden_gems,
-        "total": len(matches),
+        "total": total,
+        "next_cursor": next_cursor,
+        "limit": limit,
         "hidden_gems_count": len(hidden_gems),
         "has_assessment": True,
         "user_profile": {
@@ -479,21 +254,219 @@ async def get_job_matches(user_id: str, db: Session = Depends(get_db)):
         }
     }
 
+# Cheap card fields sent with the first stream event, before any enrichment
+STREAM_PREVIEW_FIELDS = ["id", "title", "company", "location", "salary", "match_score", "score_breakdown"]
+
+STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+
+def _json_default(value: Any) -> Any:
+    # NumPy scalars from the vectorized scorer
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+def encode_stream_event(event: str, data: Any, stream_format: str) -> str:
+    payload = json.dumps(data, default=_json_default)
+    if stream_format == "sse":
+        return f"event: {event}\ndata: {payload}\n\n"
+    # The data is encoded once; the NDJSON envelope is built around it
+    return f'{{"event": {json.dumps(event)}, "data": {payload}}}\n'
+
+
+def ranked_match_candidates(
+    db: Session, assessment: Assessment, user_skills: Dict[str, str], min_salary: Optional[int] = None
+) -> List[Tuple[int, Dict[str, Any]]]:
+    """(job id, match) of all of the user's jobs in rank order, without enrichment.
+
+    Fresh materialized matches are read by rank; stale ones are scored on the
+    fly with the vectorized scorer and left for the next regular read to
+    materialize.
+    """
+    job_index.ensure_loaded(db)
+    if assessment.matches_version == SCORING_VERSION:
+        # Only the columns of match_from_row
+        match_query = db.query(
+            JobMatch.job_id, JobMatch.match_score, JobMatch.score_breakdown, JobMatch.score_signals
+        ).filter(JobMatch.user_id == assessment.user_id)
+        if min_salary is not None:
+            match_query = match_query.join(Job, Job.id == JobMatch.job_id).filter(Job.salary_max >= min_salary)
+        return [(row.job_id, match_from_row(row)) for row in match_query.order_by(JobMatch.rank_key)]
+    
+    resume_vector = load_resume_vectors(db, [assessment.user_id], job_index.vectorizer).get(assessment.user_id)
+    profile = UserMatchProfile.from_answers(user_skills.keys(), assessment.career_interests or {}, resume_vector)
+    scores = score_candidates(job_index, profile)
+    ranked = []
+    for i in scores.ranking().tolist():
+        job_id = int(scores.job_ids[i])
+        job = job_index.get(job_id)
+        if job is None or (min_salary is not None and (job["salary_max"] or 0) < min_salary):
+            continue
+        ranked.append((job_id, {
+            **scores.signals(i),
+            "match_score": float(scores.match_score[i]),
+            "score_breakdown": scores.score_breakdown(i),
+        }))
+    return ranked
+
+
+@router.get("/matches/{user_id}/stream")
+async def stream_job_matches(
+    user_id: str,
+    limit: int = Query(20, ge=1, le=100),
+    stream_format: str = Query("ndjson", alias="format", pattern="^(ndjson|sse)$", description="ndjson or sse (server-sent events)"),
+    fields: Optional[str] = Query(None, description="Comma-separated match fields to return (default: all)"),
+    include: Optional[str] = Query(None, description="Alias of fields; both lists are combined"),
+    min_salary: Optional[int] = Query(None, ge=0, description="Only jobs whose annual salary band reaches this amount"),
+    db: Session = Depends(get_db)
+):
+    """Stream the first page of job matches progressively.
+
+    Events, in order: ``ranked`` (preview cards of the best matches, right
+    after the cheap scoring pass), one ``match`` per enriched match in rank
+    order, ``hidden_gems``, then ``done``. Database reads happen before the
+    stream starts; enrichment runs while events are being sent.
+    """
+    try:
+        user_id_int = int(user_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail=f"Invalid user_id: {user_id}")
+    try:
+        selected_fields = match_fields.select(fields, include)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    assessment = db.query(Assessment).filter(Assessment.user_id == user_id_int).first()
+    user_skills: Dict[str, str] = {}
+    candidates: List[Tuple[int, Dict[str, Any]]] = []
+    answers: Dict[str, Any] = {}
+    if assessment:
+        user_skills_data = db.query(UserSkill).filter(UserSkill.user_id == user_id_int).all()
+        user_skills = {skill.skill_name: skill.proficiency_level for skill in user_skills_data}
+        answers = assessment.career_interests or {}
+        # Hidden gems are searched among all candidates; the page is the first ``limit`` of them
+        candidates = ranked_match_candidates(db, assessment, user_skills, min_salary=min_salary)
+    
+    def events():
+        jobs = [(job_index.get(job_id), job_id, match) for job_id, match in candidates[:limit]]
+        jobs = [(job, job_id, match) for job, job_id, match in jobs if job]
+        previews = [
+            build_job_match(job, job_index.features(job_id), match, user_skills, answers, STREAM_PREVIEW_FIELDS)
+            for job, job_id, match in jobs
+        ]
+        yield encode_stream_event("ranked", {"matches": previews, "has_assessment": assessment is not None}, stream_format)
+        
+        matches = []
+        for job, job_id, match in jobs:
+            payload = build_job_match(job, job_index.features(job_id), match, user_skills, answers, selected_fields)
+            matches.append(payload)
+            yield encode_stream_event("match", payload, stream_format)
+        
+        hidden_gems = find_match_gems(user_skills, answers, candidates, selected_fields)
+        yield encode_stream_event("hidden_gems", hidden_gems, stream_format)
+        yield encode_stream_event("done", {"count": len(matches), "hidden_gems_count": len(hidden_gems)}, stream_format)
+    
+    return StreamingResponse(
+        events(),
+        media_type=STREAM_MEDIA_TYPES[stream_format],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def encode_search_cursor(job_id: int, rank: float) -> str:
+    """Opaque cursor pointing just after the given search hit"""
+    return base64.urlsafe_b64encode(f"{job_id}:{rank!r}".encode()).decode()
+
+
+def decode_search_cursor(cursor: str) -> Tuple[int, float]:
+    try:
+        job_id, rank = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        return int(job_id), float(rank)
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {cursor}")
+
+
+@router.get("/search")
+async def search_job_postings(
+    q: str = Query(..., min_length=1, max_length=200),
+    remote_status: Optional[str] = None,
+    experience_level: Optional[str] = None,
+    job_type: Optional[str] = None,
+    min_salary: Optional[int] = Query(None, ge=0, description="Only jobs whose annual salary band reaches this amount"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Ranked full-text search over job titles, companies, descriptions and requirements"""
+    after = decode_search_cursor(cursor) if cursor else None
+    hits = search_jobs(
+        db, q,
+        remote_status=remote_status,
+        experience_level=experience_level,
+        job_type=job_type,
+        limit=limit + 1,
+        after=after,
+        min_salary=min_salary
+    )
+    next_cursor = encode_search_cursor(*hits[limit - 1]) if len(hits) > limit else None
+    hits = hits[:limit]
+    
+    jobs_by_id = {job.id: job for job in db.query(Job).filter(Job.id.in_([job_id for job_id, _ in hits]))}
+    results = [
+        {**job_to_dict(jobs_by_id[job_id]), "relevance": round(-rank, 4)}
+        for job_id, rank in hits if job_id in jobs_by_id
+    ]
+    
+    return {
+        "query": q,
+        "results": results,
+        "next_cursor": next_cursor,
+        "limit": limit
+    }
+
+@router.get("/semantic/{user_id}")
+async def get_semantic_matches(
+    user_id: str,
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Jobs whose text is closest to the user's resume (hashed TF-IDF cosine similarity)"""
+    try:
+        user_id_int = int(user_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail=f"Invalid user_id: {user_id}")
+
+    job_index.ensure_loaded(db)
+    resume_vector = load_resume_vectors(db, [user_id_int], job_index.vectorizer).get(user_id_int)
+    if resume_vector is None:
+        return {"user_id": user_id_int, "has_resume": False, "jobs": []}
+
+    return {
+        "user_id": user_id_int,
+        "has_resume": True,
+        "jobs": [
+            {**job_index.get(job_id), "semantic_score": round(similarity * 100, 1)}
+            for job_id, similarity in job_index.semantic_top_k(resume_vector, limit)
+        ],
+    }
+
 @router.get("/{job_id}")
 async def get_job_details(job_id: int, db: Session = Depends(get_db)):
     """Get detailed job information with analysis"""
     
     # Find job
-    job = next((j for j in MOCK_JOBS if j["id"] == job_id), None)
+    job_index.ensure_loaded(db)
+    job = job_index.get(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
     # Enhanced job analysis
-    culture_analysis = analyze_company_culture(job["description"])
+    culture_analysis = job_index.features(job_id)["culture_analysis"]
     market_intel = calculate_market_intelligence(job, 75)  # Default match score for details view
     culture_fit = derive_culture_fit(["fast_paced", "collaborative", "growth_focused"], culture_analysis)
-    growth_potential = evaluate_growth_potential(job)
+    growth_potential = job_index.features(job_id)["growth_potential"]
     negotiation_plan = generate_negotiation_playbook(job, market_intel, {"score": 75})
+    similar_jobs_index.ensure_loaded(db)
+    similar_ids = similar_jobs_index.similar(job_id, 3)
     
     return {
         "job": job,
@@ -502,7 +475,7 @@ async def get_job_details(job_id: int, db: Session = Depends(get_db)):
         "market_intelligence": market_intel,
         "growth_potential": growth_potential,
         "negotiation_plan": negotiation_plan,
-        "similar_jobs": [j for j in MOCK_JOBS if j["id"] != job_id][:3]
+        "similar_jobs": [job_index.get(similar_id) for similar_id in similar_ids if job_index.get(similar_id)]
     }
 
 @router.get("/insights/{user_id}")
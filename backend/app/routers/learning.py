@@ -6,6 +6,10 @@ from datetime import datetime, timedelta
 from app.core.database import get_db
 from app.models.assessment import Assessment, UserSkill, LearningPath, LearningProgress, LearningResource
 from app.models.job import Job
+from app.services.dashboard_cache import dashboard_cache
+from app.services.learning_activity import minutes_from_progress, record_activity
+from app.services.market_data import market_data
+from app.services.skill_canonicalizer import skill_canonicalizer
 
 router = APIRouter()
 
@@ -183,26 +187,17 @@ def analyze_learning_style(assessment_data: Dict) -> Dict[str, Any]:
 
 def prioritize_skill_gaps(skill_gaps: List[str], user_skills: Dict, career_goals: str) -> List[Dict[str, Any]]:
     """Prioritize skill gaps based on importance and dependencies"""
-    # Define skill dependencies and market value
-    skill_metadata = {
-        "React": {"priority": 9, "dependencies": ["JavaScript"], "market_value": 10},
-        "TypeScript": {"priority": 8, "dependencies": ["JavaScript"], "market_value": 9},
-        "Python": {"priority": 7, "dependencies": [], "market_value": 8},
-        "AWS": {"priority": 8, "dependencies": [], "market_value": 9},
-        "GraphQL": {"priority": 6, "dependencies": ["JavaScript"], "market_value": 7},
-        "Docker": {"priority": 7, "dependencies": ["Basic command line"], "market_value": 8},
-        "Node.js": {"priority": 7, "dependencies": ["JavaScript"], "market_value": 8},
-        "MongoDB": {"priority": 5, "dependencies": [], "market_value": 6},
-        "PostgreSQL": {"priority": 6, "dependencies": [], "market_value": 7}
-    }
+    # Skill dependencies and market value come from the market data
+    market = market_data.current()
+    user_skill_ids = skill_canonicalizer.id_set(user_skills)
     
     prioritized_gaps = []
     
     for skill in skill_gaps:
-        metadata = skill_metadata.get(skill, {"priority": 5, "dependencies": [], "market_value": 5})
+        metadata = market.skill_figure("learning_gap", skill)
         
         # Check if prerequisites are met
-        prerequisites_met = all(dep in user_skills for dep in metadata["dependencies"])
+        prerequisites_met = all(skill_canonicalizer.skill_id(dep) in user_skill_ids for dep in metadata["dependencies"])
         
         # Calculate urgency score
         urgency_score = metadata["priority"] + metadata["market_value"]
@@ -214,7 +209,7 @@ def prioritize_skill_gaps(skill_gaps: List[str], user_skills: Dict, career_goals
             "urgency_score": urgency_score,
             "priority": metadata["priority"],
             "market_value": metadata["market_value"],
-            "dependencies": metadata["dependencies"],
+            "dependencies": list(metadata["dependencies"]),
             "prerequisites_met": prerequisites_met,
             "estimated_impact": metadata["market_value"]
         })
@@ -726,6 +721,10 @@ async def update_learning_progress(
         LearningProgress.resource_id == resource_id
     ).first()
     
+    # Log the learning time this update stands for; rollups follow in the same commit
+    previous_progress = (progress_record.completion_percentage or 0) if progress_record else 0
+    record_activity(db, learning_path.user_id, resource_id, minutes_from_progress(resource, previous_progress, progress))
+    
     if not progress_record:
         # Create new progress record
         progress_record = LearningProgress(
@@ -776,6 +775,7 @@ async def update_learning_progress(
         else:
             learning_path.status = 'completed'
         
+        dashboard_cache.invalidate(db, learning_path.user_id)
         db.commit()
     
     return {
@@ -1,8 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 from typing import Dict, Any, List, Optional
+from dataclasses import dataclass
+import json
 from app.core.database import get_db
+from app.models.community import CohortMembership
 from app.services.career_intelligence import CareerIntelligenceService
+from app.services.response_sections import SectionRegistry
+from app.services.user_context import UserContext
 
 router = APIRouter()
 
@@ -78,98 +85,208 @@ async def get_pivot_readiness(
     return result
 
 
+@router.get("/pivot/{user_id}/ranking")
+async def get_pivot_role_ranking(
+    user_id: str,
+    limit: int = Query(10, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """Rank every known role by a user's pivot readiness"""
+    try:
+        user_id_int = int(user_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail=f"Invalid user_id: {user_id}")
+    
+    intelligence_service = CareerIntelligenceService(db)
+    result = intelligence_service.rank_pivot_roles(user_id_int, limit)
+    
+    if "error" in result:
+        raise HTTPException(status_code=404, detail=result["error"])
+    
+    return result
+
+
+# Predictive analytics of a user without an assessment
+EMPTY_PREDICTIVE_SECTIONS: Dict[str, Any] = {
+    "promotion": {
+        "promotion_probability": 0,
+        "base_probability": 0,
+        "role_adjustment": 0,
+        "time_to_promotion": "N/A",
+        "key_factors": [],
+        "blockers": ["Complete an assessment to see promotion probability"],
+        "recommendations": ["Take the free assessment to get started"],
+        "score_breakdown": {
+            "skill_score": 0,
+            "experience_score": 0,
+            "learning_score": 0,
+            "market_alignment": 0,
+            "performance_score": 0
+        },
+        "target_role": None,
+        "confidence_level": "low"
+    },
+    "security": {
+        "security_score": 0,
+        "automation_risk": 0,
+        "market_demand_score": 0,
+        "obsolescence_risk": 0,
+        "industry_stability": 0,
+        "risk_factors": ["Complete an assessment to see job security signals"],
+        "security_strengths": [],
+        "recommendations": ["Take the free assessment to get started"],
+        "risk_timeline": {
+            "short_term": "N/A",
+            "medium_term": "N/A",
+            "long_term": "N/A"
+        },
+        "security_level": "low"
+    },
+    "pivot": {
+        "overall_readiness": 0,
+        "current_category": "General",
+        "target_roles": [],
+        "pivot_analyses": [],
+        "transferable_skills": [],
+        "skill_gaps": [],
+        "time_to_pivot": "N/A",
+        "pivot_strategy": {
+            "leverage_transferable_skills": [],
+            "focus_areas": [],
+            "learning_path": "Complete an assessment to see pivot strategy",
+            "networking": "Complete an assessment to see networking recommendations",
+            "timeline": "Complete an assessment to see timeline",
+            "approach": "Complete an assessment to see approach"
+        },
+        "readiness_level": "low"
+    }
+}
+
+
+@dataclass
+class PredictiveContext:
+    """Inputs of one analytics request; rows are preloaded so sections never query"""
+
+    service: CareerIntelligenceService
+    user_context: UserContext
+    target_role: Optional[str] = None
+    target_roles: Optional[List[str]] = None
+
+
+# Predictive analytics sections, in response order
+predictive_sections = SectionRegistry([
+    ("promotion", lambda ctx: ctx.service.calculate_promotion_probability(
+        ctx.user_context.user_id, ctx.target_role, context=ctx.user_context)),
+    ("security", lambda ctx: ctx.service.calculate_job_security_signals(
+        ctx.user_context.user_id, context=ctx.user_context)),
+    ("pivot", lambda ctx: ctx.service.calculate_pivot_readiness(
+        ctx.user_context.user_id, ctx.target_roles, context=ctx.user_context)),
+])
+
+
+def empty_predictive_sections(target_role: Optional[str]) -> Dict[str, Any]:
+    return {
+        **EMPTY_PREDICTIVE_SECTIONS,
+        "promotion": {**EMPTY_PREDICTIVE_SECTIONS["promotion"], "target_role": target_role},
+    }
+
+
 @router.get("/analytics/{user_id}")
 async def get_all_predictive_analytics(
     user_id: str,
     target_role: Optional[str] = None,
     target_roles: Optional[str] = None,
+    response: Response = None,
     db: Session = Depends(get_db)
 ):
-    """Get all predictive analytics for a user"""
+    """Get all predictive analytics for a user.
+
+    The three analyses run concurrently off the event loop; one that times
+    out or fails returns its empty state. Per-section durations are sent in
+    the ``Server-Timing`` header.
+    """
     try:
         user_id_int = int(user_id)
     except (ValueError, TypeError):
         raise HTTPException(status_code=400, detail=f"Invalid user_id: {user_id}")
     
-    intelligence_service = CareerIntelligenceService(db)
+    context = UserContext.load(db, user_id_int)
+    empty_sections = empty_predictive_sections(target_role)
+    
+    if context.assessment is None:
+        # Return empty analytics data if no assessment exists
+        return {"user_id": user_id_int, "has_assessment": False, **empty_sections}
     
     # Parse target_roles if provided
     target_roles_list = None
     if target_roles:
         target_roles_list = [role.strip() for role in target_roles.split(",")]
     
-    # Get all analytics
-    promotion = intelligence_service.calculate_promotion_probability(user_id_int, target_role)
-    security = intelligence_service.calculate_job_security_signals(user_id_int)
-    pivot = intelligence_service.calculate_pivot_readiness(user_id_int, target_roles_list)
-    
-    # Check for errors - if assessment not found, return empty data instead of error
-    has_assessment = "error" not in promotion and "error" not in security and "error" not in pivot
-    
-    if not has_assessment:
-        # Return empty analytics data if no assessment exists
-        return {
-            "user_id": user_id_int,
-            "has_assessment": False,
-            "promotion": {
-                "promotion_probability": 0,
-                "base_probability": 0,
-                "role_adjustment": 0,
-                "time_to_promotion": "N/A",
-                "key_factors": [],
-                "blockers": ["Complete an assessment to see promotion probability"],
-                "recommendations": ["Take the free assessment to get started"],
-                "score_breakdown": {
-                    "skill_score": 0,
-                    "experience_score": 0,
-                    "learning_score": 0,
-                    "market_alignment": 0,
-                    "performance_score": 0
-                },
-                "target_role": target_role,
-                "confidence_level": "low"
-            },
-            "security": {
-                "security_score": 0,
-                "automation_risk": 0,
-                "market_demand_score": 0,
-                "obsolescence_risk": 0,
-                "industry_stability": 0,
-                "risk_factors": ["Complete an assessment to see job security signals"],
-                "security_strengths": [],
-                "recommendations": ["Take the free assessment to get started"],
-                "risk_timeline": {
-                    "short_term": "N/A",
-                    "medium_term": "N/A",
-                    "long_term": "N/A"
-                },
-                "security_level": "low"
-            },
-            "pivot": {
-                "overall_readiness": 0,
-                "current_category": "General",
-                "target_roles": [],
-                "pivot_analyses": [],
-                "transferable_skills": [],
-                "skill_gaps": [],
-                "time_to_pivot": "N/A",
-                "pivot_strategy": {
-                    "leverage_transferable_skills": [],
-                    "focus_areas": [],
-                    "learning_path": "Complete an assessment to see pivot strategy",
-                    "networking": "Complete an assessment to see networking recommendations",
-                    "timeline": "Complete an assessment to see timeline",
-                    "approach": "Complete an assessment to see approach"
-                },
-                "readiness_level": "low"
-            }
-        }
+    predictive_context = PredictiveContext(CareerIntelligenceService(db), context, target_role, target_roles_list)
+    section_run = await predictive_sections.build_concurrently(
+        predictive_context, predictive_sections.names, empty_sections
+    )
+    if response is not None:
+        response.headers["Server-Timing"] = section_run.server_timing()
     
     return {
         "user_id": user_id_int,
         "has_assessment": True,
-        "promotion": promotion,
-        "security": security,
-        "pivot": pivot
+        **section_run.values
     }
 
+
+# Largest cohort one request may analyze
+MAX_COHORT_USERS = 1000
+
+
+class CohortAnalyticsRequest(BaseModel):
+    user_ids: List[int] = Field(default_factory=list, max_length=MAX_COHORT_USERS)
+    cohort_id: Optional[int] = None  # adds the members of a community cohort
+    target_role: Optional[str] = None
+    target_roles: Optional[List[str]] = None
+
+
+@router.post("/analytics/cohort")
+async def stream_cohort_predictive_analytics(
+    request: CohortAnalyticsRequest,
+    db: Session = Depends(get_db)
+):
+    """Predictive analytics of many users, streamed as NDJSON.
+
+    One line per requested user, in request order (cohort members follow
+    the listed users), shaped like the single-user analytics response.
+    Every user's rows are read before the stream starts, with one query
+    per table; the analyses run over columnar arrays while lines are sent.
+    """
+    user_ids = list(request.user_ids)
+    if request.cohort_id is not None:
+        members = (
+            db.query(CohortMembership.user_id)
+            .filter(CohortMembership.cohort_id == request.cohort_id)
+            .order_by(CohortMembership.id)
+        )
+        user_ids.extend(user_id for (user_id,) in members)
+    user_ids = list(dict.fromkeys(user_ids))
+    if len(user_ids) > MAX_COHORT_USERS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_COHORT_USERS} users per request")
+    
+    contexts = UserContext.load_many(db, user_ids)
+    results = CareerIntelligenceService(db).calculate_cohort_analytics(
+        user_ids, request.target_role, request.target_roles, contexts=contexts
+    )
+    empty_sections = empty_predictive_sections(request.target_role)
+    
+    def lines():
+        for user_id, sections in results:
+            if sections is None:
+                record = {"user_id": user_id, "has_assessment": False, **empty_sections}
+            else:
+                record = {"user_id": user_id, "has_assessment": True, **sections}
+            yield json.dumps(record) + "\n"
+    
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
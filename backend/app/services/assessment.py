@@ -9,6 +9,9 @@ from app.services.assessment_intelligence import (
     analyze_career_trajectory
 )
 from app.services.personality_analyzer import PersonalityAnalyzer
+from app.services.dashboard_cache import dashboard_cache
+from app.services.match_materializer import match_materializer
+from app.services.skill_canonicalizer import skill_canonicalizer
 from app.services.contextual_messages import (
     get_contextual_message,
     get_encouragement_message,
@@ -74,6 +77,7 @@ class AssessmentService:
             assessment.career_interests = {}
         
         assessment.career_interests[question_id] = answer
+        assessment.matches_version = None  # Job matches are recomputed on next read
         self.db.commit()
         
         # Generate intelligent follow-up
@@ -117,6 +121,13 @@ class AssessmentService:
         
         self.db.commit()
         
+        # Re-score materialized job matches against the new skills and answers
+        try:
+            match_materializer.refresh_user(self.db, user_id_int)
+        except Exception as e:
+            self.db.rollback()
+            print(f"Warning: Failed to refresh job matches: {e}")
+        
         # Auto-generate learning path after assessment completion
         try:
             self._auto_generate_learning_path(user_id_int, all_answers)
@@ -124,6 +135,10 @@ class AssessmentService:
             # Don't fail assessment completion if learning path generation fails
             print(f"Warning: Failed to auto-generate learning path: {e}")
         
+        # Answers, skills and the new learning path all feed the dashboard
+        dashboard_cache.invalidate(self.db, user_id_int)
+        self.db.commit()
+        
         # Get final personality profile if analyzer exists
         final_personality_profile = None
         if user_id_int in self._personality_analyzers:
@@ -254,6 +269,7 @@ class AssessmentService:
             self.db.commit()
         except Exception as e:
             # Log error but don't fail assessment completion
+            self.db.rollback()
             import traceback
             print(f"Warning: Failed to auto-generate learning path: {e}")
             print(traceback.format_exc())
@@ -344,17 +360,23 @@ class AssessmentService:
         # Delete existing skills for this user
         self.db.query(UserSkill).filter(UserSkill.user_id == user_id).delete()
         
-        # Save new skills
+        # Save new skills under their canonical names; aliases of a saved skill are dropped
+        saved_skills = set()
         for skill_name, proficiency in skills_data.items():
             if proficiency and proficiency != "None":
+                canonical_name = skill_canonicalizer.canonical(skill_name)
+                if canonical_name in saved_skills:
+                    continue
+                saved_skills.add(canonical_name)
                 user_skill = UserSkill(
                     user_id=user_id,
-                    skill_name=skill_name,
+                    skill_name=canonical_name,
                     proficiency_level=proficiency,
                     skill_category="technical"
                 )
                 self.db.add(user_skill)
         
+        dashboard_cache.invalidate(self.db, user_id)
         self.db.commit()
     
     def save_intelligent_answer(self, user_id: str, question_id: str, answer: Any) -> Dict[str, Any]:
@@ -379,6 +401,7 @@ class AssessmentService:
             assessment.career_interests = {}
         
         assessment.career_interests[question_id] = answer
+        assessment.matches_version = None  # Job matches are recomputed on next read
         self.db.commit()
         
         # Get or create personality analyzer for this user
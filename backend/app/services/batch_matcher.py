@@ -0,0 +1,315 @@
+"""Batch recomputation of job matches for every user with an assessment.
+
+The parent process loads the job index once and copies its NumPy columns and
+CSR posting lists into shared memory, together with what describe_match
+reads per job: each job's skill lists (CSR rows of indexes into a skill
+vocabulary) and its culture level per culture type. Only small lookup tables
+are pickled into each worker. Worker processes attach to those blocks
+read-only and score shards of users with the same MatchMaterializer code the
+online path uses, so online and offline scores agree. The parent bulk-writes
+each finished shard to ``job_matches``.
+
+Usage:
+    python -m app.services.batch_matcher [--workers 8] [--chunk-size 500]
+"""
+
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.models.assessment import Assessment
+from app.services.job_index import JobIndex, job_index
+from app.services.match_analysis import CULTURE_INDICATORS
+from app.services.match_materializer import MatchMaterializer, load_user_skills
+from app.services.semantic_matcher import HashedTfidfVectorizer, load_resume_vectors
+from app.services.skill_canonicalizer import skill_canonicalizer
+
+# (user id, skills, assessment answers, resume vector or None)
+UserShard = List[Tuple[int, Dict[str, str], Dict[str, Any], Optional[np.ndarray]]]
+
+_POSTING_KINDS = ["required", "preferred"]
+
+# Culture level codes of the shared culture_levels matrix; 0 means the type is absent
+_CULTURE_LEVELS = [None, "medium", "high"]
+
+
+@dataclass
+class BatchStats:
+    users: int = 0
+    matches: int = 0
+    seconds: float = 0.0
+
+    @property
+    def users_per_second(self) -> float:
+        return round(self.users / self.seconds, 1) if self.seconds else float(self.users)
+
+
+class SharedJobIndex(JobIndex):
+    """Read-only JobIndex whose columns and posting lists live in shared memory"""
+
+    def __init__(self, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]):
+        self._lock = threading.RLock()
+        for name in self._COLUMNS:
+            setattr(self, name, arrays[name])
+        self._size = meta["size"]
+        self._experience_codes = meta["experience_codes"]
+        self._remote_codes = meta["remote_codes"]
+        self._skill_names = meta["skill_names"]
+        self._job_skills = {kind: (arrays[f"job_{kind}_indptr"], arrays[f"job_{kind}_skills"]) for kind in _POSTING_KINDS}
+        self._culture_levels = arrays["culture_levels"]
+        self._slot_of = {job_id: slot for slot, job_id in enumerate(self.job_ids.tolist()) if self.active[slot]}
+        self._postings = {
+            kind: (
+                {skill_canonicalizer.skill_id(skill): k for k, skill in enumerate(meta["skills"][kind])},
+                arrays[f"{kind}_indptr"],
+                arrays[f"{kind}_slots"],
+            )
+            for kind in _POSTING_KINDS
+        }
+        self._loaded = True
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """The job's skill lists, the only job fields describe_match reads"""
+        slot = self._slot_of.get(job_id)
+        if slot is None:
+            return None
+        job = {"id": job_id}
+        for kind in _POSTING_KINDS:
+            indptr, skills = self._job_skills[kind]
+            job[f"{kind}_skills"] = [self._skill_names[k] for k in skills[indptr[slot]:indptr[slot + 1]].tolist()]
+        return job
+
+    def features(self, job_id: int) -> Dict[str, Any]:
+        """The derived features describe_match reads: culture analysis and growth score"""
+        slot = self._slot_of[job_id]
+        levels = self._culture_levels[slot].tolist()
+        return {
+            "culture_analysis": {
+                culture_type: _CULTURE_LEVELS[level] for culture_type, level in zip(CULTURE_INDICATORS, levels) if level
+            },
+            "growth_potential": {"score": float(self.growth_score[slot])},
+        }
+
+    def posting_slots(self, kind: str, skill_id: int) -> np.ndarray:
+        positions, indptr, slots = self._postings[kind]
+        k = positions.get(skill_id)
+        if k is None:
+            return slots[:0]
+        return slots[indptr[k]:indptr[k + 1]]
+
+
+def share_job_index(index: JobIndex) -> Tuple[List[SharedMemory], Dict[str, tuple], Dict[str, Any]]:
+    """Copy an index into shared memory blocks.
+
+    Returns the blocks (the caller closes and unlinks them), the
+    ``name -> (block, dtype, shape)`` descriptors workers attach to, and the
+    small picklable metadata SharedJobIndex needs besides the arrays.
+    """
+    with index._lock:
+        size = index.size
+        arrays = {name: getattr(index, name)[:size] for name in JobIndex._COLUMNS}
+        skills = {}
+        for kind in _POSTING_KINDS:
+            skills[kind], arrays[f"{kind}_indptr"], arrays[f"{kind}_slots"] = index.posting_lists(kind)
+        skill_names = _share_job_details(index, size, arrays)
+        meta = {
+            "size": size,
+            "experience_codes": dict(index.experience_codes),
+            "remote_codes": dict(index.remote_codes),
+            "skills": skills,
+            "skill_names": skill_names,
+        }
+
+    blocks: List[SharedMemory] = []
+    descriptors: Dict[str, tuple] = {}
+    try:
+        for name, array in arrays.items():
+            block = SharedMemory(create=True, size=max(array.nbytes, 1))
+            blocks.append(block)
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+            descriptors[name] = (block.name, array.dtype.str, array.shape)
+    except Exception:
+        release_blocks(blocks)
+        raise
+    return blocks, descriptors, meta
+
+
+def _share_job_details(index: JobIndex, size: int, arrays: Dict[str, np.ndarray]) -> List[str]:
+    """Add each slot's skill lists (CSR) and culture levels to ``arrays``; returns the skill vocabulary"""
+    vocabulary: Dict[str, int] = {}
+    rows = {kind: [] for kind in _POSTING_KINDS}
+    culture_levels = np.zeros((size, len(CULTURE_INDICATORS)), dtype=np.int8)
+    for slot, job_id in enumerate(index.job_ids[:size].tolist()):
+        job = index.get(job_id) if index.active[slot] else None
+        for kind in _POSTING_KINDS:
+            skills = job[f"{kind}_skills"] if job else []
+            rows[kind].append([vocabulary.setdefault(skill, len(vocabulary)) for skill in skills])
+        if job:
+            culture = index.features(job_id)["culture_analysis"]
+            culture_levels[slot] = [_CULTURE_LEVELS.index(culture.get(culture_type)) for culture_type in CULTURE_INDICATORS]
+
+    for kind in _POSTING_KINDS:
+        indptr = np.zeros(size + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(row) for row in rows[kind]])
+        arrays[f"job_{kind}_indptr"] = indptr
+        arrays[f"job_{kind}_skills"] = np.fromiter(
+            (k for row in rows[kind] for k in row), dtype=np.int32, count=int(indptr[-1])
+        )
+    arrays["culture_levels"] = culture_levels
+    return list(vocabulary)
+
+
+def release_blocks(blocks: List[SharedMemory]) -> None:
+    for block in blocks:
+        block.close()
+        block.unlink()
+
+
+# Per-worker state, set up once by _init_worker
+_worker_blocks: List[SharedMemory] = []
+_worker_materializer: Optional[MatchMaterializer] = None
+
+
+def _init_worker(descriptors: Dict[str, tuple], meta: Dict[str, Any]) -> None:
+    global _worker_materializer
+    arrays = {}
+    for name, (block_name, dtype, shape) in descriptors.items():
+        block = SharedMemory(name=block_name)
+        _worker_blocks.append(block)
+        array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        array.flags.writeable = False
+        arrays[name] = array
+    _worker_materializer = MatchMaterializer(SharedJobIndex(arrays, meta))
+
+
+def _score_shard(shard: UserShard) -> Tuple[List[int], List[Dict[str, Any]]]:
+    return _score_with(_worker_materializer, shard)
+
+
+def _score_with(materializer: MatchMaterializer, shard: UserShard) -> Tuple[List[int], List[Dict[str, Any]]]:
+    rows: List[Dict[str, Any]] = []
+    for user_id, user_skills, answers, resume_vector in shard:
+        rows.extend(materializer.score_rows(user_id, user_skills, answers, resume_vector=resume_vector))
+    return [user_id for user_id, _, _, _ in shard], rows
+
+
+def iter_user_shards(db: Session, chunk_size: int, vectorizer: HashedTfidfVectorizer):
+    """Users with an assessment, chunk by chunk in user id order.
+
+    Resume vectors are computed here against the parent's document
+    frequencies, so workers need no vectorizer of their own.
+    """
+    last_user_id = 0
+    while True:
+        assessments = (
+            db.query(Assessment)
+            .filter(Assessment.user_id > last_user_id)
+            .order_by(Assessment.user_id)
+            .limit(chunk_size)
+            .all()
+        )
+        if not assessments:
+            return
+        last_user_id = assessments[-1].user_id
+        user_ids = [assessment.user_id for assessment in assessments]
+        skills = load_user_skills(db, user_ids)
+        resume_vectors = load_resume_vectors(db, user_ids, vectorizer)
+        yield [
+            (
+                assessment.user_id,
+                skills[assessment.user_id],
+                dict(assessment.career_interests or {}),
+                resume_vectors.get(assessment.user_id),
+            )
+            for assessment in assessments
+        ]
+
+
+def run_batch(
+    db: Session,
+    workers: Optional[int] = None,
+    chunk_size: int = 500,
+    index: Optional[JobIndex] = None,
+    progress: Optional[Callable[[BatchStats], None]] = None,
+) -> BatchStats:
+    """Recompute and store the job matches of every user with an assessment.
+
+    ``workers=0`` scores in this process, which is handy for small databases
+    and tests; otherwise shards go to a pool of ``workers`` processes.
+    """
+    index = index or job_index
+    index.ensure_loaded(db)
+    materializer = MatchMaterializer(index)
+    stats = BatchStats()
+    started = time.perf_counter()
+
+    def store(result: Tuple[List[int], List[Dict[str, Any]]]) -> None:
+        user_ids, rows = result
+        materializer.replace_user_matches(db, user_ids, rows)
+        stats.users += len(user_ids)
+        stats.matches += len(rows)
+        stats.seconds = time.perf_counter() - started
+        if progress:
+            progress(stats)
+
+    if workers == 0:
+        for shard in iter_user_shards(db, chunk_size, index.vectorizer):
+            store(_score_with(materializer, shard))
+    else:
+        workers = workers or os.cpu_count() or 1
+        blocks, descriptors, meta = share_job_index(index)
+        try:
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(descriptors, meta)) as pool:
+                in_flight = set()
+                for shard in iter_user_shards(db, chunk_size, index.vectorizer):
+                    # Keep a bounded number of shards queued so memory stays flat
+                    if len(in_flight) >= workers * 2:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            store(future.result())
+                    in_flight.add(pool.submit(_score_shard, shard))
+                for future in wait(in_flight).done:
+                    store(future.result())
+        finally:
+            release_blocks(blocks)
+
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Recompute job matches for every user with an assessment")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count, 0: in-process)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Users per shard")
+    args = parser.parse_args(argv)
+
+    from app.core.database import Base, SessionLocal, engine
+    from app.models import user, assessment, job, community  # noqa: F401 - register models
+
+    Base.metadata.create_all(bind=engine)
+
+    def report(stats: BatchStats) -> None:
+        print(f"{stats.users} users, {stats.matches} matches ({stats.users_per_second} users/s)")
+
+    db = SessionLocal()
+    try:
+        stats = run_batch(db, workers=args.workers, chunk_size=args.chunk_size, progress=report)
+    finally:
+        db.close()
+
+    print(f"Matched {stats.users} users ({stats.matches} matches) in {stats.seconds:.1f}s ({stats.users_per_second} users/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+"""Population percentiles for the dashboard benchmarks.
+
+Every benchmark metric (skill count, average match score, learning path
+count, completion rate) has a small bounded range, so each experience
+level keeps an exact histogram of it in a Fenwick tree: a user's change
+moves one count from their old bucket to the new one, and a percentile is
+one prefix sum, both O(log buckets) whatever the number of users. Unlike
+a t-digest or KLL sketch the counts are exact and support removal, which
+incremental updates need.
+
+The index follows users through ``Assessment.updated_at``, which moves
+whenever their skills, assessment, learning progress or materialized
+matches change, and is snapshotted to disk (``BENCHMARK_SNAPSHOT``). Match
+rescoring caused by job edits and deleted assessments are picked up on the
+next rebuild.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.assessment import Assessment, LearningPath
+from app.services.user_context import UserContext
+
+# name, buckets per unit, largest bucket; larger values share the last bucket
+METRICS: List[Tuple[str, int, int]] = [
+    ("skills", 1, 255),
+    ("match_score", 10, 1000),
+    ("learning_paths", 1, 255),
+    ("completion_rate", 10, 1000),
+]
+SNAPSHOT_VERSION = 1
+# Percentiles may lag user changes by this much; syncing on every request would re-read the latest rows each time
+SYNC_INTERVAL_SECONDS = 5.0
+
+SNAPSHOT_PATH = os.getenv("BENCHMARK_SNAPSHOT", "./benchmarks.npz")
+
+_INITIAL_CAPACITY = 1024
+
+
+def experience_level_of(assessment: Assessment) -> str:
+    return (assessment.career_interests or {}).get("experience_level", "Entry Level")
+
+
+def user_metrics(skill_count: int, match_scores: List[float], learning_paths: List[LearningPath]) -> Dict[str, float]:
+    """The benchmark metrics of one user"""
+    return {
+        "skills": skill_count,
+        "match_score": sum(match_scores) / len(match_scores) if match_scores else 0,
+        "learning_paths": len(learning_paths),
+        "completion_rate": (
+            sum(path.progress_percentage or 0 for path in learning_paths) / len(learning_paths) if learning_paths else 0
+        ),
+    }
+
+
+def _buckets(metrics: Dict[str, float]) -> List[int]:
+    return [min(largest, max(0, int(round(metrics[name] * per_unit)))) for name, per_unit, largest in METRICS]
+
+
+class FenwickHistogram:
+    """Counts per bucket with O(log n) updates and prefix counts"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.tree = np.zeros(size + 1, dtype=np.int64)
+        self.total = 0
+
+    @classmethod
+    def from_counts(cls, counts: np.ndarray) -> "FenwickHistogram":
+        histogram = cls(len(counts))
+        tree = histogram.tree
+        tree[1:] = counts
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        histogram.total = int(counts.sum())
+        return histogram
+
+    def add(self, bucket: int, delta: int = 1) -> None:
+        self.total += delta
+        i = bucket + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def count_through(self, bucket: int) -> int:
+        """Values in buckets 0..bucket"""
+        count = 0
+        i = bucket + 1
+        while i > 0:
+            count += int(self.tree[i])
+            i -= i & -i
+        return count
+
+    def percentile(self, bucket: int) -> Optional[float]:
+        """Share of values below the bucket plus half of those in it, 0-100; None when empty"""
+        if self.total <= 0:
+            return None
+        below = self.count_through(bucket - 1) if bucket > 0 else 0
+        equal = self.count_through(bucket) - below
+        return (below + equal / 2) / self.total * 100
+
+
+class BenchmarkIndex:
+    """Per-experience-level metric histograms plus each user's current buckets"""
+
+    def __init__(self, snapshot_path: str = SNAPSHOT_PATH):
+        self.snapshot_path = snapshot_path
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._level_codes: Dict[str, int] = {}
+        self._histograms: List[List[FenwickHistogram]] = []
+        # Indexed by user id; level -1 means the user is not counted
+        self._user_level = np.full(_INITIAL_CAPACITY, -1, dtype=np.int32)
+        self._user_buckets = np.zeros((_INITIAL_CAPACITY, len(METRICS)), dtype=np.int16)
+        self._watermark: Optional[datetime] = None
+        self._synced_at = float("-inf")
+        self._dirty = False
+        self._loaded = False
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def population(self, experience_level: str) -> int:
+        with self._lock:
+            level = self._level_codes.get(experience_level)
+            return self._histograms[level][0].total if level is not None else 0
+
+    def sync(self, db: Session) -> None:
+        """Load on first use, then apply user changes at most every SYNC_INTERVAL_SECONDS"""
+        if not self._loaded:
+            self.ensure_loaded(db)
+        elif time.monotonic() - self._synced_at >= SYNC_INTERVAL_SECONDS:
+            self.catch_up(db)
+
+    def ensure_loaded(self, db: Session) -> None:
+        """Load the snapshot and catch up with the database, or build from scratch"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            if not self.load_snapshot():
+                self._reset()
+            self.catch_up(db)
+            self._loaded = True
+            self.save_snapshot()
+
+    def rebuild(self, db: Session) -> None:
+        with self._lock:
+            self._reset()
+            self.catch_up(db)
+            self._loaded = True
+
+    def catch_up(self, db: Session) -> int:
+        """Re-count users whose assessment changed at or after the watermark; returns how many"""
+        with self._lock:
+            watermark = db.query(func.max(Assessment.updated_at)).scalar()
+            query = db.query(Assessment.user_id).distinct()
+            if self._watermark is not None:
+                query = query.filter(Assessment.updated_at >= self._watermark)
+            user_ids = sorted(user_id for (user_id,) in query)
+            for start in range(0, len(user_ids), 500):
+                for context in UserContext.load_many(db, user_ids[start:start + 500]).values():
+                    self.update(context)
+            self._watermark = watermark
+            self._synced_at = time.monotonic()
+            return len(user_ids)
+
+    def update(self, context: UserContext) -> None:
+        """Move a user's counts to their current metrics; users without an assessment are dropped"""
+        with self._lock:
+            self.remove(context.user_id)
+            if context.assessment is None:
+                return
+            level = self._level(experience_level_of(context.assessment))
+            buckets = _buckets(user_metrics(len(context.skills), context.match_scores, context.learning_paths))
+            for histogram, bucket in zip(self._histograms[level], buckets):
+                histogram.add(bucket)
+            self._ensure_capacity(context.user_id)
+            self._user_level[context.user_id] = level
+            self._user_buckets[context.user_id] = buckets
+            self._dirty = True
+
+    def remove(self, user_id: int) -> None:
+        with self._lock:
+            if user_id >= len(self._user_level) or self._user_level[user_id] < 0:
+                return
+            level = int(self._user_level[user_id])
+            for histogram, bucket in zip(self._histograms[level], self._user_buckets[user_id].tolist()):
+                histogram.add(bucket, -1)
+            self._user_level[user_id] = -1
+            self._dirty = True
+
+    def percentiles(self, experience_level: str, metrics: Dict[str, float]) -> Dict[str, float]:
+        """Percentile of each metric among users of the same experience level.
+
+        A level nobody is counted in yet ranks every value at the median.
+        """
+        buckets = _buckets(metrics)
+        with self._lock:
+            level = self._level_codes.get(experience_level)
+            ranks = {}
+            for i, (name, _, _) in enumerate(METRICS):
+                percentile = self._histograms[level][i].percentile(buckets[i]) if level is not None else None
+                ranks[name] = 50.0 if percentile is None else percentile
+            return ranks
+
+    def _level(self, experience_level: str) -> int:
+        if experience_level not in self._level_codes:
+            self._level_codes[experience_level] = len(self._level_codes)
+            self._histograms.append([FenwickHistogram(largest + 1) for _, _, largest in METRICS])
+        return self._level_codes[experience_level]
+
+    def _ensure_capacity(self, user_id: int) -> None:
+        capacity = len(self._user_level)
+        if user_id < capacity:
+            return
+        while capacity <= user_id:
+            capacity *= 2
+        user_level = np.full(capacity, -1, dtype=np.int32)
+        user_level[:len(self._user_level)] = self._user_level
+        user_buckets = np.zeros((capacity, len(METRICS)), dtype=np.int16)
+        user_buckets[:len(self._user_buckets)] = self._user_buckets
+        self._user_level, self._user_buckets = user_level, user_buckets
+
+    def save_snapshot(self) -> None:
+        """Write every user's level and buckets plus the sync watermark to disk, atomically"""
+        with self._lock:
+            if not self._dirty and os.path.exists(self.snapshot_path):
+                return
+            counted = np.flatnonzero(self._user_level >= 0)
+            meta = {
+                "version": SNAPSHOT_VERSION,
+                "metrics": METRICS,
+                "levels": list(self._level_codes),
+                "watermark": self._watermark.isoformat() if self._watermark else None,
+            }
+            tmp_path = f"{self.snapshot_path}.tmp"
+            try:
+                with open(tmp_path, "wb") as f:
+                    np.savez(
+                        f,
+                        user_ids=counted,
+                        levels=self._user_level[counted],
+                        buckets=self._user_buckets[counted],
+                        meta=np.array(json.dumps(meta)),
+                    )
+                os.replace(tmp_path, self.snapshot_path)
+                self._dirty = False
+            except OSError as e:
+                print(f"Warning: Failed to save benchmark snapshot: {e}")
+
+    def load_snapshot(self) -> bool:
+        """Replace the index with the snapshot on disk; False if there is no usable one"""
+        if not os.path.exists(self.snapshot_path):
+            return False
+        try:
+            with np.load(self.snapshot_path) as snapshot:
+                meta = json.loads(str(snapshot["meta"]))
+                user_ids = snapshot["user_ids"]
+                levels = snapshot["levels"]
+                buckets = snapshot["buckets"]
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: Ignoring unreadable benchmark snapshot: {e}")
+            return False
+        if meta.get("version") != SNAPSHOT_VERSION or meta.get("metrics") != [list(metric) for metric in METRICS]:
+            return False
+
+        with self._lock:
+            self._reset()
+            for name in meta["levels"]:
+                self._level(name)
+            if len(user_ids):
+                self._ensure_capacity(int(user_ids.max()))
+                self._user_level[user_ids] = levels
+                self._user_buckets[user_ids] = buckets
+            for level in range(len(self._level_codes)):
+                in_level = buckets[levels == level]
+                self._histograms[level] = [
+                    FenwickHistogram.from_counts(np.bincount(in_level[:, i], minlength=largest + 1))
+                    for i, (_, _, largest) in enumerate(METRICS)
+                ]
+            self._watermark = datetime.fromisoformat(meta["watermark"]) if meta["watermark"] else None
+        return True
+
+
+benchmark_index = BenchmarkIndex()
@@ -1,72 +1,137 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
 from sqlalchemy.orm import Session
 from app.models.assessment import Assessment, UserSkill, LearningResource, LearningPath
 from app.models.job import Job
+from app.services.market_data import MarketSnapshot, market_data
+from app.services.role_requirements import role_requirements
+from app.services.skill_taxonomy import skill_taxonomy
+from app.services.skill_trajectory import project_trajectories, store_trajectories, stored_trajectories
+from app.services.user_context import UserContext
 from datetime import datetime, timedelta
 import json
 
+# Skills whose presence counts towards market alignment (promotion) and market demand (job security)
+MARKET_ALIGNMENT_SKILLS = ["React", "Python", "AWS", "Machine Learning", "TypeScript", "Docker"]
+IN_DEMAND_SKILLS = ["React", "TypeScript", "Python", "AWS", "Docker", "Kubernetes", "Machine Learning", "Node.js"]
+
+# Per-skill automation and obsolescence risk, with the risk of unlisted skills
+AUTOMATION_RISK_FACTORS = {
+    "Manual Testing": 0.8,
+    "Data Entry": 0.9,
+    "Basic HTML/CSS": 0.3,
+    "React": 0.1,
+    "Python": 0.15,
+    "Machine Learning": 0.05,
+    "AWS": 0.1,
+    "Docker": 0.12,
+    "Kubernetes": 0.08,
+    "TypeScript": 0.1,
+    "Node.js": 0.12,
+    "GraphQL": 0.1,
+}
+DEFAULT_AUTOMATION_RISK = 0.2
+ADVANCED_AUTOMATION_FACTOR = 0.7  # Advanced skills have lower automation risk
+OBSOLESCENCE_RISK_FACTORS = {
+    "jQuery": 0.7,
+    "AngularJS": 0.6,
+    "PHP": 0.4,
+    "Flash": 0.9,
+    "React": 0.05,
+    "TypeScript": 0.03,
+    "Python": 0.05,
+    "AWS": 0.03,
+}
+DEFAULT_OBSOLESCENCE_RISK = 0.1
+
+ADVANCED_LEVELS = ["Advanced", "Expert"]
+
+# Users analyzed together by calculate_cohort_analytics
+COHORT_CHUNK_SIZE = 256
+
+
 class CareerIntelligenceService:
-    """AI-powered career intelligence and enhancement service"""
+    """AI-powered career intelligence and enhancement service.
+
+    The per-user analyses take an optional UserContext; routers running
+    several of them for one request load it once and pass it to each.
+    """
     
     def __init__(self, db: Session):
         self.db = db
     
-    def generate_skill_trajectory_predictions(self, user_id: int) -> Dict[str, Any]:
-        """Generate 5-year career trajectory predictions based on current skills"""
-        user_skills = self.db.query(UserSkill).filter(UserSkill.user_id == user_id).all()
-        
-        # Mock market data (in production, this would come from real market APIs)
-        market_trends = {
-            "AI/ML": {"growth_rate": 0.35, "demand": 95, "salary_premium": 25000},
-            "Cloud/DevOps": {"growth_rate": 0.28, "demand": 88, "salary_premium": 18000},
-            "Frontend": {"growth_rate": 0.15, "demand": 82, "salary_premium": 8000},
-            "Backend": {"growth_rate": 0.12, "demand": 78, "salary_premium": 7000},
-            "Data Science": {"growth_rate": 0.32, "demand": 92, "salary_premium": 22000},
-            "Cybersecurity": {"growth_rate": 0.41, "demand": 96, "salary_premium": 28000}
-        }
+    def _context(self, user_id: int, context: Optional[UserContext]) -> UserContext:
+        return context if context is not None else UserContext.load(self.db, user_id)
+    
+    def generate_skill_trajectory_predictions(
+        self,
+        user_id: int,
+        context: Optional[UserContext] = None,
+        market: Optional[MarketSnapshot] = None,
+        current_year: Optional[int] = None,
+        store: bool = True,
+    ) -> Dict[str, Any]:
+        """Generate 5-year career trajectory predictions based on current skills.
+
+        Predictions are stored on the assessment and reused until the user's
+        skills change; a recomputation is left for the caller to commit.
+        With store=False nothing is written, so the call is safe off the
+        request thread; the caller stores the result with store_trajectories.
+        """
+        context = self._context(user_id, context)
+        market = market or market_data.current()
+        current_year = current_year or datetime.now().year
+        if context.assessment is not None:
+            stored = stored_trajectories(context.assessment, current_year, market)
+            if stored is not None:
+                return stored
+        
+        user_skills = context.skills
+        categories = [self._categorize_skill(skill.skill_name) for skill in user_skills]
+        projection = project_trajectories(
+            [skill.skill_name for skill in user_skills],
+            [skill.proficiency_level for skill in user_skills],
+            categories,
+            current_year,
+            market,
+        )
         
         predictions = {}
-        current_year = datetime.now().year
-        
-        for skill in user_skills:
-            skill_category = self._categorize_skill(skill.skill_name)
-            trend = market_trends.get(skill_category, {"growth_rate": 0.1, "demand": 50, "salary_premium": 5000})
-            
-            # Calculate future value based on market trends and skill decay
-            skill_trajectory = []
-            current_value = skill.proficiency_level in ["Advanced", "Expert"]
-            
-            for year in range(5):
-                year_offset = year + 1
-                # Skills compound in value when combined with complementary skills
-                synergy_bonus = self._calculate_skill_synergy_bonus(skill.skill_name, user_skills)
-                year_value = current_value * (1 + trend["growth_rate"] + synergy_bonus) ** year_offset
-                year_demand = min(100, trend["demand"] * (1 + year_offset * 0.05))
-                
-                skill_trajectory.append({
-                    "year": current_year + year_offset,
-                    "market_value": min(100, year_value * 100),
-                    "demand_score": min(100, year_demand),
-                    "salary_impact": trend["salary_premium"] * year_offset,
-                    "automation_risk": self._calculate_automation_risk(skill.skill_name, year_offset)
-                })
-            
+        rows = zip(
+            projection.market_value.tolist(),
+            projection.demand_score.tolist(),
+            projection.salary_impact.tolist(),
+            projection.automation_risk.tolist(),
+        )
+        for skill, skill_category, (values, demands, salaries, risks) in zip(user_skills, categories, rows):
+            trend = market.segment_trend(skill_category)
             predictions[skill.skill_name] = {
                 "current_level": skill.proficiency_level,
                 "category": skill_category,
-                "trajectory": skill_trajectory,
+                "trajectory": [
+                    {
+                        "year": year,
+                        "market_value": value,
+                        "demand_score": demand,
+                        "salary_impact": salary,
+                        "automation_risk": risk
+                    }
+                    for year, value, demand, salary, risk in zip(projection.years, values, demands, salaries, risks)
+                ],
                 "recommendations": self._generate_skill_recommendations(skill, trend)
             }
         
+        if store and context.assessment is not None:
+            store_trajectories(context.assessment, predictions, current_year, market)
         return predictions
     
-    def calculate_market_readiness_score(self, user_id: int) -> int:
+    def calculate_market_readiness_score(self, user_id: int, context: Optional[UserContext] = None) -> int:
         """Calculate overall market readiness score (0-100)"""
-        assessment = self.db.query(Assessment).filter(Assessment.user_id == user_id).first()
+        context = self._context(user_id, context)
+        assessment = context.assessment
         if not assessment:
             return 0
         
-        user_skills = self.db.query(UserSkill).filter(UserSkill.user_id == user_id).all()
+        user_skills = context.skills
         
         # Base score from skills and experience
         skill_score = min(40, len([s for s in user_skills if s.proficiency_level in ["Advanced", "Expert"]]) * 10)
@@ -165,7 +230,7 @@ class CareerIntelligenceService:
         user_market_value = self._calculate_user_market_value(user_skills, assessment)
         
         # Extract job salary range
-        job_salary_range = self._parse_salary_range(job.salary_range or "")
+        job_salary_range = self._job_salary_range(job)
         
         # Market analysis for this role
         market_analysis = self._get_job_market_analysis(job.title, job.location)
@@ -186,60 +251,7 @@ class CareerIntelligenceService:
     
     def _categorize_skill(self, skill_name: str) -> str:
         """Categorize skills into market segments"""
-        ai_ml_skills = ["Python", "TensorFlow", "PyTorch", "Machine Learning", "AI", "Data Science"]
-        cloud_devops_skills = ["AWS", "Azure", "Docker", "Kubernetes", "DevOps", "CI/CD"]
-        frontend_skills = ["React", "Vue", "Angular", "JavaScript", "TypeScript", "HTML", "CSS"]
-        backend_skills = ["Node.js", "Python", "Java", "C#", "Go", "Ruby", "PHP"]
-        data_skills = ["SQL", "MongoDB", "PostgreSQL", "Redis", "Data Analysis", "Big Data"]
-        security_skills = ["Cybersecurity", "Security", "Encryption", "Penetration Testing"]
-        
-        skill_lower = skill_name.lower()
-        if any(skill.lower() in skill_lower for skill in ai_ml_skills):
-            return "AI/ML"
-        elif any(skill.lower() in skill_lower for skill in cloud_devops_skills):
-            return "Cloud/DevOps"
-        elif any(skill.lower() in skill_lower for skill in frontend_skills):
-            return "Frontend"
-        elif any(skill.lower() in skill_lower for skill in backend_skills):
-            return "Backend"
-        elif any(skill.lower() in skill_lower for skill in data_skills):
-            return "Data Science"
-        elif any(skill.lower() in skill_lower for skill in security_skills):
-            return "Cybersecurity"
-        else:
-            return "General"
-    
-    def _calculate_skill_synergy_bonus(self, skill_name: str, all_skills: List[UserSkill]) -> float:
-        """Calculate bonus for complementary skills"""
-        synergies = {
-            "React": ["JavaScript", "TypeScript", "HTML", "CSS"],
-            "Python": ["Machine Learning", "Data Science", "Django", "Flask"],
-            "AWS": ["Docker", "Kubernetes", "DevOps"],
-            "Docker": ["Kubernetes", "DevOps", "CI/CD"]
-        }
-        
-        user_skill_names = [s.skill_name for s in all_skills]
-        complementary_skills = synergies.get(skill_name, [])
-        
-        synergy_count = len([skill for skill in complementary_skills if skill in user_skill_names])
-        return min(0.3, synergy_count * 0.1)  # Max 30% bonus
-    
-    def _calculate_automation_risk(self, skill_name: str, years_ahead: int) -> float:
-        """Calculate automation risk for a skill"""
-        risk_factors = {
-            "Manual Testing": 0.8,
-            "Basic HTML/CSS": 0.3,
-            "Data Entry": 0.9,
-            "React": 0.1,
-            "Machine Learning": 0.05,
-            "Cloud Architecture": 0.1,
-            "Cybersecurity": 0.05
-        }
-        
-        base_risk = risk_factors.get(skill_name, 0.2)
-        # Risk increases over time for routine skills
-        time_factor = 1 + (years_ahead * 0.1)
-        return min(0.95, base_risk * time_factor)
+        return skill_taxonomy["market_segment"].category_of(skill_name)
     
     def _generate_skill_recommendations(self, skill: UserSkill, market_trend: Dict) -> List[str]:
         """Generate personalized skill recommendations"""
@@ -268,10 +280,9 @@ class CareerIntelligenceService:
     
     def _calculate_market_alignment(self, user_skills: List[UserSkill]) -> int:
         """Calculate how well user skills align with market demand"""
-        in_demand_skills = ["React", "Python", "AWS", "Machine Learning", "TypeScript", "Docker"]
         user_skill_names = [s.skill_name for s in user_skills]
         
-        aligned_skills = len([skill for skill in in_demand_skills if skill in user_skill_names])
+        aligned_skills = len([skill for skill in MARKET_ALIGNMENT_SKILLS if skill in user_skill_names])
         return min(20, aligned_skills * 4)
     
     def _identify_critical_skill_gaps(self, user_skills: List[UserSkill]) -> List[str]:
@@ -448,33 +459,11 @@ class CareerIntelligenceService:
     
     def _get_skill_market_value(self, skill_name: str) -> int:
         """Get market value for a specific skill"""
-        skill_values = {
-            "React": 8000,
-            "Python": 10000,
-            "AWS": 12000,
-            "Machine Learning": 15000,
-            "TypeScript": 7000,
-            "Docker": 9000,
-            "Kubernetes": 11000,
-            "JavaScript": 5000,
-            "Node.js": 7000,
-            "SQL": 4000
-        }
-        return skill_values.get(skill_name, 2000)
+        return market_data.current().skill_figure("salary_premium", skill_name)
     
-    def _parse_salary_range(self, salary_range: str) -> Dict[str, int]:
-        """Parse salary range string"""
-        if not salary_range:
-            return {"min": 0, "max": 0}
-        
-        import re
-        numbers = re.findall(r'\d+', salary_range.replace('k', '000'))
-        if len(numbers) >= 2:
-            return {"min": int(numbers[0]), "max": int(numbers[1])}
-        elif len(numbers) == 1:
-            return {"min": int(numbers[0]), "max": int(numbers[0])}
-        else:
-            return {"min": 0, "max": 0}
+    def _job_salary_range(self, job: Job) -> Dict[str, int]:
+        """Annual salary band parsed when the job was written"""
+        return {"min": job.salary_min or 0, "max": job.salary_max or 0}
     
     def _get_job_market_analysis(self, job_title: str, location: str) -> Dict[str, Any]:
         """Get market analysis for a specific job"""
@@ -545,24 +534,23 @@ class CareerIntelligenceService:
             "Remote work stipend and home office budget"
         ]
     
-    def calculate_promotion_probability(self, user_id: int, target_role: str = None) -> Dict[str, Any]:
+    def calculate_promotion_probability(self, user_id: int, target_role: str = None, context: Optional[UserContext] = None) -> Dict[str, Any]:
         """Calculate promotion probability based on skills, performance, and market conditions"""
-        assessment = self.db.query(Assessment).filter(Assessment.user_id == user_id).first()
+        context = self._context(user_id, context)
+        assessment = context.assessment
         if not assessment:
             return {"error": "Assessment not found"}
         
-        user_skills = self.db.query(UserSkill).filter(UserSkill.user_id == user_id).all()
-        learning_paths = self.db.query(LearningPath).filter(LearningPath.user_id == user_id).all()
-        job_matches = self.db.query(JobMatch).filter(JobMatch.user_id == user_id).all()
+        user_skills = context.skills
+        learning_paths = context.learning_paths
+        match_scores = context.match_scores
         
         # Calculate base score from skills
-        advanced_skills = [s for s in user_skills if s.proficiency_level in ["Advanced", "Expert"]]
+        advanced_skills = [s for s in user_skills if s.proficiency_level in ADVANCED_LEVELS]
         skill_score = min(30, len(advanced_skills) * 3)
         
         # Calculate experience score
-        career_interests = assessment.career_interests or {}
-        experience_level = assessment.experience_level or career_interests.get("experience_level", "Entry Level (0-2 years)")
-        experience_score = self._experience_level_to_score(experience_level)
+        experience_score = self._experience_level_to_score(self._promotion_experience_level(assessment))
         
         # Calculate learning velocity score
         learning_paths_completed = len([p for p in learning_paths if p.status == "completed"])
@@ -572,16 +560,12 @@ class CareerIntelligenceService:
         market_alignment = self._calculate_market_alignment(user_skills)
         
         # Calculate performance score (based on job match scores)
-        if job_matches:
-            avg_match_score = sum(m.match_score for m in job_matches) / len(job_matches)
+        if match_scores:
+            avg_match_score = sum(match_scores) / len(match_scores)
             performance_score = min(20, avg_match_score / 5)
         else:
             performance_score = 10
         
-        # Calculate base promotion probability
-        base_probability = skill_score + experience_score + learning_score + market_alignment + performance_score
-        base_probability = min(95, max(20, base_probability))
-        
         # Adjust for target role if specified
         role_adjustment = 0
         if target_role:
@@ -591,10 +575,34 @@ class CareerIntelligenceService:
             matching_skills = len([s for s in target_role_skills if s in user_skill_names])
             role_adjustment = (matching_skills / len(target_role_skills)) * 10 if target_role_skills else 0
         
+        return self._promotion_result(
+            context, target_role, skill_score, experience_score, learning_score, market_alignment, performance_score, role_adjustment
+        )
+    
+    def _promotion_experience_level(self, assessment: Assessment) -> str:
+        career_interests = assessment.career_interests or {}
+        return assessment.experience_level or career_interests.get("experience_level", "Entry Level (0-2 years)")
+    
+    def _promotion_result(
+        self,
+        context: UserContext,
+        target_role: Optional[str],
+        skill_score: int,
+        experience_score: int,
+        learning_score: int,
+        market_alignment: int,
+        performance_score: float,
+        role_adjustment: float,
+    ) -> Dict[str, Any]:
+        """Promotion probability of a user from its component scores"""
+        # Calculate base promotion probability
+        base_probability = skill_score + experience_score + learning_score + market_alignment + performance_score
+        base_probability = min(95, max(20, base_probability))
+        
         promotion_probability = min(95, base_probability + role_adjustment)
         
         # Calculate time to promotion
-        time_to_promotion = self._calculate_time_to_promotion(base_probability, experience_level)
+        time_to_promotion = self._calculate_time_to_promotion(base_probability, self._promotion_experience_level(context.assessment))
         
         # Identify key factors
         key_factors = self._identify_promotion_factors(
@@ -602,7 +610,7 @@ class CareerIntelligenceService:
         )
         
         # Identify blockers
-        blockers = self._identify_promotion_blockers(user_skills, assessment, learning_paths)
+        blockers = self._identify_promotion_blockers(context.skills, context.assessment, context.learning_paths)
         
         # Generate recommendations
         recommendations = self._generate_promotion_recommendations(
@@ -628,13 +636,14 @@ class CareerIntelligenceService:
             "confidence_level": "high" if promotion_probability > 70 else "medium" if promotion_probability > 50 else "low"
         }
     
-    def calculate_job_security_signals(self, user_id: int) -> Dict[str, Any]:
+    def calculate_job_security_signals(self, user_id: int, context: Optional[UserContext] = None) -> Dict[str, Any]:
         """Calculate job security signals based on skills, market demand, and industry trends"""
-        assessment = self.db.query(Assessment).filter(Assessment.user_id == user_id).first()
+        context = self._context(user_id, context)
+        assessment = context.assessment
         if not assessment:
             return {"error": "Assessment not found"}
         
-        user_skills = self.db.query(UserSkill).filter(UserSkill.user_id == user_id).all()
+        user_skills = context.skills
         
         # Calculate automation risk
         automation_risk = self._calculate_overall_automation_risk(user_skills)
@@ -648,6 +657,12 @@ class CareerIntelligenceService:
         # Calculate industry stability
         industry_stability = self._calculate_industry_stability(assessment)
         
+        return self._security_result(automation_risk, market_demand_score, obsolescence_risk, industry_stability)
+    
+    def _security_result(
+        self, automation_risk: float, market_demand_score: float, obsolescence_risk: float, industry_stability: float
+    ) -> Dict[str, Any]:
+        """Job security signals from the four risk and demand measures"""
         # Calculate overall security score
         security_score = (
             (100 - automation_risk) * 0.3 +
@@ -686,14 +701,15 @@ class CareerIntelligenceService:
             "security_level": "high" if security_score > 70 else "medium" if security_score > 50 else "low"
         }
     
-    def calculate_pivot_readiness(self, user_id: int, target_roles: List[str] = None) -> Dict[str, Any]:
+    def calculate_pivot_readiness(self, user_id: int, target_roles: List[str] = None, context: Optional[UserContext] = None) -> Dict[str, Any]:
         """Calculate readiness to pivot to new roles or industries"""
-        assessment = self.db.query(Assessment).filter(Assessment.user_id == user_id).first()
+        context = self._context(user_id, context)
+        assessment = context.assessment
         if not assessment:
             return {"error": "Assessment not found"}
         
-        user_skills = self.db.query(UserSkill).filter(UserSkill.user_id == user_id).all()
-        learning_paths = self.db.query(LearningPath).filter(LearningPath.user_id == user_id).all()
+        user_skills = context.skills
+        learning_paths = context.learning_paths
         
         # Get user's current role/category
         current_category = self._determine_current_category(user_skills, assessment)
@@ -703,12 +719,53 @@ class CareerIntelligenceService:
             target_roles = self._suggest_pivot_targets(current_category, user_skills)
         
         # Calculate pivot readiness for each target role
-        pivot_analyses = []
-        for target_role in target_roles:
-            pivot_analysis = self._analyze_pivot_to_role(
-                user_skills, current_category, target_role, learning_paths
+        user_mask = role_requirements.mask(s.skill_name for s in user_skills)
+        completed_paths = len([p for p in learning_paths if p.status == "completed"])
+        pivot_analyses = [
+            self._pivot_role_result(
+                target_role, self._get_skills_for_role(target_role),
+                role_requirements.held(target_role, user_mask), completed_paths
             )
-            pivot_analyses.append(pivot_analysis)
+            for target_role in target_roles
+        ]
+        
+        return self._pivot_result(context, current_category, target_roles, pivot_analyses)
+    
+    def rank_pivot_roles(self, user_id: int, limit: Optional[int] = None, context: Optional[UserContext] = None) -> Dict[str, Any]:
+        """Rank every known role by pivot readiness.
+
+        All roles are scored at once by the overlap of their skill bitsets
+        with the user's; only the top limit roles are analyzed in full.
+        """
+        context = self._context(user_id, context)
+        assessment = context.assessment
+        if not assessment:
+            return {"error": "Assessment not found"}
+        
+        user_skills = context.skills
+        user_mask = role_requirements.mask(s.skill_name for s in user_skills)
+        completed_paths = len([p for p in context.learning_paths if p.status == "completed"])
+        
+        # Learning velocity is the same for every role, so readiness follows skill overlap
+        rankings = [
+            self._pivot_role_result(
+                role, self._get_skills_for_role(role), role_requirements.held(role, user_mask), completed_paths
+            )
+            for role in role_requirements.rank(user_mask, limit)
+        ]
+        
+        return {
+            "current_category": self._determine_current_category(user_skills, assessment),
+            "roles_ranked": len(role_requirements.roles),
+            "rankings": rankings
+        }
+    
+    def _pivot_result(
+        self, context: UserContext, current_category: str, target_roles: List[str], pivot_analyses: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Pivot readiness of a user from the analyses of each target role"""
+        user_skills = context.skills
+        learning_paths = context.learning_paths
         
         # Sort by readiness score
         pivot_analyses.sort(key=lambda x: x["readiness_score"], reverse=True)
@@ -742,20 +799,38 @@ class CareerIntelligenceService:
             "readiness_level": "high" if overall_readiness > 70 else "medium" if overall_readiness > 50 else "low"
         }
     
+    def calculate_cohort_analytics(
+        self,
+        user_ids: Iterable[int],
+        target_role: Optional[str] = None,
+        target_roles: Optional[List[str]] = None,
+        contexts: Optional[Dict[int, UserContext]] = None,
+        chunk_size: int = COHORT_CHUNK_SIZE,
+    ) -> Iterator[Tuple[int, Optional[Dict[str, Dict[str, Any]]]]]:
+        """Promotion, security and pivot analytics of many users, in the order given.
+
+        Rows are loaded for all users at once (one query per table) unless
+        preloaded contexts are passed; the analyses then run over columnar
+        arrays, chunk_size users at a time. Yields (user id, {"promotion",
+        "security", "pivot"}), or (user id, None) for users without an
+        assessment.
+        """
+        # Imported here to avoid a circular import; the cohort analyses reuse this service's helpers
+        from app.services.cohort_analytics import analyze_cohort
+        
+        user_ids = list(dict.fromkeys(user_ids))
+        if contexts is None:
+            contexts = UserContext.load_many(self.db, user_ids)
+        for start in range(0, len(user_ids), chunk_size):
+            chunk = [contexts[user_id] for user_id in user_ids[start:start + chunk_size]]
+            assessed = [context for context in chunk if context.assessment is not None]
+            results = dict(analyze_cohort(self, assessed, target_role, target_roles))
+            for context in chunk:
+                yield context.user_id, results.get(context.user_id)
+    
     def _get_skills_for_role(self, role: str) -> List[str]:
         """Get required skills for a specific role"""
-        role_skills_map = {
-            "Senior Developer": ["React", "TypeScript", "Node.js", "AWS", "Docker"],
-            "Tech Lead": ["Leadership", "Architecture", "System Design", "AWS", "Kubernetes"],
-            "Engineering Manager": ["Leadership", "Project Management", "Agile", "System Design"],
-            "Product Manager": ["Product Strategy", "User Research", "Data Analysis", "Agile"],
-            "Data Scientist": ["Python", "Machine Learning", "SQL", "Statistics", "Data Analysis"],
-            "DevOps Engineer": ["AWS", "Docker", "Kubernetes", "CI/CD", "Terraform"],
-            "Full Stack Developer": ["React", "Node.js", "Python", "SQL", "AWS"],
-            "Frontend Lead": ["React", "TypeScript", "Next.js", "System Design", "Leadership"],
-            "Backend Lead": ["Python", "Node.js", "AWS", "System Design", "Leadership"],
-        }
-        return role_skills_map.get(role, [])
+        return role_requirements.skills(role)
     
     def _calculate_time_to_promotion(self, probability: float, experience_level: str) -> str:
         """Calculate estimated time to promotion"""
@@ -826,27 +901,12 @@ class CareerIntelligenceService:
         if not user_skills:
             return 50.0
         
-        risk_factors = {
-            "Manual Testing": 0.8,
-            "Data Entry": 0.9,
-            "Basic HTML/CSS": 0.3,
-            "React": 0.1,
-            "Python": 0.15,
-            "Machine Learning": 0.05,
-            "AWS": 0.1,
-            "Docker": 0.12,
-            "Kubernetes": 0.08,
-            "TypeScript": 0.1,
-            "Node.js": 0.12,
-            "GraphQL": 0.1,
-        }
-        
         total_risk = 0
         for skill in user_skills:
-            skill_risk = risk_factors.get(skill.skill_name, 0.2)
+            skill_risk = AUTOMATION_RISK_FACTORS.get(skill.skill_name, DEFAULT_AUTOMATION_RISK)
             # Weight by proficiency level
-            if skill.proficiency_level in ["Advanced", "Expert"]:
-                skill_risk *= 0.7  # Advanced skills have lower automation risk
+            if skill.proficiency_level in ADVANCED_LEVELS:
+                skill_risk *= ADVANCED_AUTOMATION_FACTOR
             total_risk += skill_risk
         
         avg_risk = (total_risk / len(user_skills)) * 100 if user_skills else 50
@@ -854,30 +914,18 @@ class CareerIntelligenceService:
     
     def _calculate_market_demand_score(self, user_skills: List[UserSkill]) -> float:
         """Calculate market demand score for user's skills"""
-        in_demand_skills = ["React", "TypeScript", "Python", "AWS", "Docker", "Kubernetes", "Machine Learning", "Node.js"]
         user_skill_names = [s.skill_name for s in user_skills]
-        matching_skills = len([s for s in in_demand_skills if s in user_skill_names])
-        return (matching_skills / len(in_demand_skills)) * 100 if in_demand_skills else 0
+        matching_skills = len([s for s in IN_DEMAND_SKILLS if s in user_skill_names])
+        return (matching_skills / len(IN_DEMAND_SKILLS)) * 100 if IN_DEMAND_SKILLS else 0
     
     def _calculate_skill_obsolescence_risk(self, user_skills: List[UserSkill]) -> float:
         """Calculate risk of skills becoming obsolete"""
-        obsolete_risk_factors = {
-            "jQuery": 0.7,
-            "AngularJS": 0.6,
-            "PHP": 0.4,
-            "Flash": 0.9,
-            "React": 0.05,
-            "TypeScript": 0.03,
-            "Python": 0.05,
-            "AWS": 0.03,
-        }
-        
         if not user_skills:
             return 30.0
         
         total_risk = 0
         for skill in user_skills:
-            skill_risk = obsolete_risk_factors.get(skill.skill_name, 0.1)
+            skill_risk = OBSOLESCENCE_RISK_FACTORS.get(skill.skill_name, DEFAULT_OBSOLESCENCE_RISK)
             total_risk += skill_risk
         
         avg_risk = (total_risk / len(user_skills)) * 100 if user_skills else 30
@@ -973,27 +1021,14 @@ class CareerIntelligenceService:
     
     def _determine_current_category(self, user_skills: List[UserSkill], assessment: Assessment) -> str:
         """Determine user's current role category"""
-        user_skill_names = [s.skill_name for s in user_skills]
-        
-        frontend_skills = ["React", "Vue", "Angular", "JavaScript", "TypeScript", "HTML", "CSS"]
-        backend_skills = ["Python", "Node.js", "Java", "Go", "Ruby", "PHP"]
-        devops_skills = ["AWS", "Docker", "Kubernetes", "Terraform", "CI/CD"]
-        data_skills = ["Python", "SQL", "MongoDB", "PostgreSQL", "Data Science", "Machine Learning"]
-        
-        frontend_count = len([s for s in user_skill_names if s in frontend_skills])
-        backend_count = len([s for s in user_skill_names if s in backend_skills])
-        devops_count = len([s for s in user_skill_names if s in devops_skills])
-        data_count = len([s for s in user_skill_names if s in data_skills])
-        
-        counts = {
-            "Frontend": frontend_count,
-            "Backend": backend_count,
-            "DevOps": devops_count,
-            "Data": data_count
-        }
+        roles = skill_taxonomy["role"]
+        counts = dict.fromkeys(roles.category_ids, 0)
+        for skill in user_skills:
+            for category_id in roles.memberships(skill.skill_name):
+                counts[category_id] += 1
         
         max_category = max(counts, key=counts.get)
-        return max_category if counts[max_category] > 0 else "General"
+        return roles.category_name(max_category) if counts[max_category] > 0 else "General"
     
     def _suggest_pivot_targets(self, current_category: str, user_skills: List[UserSkill]) -> List[str]:
         """Suggest target roles for pivot based on current category"""
@@ -1004,26 +1039,26 @@ class CareerIntelligenceService:
             "Data": ["Data Scientist", "ML Engineer", "Data Engineer", "Analytics Engineer"],
             "General": ["Full Stack Developer", "Product Manager", "Tech Lead", "Engineering Manager"]
         }
-        return pivot_map.get(current_category, ["Full Stack Developer", "Tech Lead", "Product Manager"])
+        suggestions = pivot_map.get(current_category, ["Full Stack Developer", "Tech Lead", "Product Manager"])
+        # Roles without defined requirements would always score zero readiness
+        return [role for role in suggestions if role in role_requirements]
     
-    def _analyze_pivot_to_role(self, user_skills: List[UserSkill], current_category: str, target_role: str, learning_paths: List[LearningPath]) -> Dict[str, Any]:
-        """Analyze readiness to pivot to a specific role"""
-        target_skills = self._get_skills_for_role(target_role)
-        user_skill_names = [s.skill_name for s in user_skills]
-        
+    def _pivot_role_result(
+        self, target_role: str, target_skills: List[str], held: List[bool], completed_paths: int
+    ) -> Dict[str, Any]:
+        """Readiness to pivot to one role; held says which of its skills the user has"""
         # Calculate skill overlap
-        matching_skills = [s for s in target_skills if s in user_skill_names]
+        matching_skills = [s for s, has_skill in zip(target_skills, held) if has_skill]
         skill_overlap = (len(matching_skills) / len(target_skills)) * 100 if target_skills else 0
         
         # Calculate learning velocity
-        completed_paths = len([p for p in learning_paths if p.status == "completed"])
         learning_velocity_score = min(30, completed_paths * 10)
         
         # Calculate readiness score
         readiness_score = (skill_overlap * 0.7) + learning_velocity_score
         
         # Identify skill gaps
-        skill_gaps = [s for s in target_skills if s not in user_skill_names]
+        skill_gaps = [s for s, has_skill in zip(target_skills, held) if not has_skill]
         
         # Calculate time to pivot
         time_to_pivot = self._calculate_time_to_pivot_for_role(skill_gaps, completed_paths)
@@ -1053,22 +1088,16 @@ class CareerIntelligenceService:
     
     def _identify_pivot_skill_gaps(self, user_skills: List[UserSkill], target_roles: List[str]) -> List[Dict[str, Any]]:
         """Identify skill gaps for pivot to target roles"""
-        user_skill_names = [s.skill_name for s in user_skills]
-        all_target_skills = set()
-        
-        for role in target_roles:
-            role_skills = self._get_skills_for_role(role)
-            all_target_skills.update(role_skills)
+        user_mask = role_requirements.mask(s.skill_name for s in user_skills)
         
         gaps = []
-        for skill in all_target_skills:
-            if skill not in user_skill_names:
-                market_value = self._calculate_skill_market_value(skill, "General")
-                gaps.append({
-                    "skill": skill,
-                    "market_value": market_value,
-                    "priority": "high" if market_value > 80 else "medium" if market_value > 60 else "low"
-                })
+        for skill in role_requirements.missing(target_roles, user_mask):
+            market_value = self._calculate_skill_market_value(skill, "General")
+            gaps.append({
+                "skill": skill,
+                "market_value": market_value,
+                "priority": "high" if market_value > 80 else "medium" if market_value > 60 else "low"
+            })
         
         gaps.sort(key=lambda x: x["market_value"], reverse=True)
         return gaps
@@ -1123,10 +1152,4 @@ class CareerIntelligenceService:
     
     def _calculate_skill_market_value(self, skill_name: str, category: str) -> int:
         """Calculate market value for a skill (0-100)"""
-        high_value_skills = {
-            "React": 95, "TypeScript": 92, "Python": 90, "AWS": 88, "Docker": 85,
-            "Kubernetes": 87, "Machine Learning": 94, "TensorFlow": 91, "Node.js": 86,
-            "Go": 84, "Rust": 83, "GraphQL": 82, "Next.js": 89, "Leadership": 85,
-            "System Design": 90, "Architecture": 92, "Product Strategy": 88
-        }
-        return high_value_skills.get(skill_name, 70)
\ No newline at end of file
+        return market_data.current().skill_figure("market_value", skill_name)
@@ -0,0 +1,191 @@
+"""Predictive analytics of many users at once.
+
+A ``CohortFrame`` lays a cohort's preloaded rows out as columns: one entry
+per skill row (owner, vocabulary column, advanced flag), per learning path
+and per match, plus a users x skill-names count matrix. The numeric parts
+of promotion probability, job security and pivot readiness (skill counts,
+market alignment, risk averages, role coverage, current role family) are
+then array operations over the whole cohort; only the per-user wording
+goes through the CareerIntelligenceService helpers, so every result equals
+what the single-user analyses return.
+
+Skills are compared as the single-user analyses do: by exact name, except
+for role requirements, which go through canonical skill ids.
+"""
+
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services.career_intelligence import (
+    ADVANCED_AUTOMATION_FACTOR,
+    ADVANCED_LEVELS,
+    AUTOMATION_RISK_FACTORS,
+    DEFAULT_AUTOMATION_RISK,
+    DEFAULT_OBSOLESCENCE_RISK,
+    IN_DEMAND_SKILLS,
+    MARKET_ALIGNMENT_SKILLS,
+    OBSOLESCENCE_RISK_FACTORS,
+    CareerIntelligenceService,
+)
+from app.services.role_requirements import role_requirements
+from app.services.skill_taxonomy import skill_taxonomy
+from app.services.user_context import UserContext
+
+CohortResult = Dict[str, Dict]
+
+
+def _owners(counts: Sequence[int]) -> np.ndarray:
+    """Row of each flattened item, given the number of items per row"""
+    return np.repeat(np.arange(len(counts)), counts)
+
+
+class CohortFrame:
+    """Columnar view of the rows of users that all have an assessment"""
+
+    def __init__(self, contexts: List[UserContext]):
+        self.contexts = contexts
+        self.size = size = len(contexts)
+
+        self.columns: Dict[str, int] = {}  # skill name -> vocabulary column
+        names = [skill.skill_name for context in contexts for skill in context.skills]
+        self.skill_user = _owners([len(context.skills) for context in contexts])
+        self.skill_column = np.fromiter(
+            (self.columns.setdefault(name, len(self.columns)) for name in names), dtype=np.int64, count=len(names)
+        )
+        self.skill_advanced = np.fromiter(
+            (skill.proficiency_level in ADVANCED_LEVELS for context in contexts for skill in context.skills),
+            dtype=bool,
+            count=len(names),
+        )
+        self.skill_count = np.bincount(self.skill_user, minlength=size)
+        # Users x skill names: how many of the user's skill rows carry the name
+        self.name_counts = np.zeros((size, len(self.columns)), dtype=np.int64)
+        np.add.at(self.name_counts, (self.skill_user, self.skill_column), 1)
+        self.held = self.name_counts > 0
+
+        completed = [path.status == "completed" for context in contexts for path in context.learning_paths]
+        self.completed_paths = np.bincount(
+            _owners([len(context.learning_paths) for context in contexts]),
+            weights=np.array(completed, dtype=np.float64),
+            minlength=size,
+        ).astype(np.int64)
+
+        match_user = _owners([len(context.match_scores) for context in contexts])
+        scores = np.array([score for context in contexts for score in context.match_scores], dtype=np.float64)
+        self.match_count = np.bincount(match_user, minlength=size)
+        self.match_total = np.bincount(match_user, weights=scores, minlength=size)
+
+    def holds_each(self, skill_names: Sequence[str]) -> np.ndarray:
+        """Users x given skills: whether the user has a skill of that exact name"""
+        result = np.zeros((self.size, len(skill_names)), dtype=bool)
+        for i, name in enumerate(skill_names):
+            column = self.columns.get(name)
+            if column is not None:
+                result[:, i] = self.held[:, column]
+        return result
+
+    def held_count(self, skill_names: Sequence[str]) -> np.ndarray:
+        return self.holds_each(skill_names).sum(axis=1)
+
+    def average_skill_risk(self, factors: Dict[str, float], default: float, advanced_factor: float, empty: float) -> np.ndarray:
+        """Per user: mean risk of their skill rows x 100, clipped to 0-100; ``empty`` without skills"""
+        column_risk = np.array([factors.get(name, default) for name in self.columns], dtype=np.float64)
+        row_risk = column_risk[self.skill_column] if len(self.skill_column) else np.zeros(0)
+        row_risk = np.where(self.skill_advanced, row_risk * advanced_factor, row_risk)
+        total = np.bincount(self.skill_user, weights=row_risk, minlength=self.size)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            average = np.clip(total / self.skill_count * 100, 0, 100)
+        return np.where(self.skill_count > 0, average, empty)
+
+    def role_skill_bits(self) -> np.ndarray:
+        """Users x role requirement bits: whether the user holds the skill (or an alias of it)"""
+        result = np.zeros((self.size, len(role_requirements.skill_names)), dtype=bool)
+        for name, column in self.columns.items():
+            bit = role_requirements.bit(name)
+            if bit is not None:
+                result[:, bit] |= self.held[:, column]
+        return result
+
+    def role_families(self) -> List[str]:
+        """Role family with the most skill rows per user (first family on ties), as _determine_current_category"""
+        roles = skill_taxonomy["role"]
+        category_ids = roles.category_ids
+        membership = np.zeros((len(self.columns), len(category_ids)), dtype=np.int64)
+        for name, column in self.columns.items():
+            for category_id in roles.memberships(name):
+                membership[column, category_ids.index(category_id)] = 1
+        counts = self.name_counts @ membership
+        if not category_ids:
+            return ["General"] * self.size
+        best = counts.argmax(axis=1)
+        has_family = counts[np.arange(self.size), best] > 0
+        return [
+            roles.category_name(category_ids[index]) if found else "General"
+            for index, found in zip(best.tolist(), has_family.tolist())
+        ]
+
+
+def analyze_cohort(
+    service: CareerIntelligenceService,
+    contexts: List[UserContext],
+    target_role: Optional[str] = None,
+    target_roles: Optional[List[str]] = None,
+) -> Iterator[Tuple[int, CohortResult]]:
+    """(user id, {"promotion", "security", "pivot"}) of each context, in order; all need an assessment"""
+    frame = CohortFrame(contexts)
+
+    # Promotion probability components
+    skill_score = np.minimum(30, np.bincount(frame.skill_user, weights=frame.skill_advanced, minlength=frame.size) * 3)
+    learning_score = np.minimum(20, frame.completed_paths * 5)
+    market_alignment = np.minimum(20, frame.held_count(MARKET_ALIGNMENT_SKILLS) * 4)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        performance_score = np.where(frame.match_count > 0, np.minimum(20, frame.match_total / frame.match_count / 5), 10)
+    role_adjustment = np.zeros(frame.size)
+    if target_role:
+        role_skills = service._get_skills_for_role(target_role)
+        if role_skills:
+            role_adjustment = frame.held_count(role_skills) / len(role_skills) * 10
+
+    # Job security measures
+    automation_risk = frame.average_skill_risk(
+        AUTOMATION_RISK_FACTORS, DEFAULT_AUTOMATION_RISK, ADVANCED_AUTOMATION_FACTOR, 50.0
+    )
+    market_demand = frame.held_count(IN_DEMAND_SKILLS) / len(IN_DEMAND_SKILLS) * 100
+    obsolescence_risk = frame.average_skill_risk(OBSOLESCENCE_RISK_FACTORS, DEFAULT_OBSOLESCENCE_RISK, 1.0, 30.0)
+
+    # Pivot readiness: role family, then coverage of every target role's skills
+    families = frame.role_families()
+    targets = [
+        list(target_roles) if target_roles else service._suggest_pivot_targets(family, context.skills)
+        for family, context in zip(families, contexts)
+    ]
+    skill_bits = frame.role_skill_bits()
+    coverage = {}
+    for role in dict.fromkeys(role for roles in targets for role in roles):
+        coverage[role] = (service._get_skills_for_role(role), skill_bits[:, role_requirements.bits(role)].tolist())
+
+    columns = zip(
+        skill_score.astype(np.int64).tolist(),
+        learning_score.tolist(),
+        market_alignment.tolist(),
+        performance_score.tolist(),
+        role_adjustment.tolist(),
+        automation_risk.tolist(),
+        market_demand.tolist(),
+        obsolescence_risk.tolist(),
+        frame.completed_paths.tolist(),
+    )
+    for i, (context, family, roles, row) in enumerate(zip(contexts, families, targets, columns)):
+        skills, learning, alignment, performance, adjustment, automation, demand, obsolescence, completed = row
+        experience = service._experience_level_to_score(service._promotion_experience_level(context.assessment))
+        analyses = [service._pivot_role_result(role, coverage[role][0], coverage[role][1][i], completed) for role in roles]
+        yield context.user_id, {
+            "promotion": service._promotion_result(
+                context, target_role, skills, experience, learning, alignment, performance, adjustment
+            ),
+            "security": service._security_result(
+                automation, demand, obsolescence, service._calculate_industry_stability(context.assessment)
+            ),
+            "pivot": service._pivot_result(context, family, roles, analyses),
+        }
@@ -0,0 +1,174 @@
+"""Per-user dashboard result cache.
+
+Dashboard sections are expensive to compute and their inputs only change
+when a user saves skills, completes an assessment, records learning
+progress or has their job matches re-scored. Those writes call ``invalidate``, which bumps the user's
+``Assessment.dashboard_version`` in the same transaction; cached results
+are keyed by (user id, version, sections), so an entry computed before a
+write can never be served after it, whichever worker computed it. The
+market data version is part of the key too, so a market data reload
+retires every entry at once.
+
+Entries live in an in-process LRU with a TTL. Setting
+``DASHBOARD_CACHE_PATH`` adds a shared SQLite-file tier so workers of one
+deployment reuse each other's results; it is consulted on local misses.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from app.models.assessment import Assessment
+
+DEFAULT_TTL_SECONDS = float(os.getenv("DASHBOARD_CACHE_TTL", "300"))
+DEFAULT_MAX_ENTRIES = int(os.getenv("DASHBOARD_CACHE_SIZE", "1024"))
+SHARED_CACHE_PATH = os.getenv("DASHBOARD_CACHE_PATH") or None
+
+# Users whose shared entries are deleted per statement
+EVICT_BATCH = 500
+
+CacheKey = Tuple[int, int, Tuple[str, ...], str]
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+class DashboardCache:
+    """LRU + TTL cache of built dashboard sections, with an optional shared SQLite tier"""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        shared_path: Optional[str] = SHARED_CACHE_PATH,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.shared_path = shared_path
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._shared_ready = False
+
+    @staticmethod
+    def key(user_id: int, version: Optional[int], sections: Iterable[str], market_version: str = "") -> CacheKey:
+        return user_id, version or 0, tuple(sections), market_version
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    return entry[1]
+                del self._entries[key]
+
+        value = self._shared_get(key, now)
+        if value is not None:
+            self._store_local(key, value, now + self.ttl_seconds)
+        return value
+
+    def set(self, key: CacheKey, value: Dict[str, Any]) -> None:
+        expires_at = time.time() + self.ttl_seconds
+        self._store_local(key, value, expires_at)
+        self._shared_set(key, value, expires_at)
+
+    def invalidate(self, db: Session, user_id: int) -> None:
+        """Make the user's cached dashboards unreachable; commits with the caller's transaction"""
+        self.invalidate_many(db, [user_id])
+
+    def invalidate_many(self, db: Session, user_ids: Iterable[int]) -> None:
+        """invalidate() for several users in one statement, e.g. after re-scoring their matches"""
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+        db.execute(
+            update(Assessment)
+            .where(Assessment.user_id.in_(user_ids))
+            .values(dashboard_version=func.coalesce(Assessment.dashboard_version, 0) + 1)
+            .execution_options(synchronize_session=False)
+        )
+        self._evict(user_ids)
+
+    def evict(self, user_id: int) -> None:
+        """Drop the user's entries from both tiers to free their space early"""
+        self._evict([user_id])
+
+    def _evict(self, user_ids: List[int]) -> None:
+        users = set(user_ids)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] in users]:
+                del self._entries[key]
+        for start in range(0, len(user_ids), EVICT_BATCH):
+            chunk = tuple(user_ids[start:start + EVICT_BATCH])
+            self._shared_execute(f"DELETE FROM dashboard_cache WHERE user_id IN ({', '.join('?' * len(chunk))})", chunk)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        self._shared_execute("DELETE FROM dashboard_cache")
+
+    def _store_local(self, key: CacheKey, value: Dict[str, Any], expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    # Shared tier: one small table in a SQLite file; any error there is a cache miss
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.shared_path, timeout=5)
+        if not self._shared_ready:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS dashboard_cache ("
+                "cache_key TEXT PRIMARY KEY, user_id INTEGER NOT NULL, expires_at REAL NOT NULL, payload TEXT NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS ix_dashboard_cache_user ON dashboard_cache (user_id)")
+            connection.commit()
+            self._shared_ready = True
+        return connection
+
+    def _shared_execute(self, sql: str, params: tuple = ()) -> list:
+        if not self.shared_path:
+            return []
+        try:
+            connection = self._connect()
+            try:
+                with connection:
+                    return connection.execute(sql, params).fetchall()
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            print(f"Warning: Dashboard cache store unavailable: {e}")
+            return []
+
+    def _shared_get(self, key: CacheKey, now: float) -> Optional[Dict[str, Any]]:
+        rows = self._shared_execute(
+            "SELECT payload FROM dashboard_cache WHERE cache_key = ? AND expires_at > ?", (json.dumps(key), now)
+        )
+        return json.loads(rows[0][0]) if rows else None
+
+    def _shared_set(self, key: CacheKey, value: Dict[str, Any], expires_at: float) -> None:
+        if not self.shared_path:
+            return
+        self._shared_execute(
+            "INSERT OR REPLACE INTO dashboard_cache (cache_key, user_id, expires_at, payload) VALUES (?, ?, ?, ?)",
+            (json.dumps(key), key[0], expires_at, json.dumps(value, default=_json_default)),
+        )
+        self._shared_execute("DELETE FROM dashboard_cache WHERE expires_at <= ?", (time.time(),))
+
+
+dashboard_cache = DashboardCache()
@@ -1,24 +1,69 @@
 """Hidden Gem Job Matcher - Finds unique job opportunities others might miss"""
 
-from typing import Dict, Any, List
-from datetime import datetime, timedelta
+import heapq
+import json
+import re
+from datetime import datetime, date
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.skill_canonicalizer import skill_canonicalizer
+
+# Signal weights, thresholds, rare skill combinations and personality cultures
+DEFAULT_CONFIG_PATH = Path(__file__).resolve().parent.parent / "data" / "hidden_gem_signals.json"
+
+
+@lru_cache(maxsize=4096)
+def _posted_ordinal(posted_date: str) -> Optional[int]:
+    """Day ordinal of a "2024-01-15" style date, or None if it does not parse"""
+    try:
+        return datetime.strptime(posted_date, "%Y-%m-%d").toordinal()
+    except (TypeError, ValueError):
+        return None
 
 
 class HiddenGemMatcher:
-    """Finds hidden gem jobs that are perfect matches but might be overlooked"""
-    
-    def __init__(self):
-        self.hidden_gem_signals = {
-            "low_competition": 0.3,  # Fewer applicants
-            "unique_requirements": 0.4,  # Specific skill combinations
-            "growth_opportunity": 0.5,  # High growth potential
-            "culture_match": 0.6,  # Perfect culture fit
-            "skill_alignment": 0.7,  # Strong skill match
-            "personality_fit": 0.8,  # Personality alignment
-            "underrated_company": 0.9,  # Great company, less known
-            "perfect_timing": 1.0  # Right time, right place
+    """Finds hidden gem jobs that are perfect matches but might be overlooked.
+
+    The signal config is compiled once: rare skill combinations become a
+    skill x combination membership matrix and personality cultures become one
+    regex per personality type. ``score_jobs`` then evaluates every signal
+    for all of a user's jobs at once, recording the signals that fired as a
+    bitmask per job in config order.
+    """
+
+    def __init__(self, config_path: Path = DEFAULT_CONFIG_PATH):
+        with open(config_path) as f:
+            config = json.load(f)
+
+        self.signals: List[Dict[str, Any]] = config["signals"]
+        for signal in self.signals:
+            if not hasattr(self, f"_signal_{signal['key']}"):
+                raise ValueError(f"Unknown hidden gem signal: {signal['key']}")
+        self.hidden_gem_signals = {signal["key"]: signal["weight"] for signal in self.signals}
+        self.min_gem_score = config["min_gem_score"]
+        self.high_urgency_score = config["high_urgency_score"]
+        self.top_k = config["top_k"]
+
+        # Rare skill combinations, compiled to canonical skill ids
+        self.rare_combinations = [skill_canonicalizer.id_set(combo) for combo in config["rare_combinations"]]
+        self.min_combination_overlap = config["min_combination_overlap"]
+        vocabulary = sorted(set().union(*self.rare_combinations))
+        self._combination_column = {skill_id: column for column, skill_id in enumerate(vocabulary)}
+        self._combination_matrix = np.zeros((len(vocabulary), len(self.rare_combinations)), dtype=np.int32)
+        for combination, combo in enumerate(self.rare_combinations):
+            for skill_id in combo:
+                self._combination_matrix[self._combination_column[skill_id], combination] = 1
+
+        self._culture_patterns = {
+            personality_type: re.compile("|".join(re.escape(culture) for culture in cultures))
+            for personality_type, cultures in config["personality_cultures"].items()
+            if cultures
         }
-    
+
     def find_hidden_gems(
         self,
         user_skills: Dict[str, str],
@@ -26,126 +71,104 @@ class HiddenGemMatcher:
         job_matches: List[Dict[str, Any]],
         user_preferences: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
-        """Find hidden gem jobs from existing matches"""
+        """Find the top hidden gem jobs from existing matches, best first"""
+        scores, masks = self.score_jobs(user_skills, personality_profile, job_matches)
+
+        # Equal scores keep their match order, like a stable sort would
+        gems = np.flatnonzero(scores >= self.min_gem_score).tolist()
+        top = heapq.nlargest(self.top_k, gems, key=lambda i: scores[i])
+
         hidden_gems = []
-        
-        for job in job_matches:
-            gem_score = 0
-            gem_reasons = []
-            
-            # Check for unique skill combinations
-            if self._has_unique_skill_combination(job, user_skills):
-                gem_score += self.hidden_gem_signals["unique_requirements"]
-                gem_reasons.append("Unique skill combination that matches your profile")
-            
-            # Check for low competition
-            if job.get("competition_level") == "low" and job.get("match_score", 0) >= 75:
-                gem_score += self.hidden_gem_signals["low_competition"]
-                gem_reasons.append("Low competition with high match score")
-            
-            # Check for growth opportunity
-            growth_potential = job.get("growth_potential", {})
-            if growth_potential.get("score", 0) >= 80:
-                gem_score += self.hidden_gem_signals["growth_opportunity"]
-                gem_reasons.append("High growth trajectory - rocketship opportunity")
-            
-            # Check for personality fit
-            if personality_profile:
-                personality_type = personality_profile.get("personality", {}).get("type", "")
-                culture_fit = job.get("culture_fit", {})
-                
-                if self._personality_culture_match(personality_type, culture_fit):
-                    gem_score += self.hidden_gem_signals["personality_fit"]
-                    gem_reasons.append("Perfect personality-culture alignment")
-            
-            # Check for underrated company
-            company_stage = job.get("company_stage", "")
-            if company_stage in ["Series A", "Series B"] and job.get("match_score", 0) >= 80:
-                gem_score += self.hidden_gem_signals["underrated_company"]
-                gem_reasons.append("High-growth company with less competition")
-            
-            # Check for perfect timing
-            posted_date = job.get("posted_date", "")
-            if self._is_recently_posted(posted_date) and job.get("match_score", 0) >= 85:
-                gem_score += self.hidden_gem_signals["perfect_timing"]
-                gem_reasons.append("Recently posted - get in early")
-            
-            # If gem score is high enough, mark as hidden gem
-            if gem_score >= 0.5:
-                hidden_gems.append({
-                    **job,
-                    "hidden_gem_score": gem_score,
-                    "hidden_gem_reasons": gem_reasons,
-                    "is_hidden_gem": True,
-                    "urgency": "high" if gem_score >= 0.8 else "medium"
-                })
-        
-        # Sort by hidden gem score
-        hidden_gems.sort(key=lambda x: x["hidden_gem_score"], reverse=True)
-        
-        return hidden_gems[:5]  # Top 5 hidden gems
-    
-    def _has_unique_skill_combination(self, job: Dict[str, Any], user_skills: Dict[str, str]) -> bool:
-        """Check if job requires unique skill combination that user has"""
-        required_skills = job.get("required_skills", [])
-        preferred_skills = job.get("preferred_skills", [])
-        
-        user_skill_names = set(user_skills.keys())
-        job_skills = set(required_skills + preferred_skills)
-        
-        # Check if user has rare skill combinations
-        rare_combinations = [
-            {"React", "Go", "Docker"},  # Frontend + Backend + DevOps
-            {"Python", "Machine Learning", "AWS"},  # Data Science + Cloud
-            {"TypeScript", "GraphQL", "Kubernetes"},  # Modern stack
-            {"React", "Node.js", "PostgreSQL", "AWS"}  # Full stack + Cloud
-        ]
-        
-        for combo in rare_combinations:
-            if combo.issubset(user_skill_names) and len(combo.intersection(job_skills)) >= 2:
-                return True
-        
-        return False
-    
-    def _personality_culture_match(self, personality_type: str, culture_fit: Dict[str, Any]) -> bool:
-        """Check if personality matches company culture"""
-        if not personality_type or not culture_fit:
-            return False
-        
-        culture_score = culture_fit.get("score", 0)
-        culture_summary = culture_fit.get("summary", "").lower()
-        
-        # Match personality types to culture preferences
-        personality_culture_map = {
-            "Creative Innovator": ["innovative", "creative", "fast-paced"],
-            "Analytical Problem Solver": ["methodical", "structured", "data-driven"],
-            "Natural Leader": ["leadership", "collaborative", "growth-focused"],
-            "Independent Adaptor": ["remote-first", "autonomous", "flexible"],
-            "Collaborative Communicator": ["collaborative", "team-oriented", "communication"]
-        }
-        
-        preferred_cultures = personality_culture_map.get(personality_type, [])
-        
-        # Check if culture fit is high and aligns with personality
-        if culture_score >= 75:
-            for culture in preferred_cultures:
-                if culture in culture_summary:
-                    return True
-        
-        return False
-    
-    def _is_recently_posted(self, posted_date: str) -> bool:
-        """Check if job was posted recently (within 7 days)"""
-        try:
-            if not posted_date:
-                return False
-            
-            # Parse date (format: "2024-01-15")
-            posted = datetime.strptime(posted_date, "%Y-%m-%d")
-            days_ago = (datetime.now() - posted).days
-            
-            return days_ago <= 7
-        except:
-            return False
+        for i in top:
+            gem_score = float(scores[i])
+            hidden_gems.append({
+                **job_matches[i],
+                "hidden_gem_score": gem_score,
+                "hidden_gem_reasons": [
+                    signal["reason"] for bit, signal in enumerate(self.signals) if masks[i] >> bit & 1
+                ],
+                "is_hidden_gem": True,
+                "urgency": "high" if gem_score >= self.high_urgency_score else "medium"
+            })
+        return hidden_gems
+
+    def score_jobs(
+        self,
+        user_skills: Dict[str, str],
+        personality_profile: Dict[str, Any],
+        jobs: List[Dict[str, Any]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Hidden gem score of every job plus a bitmask of the signals that fired"""
+        match_score = np.fromiter((job.get("match_score", 0) for job in jobs), dtype=np.float64, count=len(jobs))
+        scores = np.zeros(len(jobs), dtype=np.float64)
+        masks = np.zeros(len(jobs), dtype=np.uint32)
+
+        for bit, signal in enumerate(self.signals):
+            evaluate = getattr(self, f"_signal_{signal['key']}")
+            fired = evaluate(signal, jobs, match_score, user_skills, personality_profile)
+            # Adding weights in signal order keeps scores identical to a running sum
+            scores = scores + np.where(fired, signal["weight"], 0.0)
+            masks |= fired.astype(np.uint32) << bit
+
+        return scores, masks
+
+    def _signal_unique_requirements(self, signal, jobs, match_score, user_skills, personality_profile) -> np.ndarray:
+        """Job asks for enough of a rare skill combination the user fully has"""
+        user_skill_ids = skill_canonicalizer.id_set(user_skills)
+        held = [combination for combination, combo in enumerate(self.rare_combinations) if combo <= user_skill_ids]
+        if not held or not jobs:
+            return np.zeros(len(jobs), dtype=bool)
+
+        present = np.zeros((len(jobs), len(self._combination_column)), dtype=np.int32)
+        for row, job in enumerate(jobs):
+            job_skills = job.get("required_skills", []) + job.get("preferred_skills", [])
+            for skill_id in skill_canonicalizer.id_set(job_skills):
+                column = self._combination_column.get(skill_id)
+                if column is not None:
+                    present[row, column] = 1
+
+        overlap = present @ self._combination_matrix[:, held]
+        return (overlap >= self.min_combination_overlap).any(axis=1)
+
+    def _signal_low_competition(self, signal, jobs, match_score, user_skills, personality_profile) -> np.ndarray:
+        low = np.fromiter((job.get("competition_level") == "low" for job in jobs), dtype=bool, count=len(jobs))
+        return low & (match_score >= signal["min_match_score"])
+
+    def _signal_growth_opportunity(self, signal, jobs, match_score, user_skills, personality_profile) -> np.ndarray:
+        growth = np.fromiter(
+            (job.get("growth_potential", {}).get("score", 0) for job in jobs), dtype=np.float64, count=len(jobs)
+        )
+        return growth >= signal["min_growth_score"]
+
+    def _signal_personality_fit(self, signal, jobs, match_score, user_skills, personality_profile) -> np.ndarray:
+        """Culture fit is high and its summary mentions a culture the personality prefers"""
+        fired = np.zeros(len(jobs), dtype=bool)
+        if not personality_profile:
+            return fired
+        pattern = self._culture_patterns.get(personality_profile.get("personality", {}).get("type", ""))
+        if pattern is None:
+            return fired
+
+        for row, job in enumerate(jobs):
+            culture_fit = job.get("culture_fit", {})
+            fired[row] = bool(
+                culture_fit
+                and culture_fit.get("score", 0) >= signal["min_culture_score"]
+                and pattern.search(culture_fit.get("summary", "").lower())
+            )
+        return fired
 
+    def _signal_underrated_company(self, signal, jobs, match_score, user_skills, personality_profile) -> np.ndarray:
+        stages = set(signal["company_stages"])
+        staged = np.fromiter((job.get("company_stage", "") in stages for job in jobs), dtype=bool, count=len(jobs))
+        return staged & (match_score >= signal["min_match_score"])
 
+    def _signal_perfect_timing(self, signal, jobs, match_score, user_skills, personality_profile) -> np.ndarray:
+        """Posted within the last few days; date strings are parsed once per process"""
+        posted = np.fromiter(
+            (_posted_ordinal(job.get("posted_date", "")) or -1 for job in jobs), dtype=np.int64, count=len(jobs)
+        )
+        # Whole days since a midnight posting date are exactly today's ordinal minus its ordinal
+        days_ago = date.today().toordinal() - posted
+        recent = (posted >= 0) & (days_ago <= signal["max_days_since_posted"])
+        return recent & (match_score >= signal["min_match_score"])
@@ -0,0 +1,91 @@
+"""Per-job derived features, computed when a job is written and stored on the row"""
+
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+
+from app.models.job import Job
+from app.services.market_data import market_data
+from app.services.match_analysis import analyze_company_culture, calculate_market_intelligence, evaluate_growth_potential
+from app.services.salary_parser import apply_parsed_salary
+
+# Bump when derive_job_features changes so stored features are recomputed
+FEATURES_VERSION = 2
+
+
+def derive_job_features(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Features that depend only on the job and never on the user"""
+    market_intel = calculate_market_intelligence(job, 0)
+    return {
+        "culture_analysis": analyze_company_culture(job["description"]),
+        "growth_potential": evaluate_growth_potential(job),
+        "salary_position": market_intel["salary_comparison"]["position"],
+    }
+
+
+def feature_fingerprint(job: Dict[str, Any]) -> str:
+    """Hash of every job field the derived features read.
+
+    Description drives the culture analysis, salary and experience level
+    (with the market average salary of that level) the salary position,
+    growth signals and team size the growth potential.
+    """
+    inputs = [
+        FEATURES_VERSION,
+        job.get("description") or "",
+        job.get("salary") or "",
+        job.get("experience_level") or "",
+        market_data.current().job_average_salary(job.get("experience_level")),
+        job.get("growth_signals") or {},
+        job.get("team_size", 50),
+    ]
+    payload = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def stored_features(job: Job) -> Optional[Dict[str, Any]]:
+    """Features persisted on a Job row, or None when they are missing or out of date"""
+    if not job.features_fingerprint:
+        return None
+    fingerprint_inputs = {
+        "description": job.description,
+        "salary": job.salary,
+        "experience_level": job.experience_level,
+        "growth_signals": dict(job.growth_signals or {}),
+        "team_size": job.team_size if job.team_size is not None else 50,
+    }
+    if job.features_fingerprint != feature_fingerprint(fingerprint_inputs):
+        return None
+    return {
+        "culture_analysis": dict(job.culture_analysis or {}),
+        "growth_potential": job.growth_potential or {},
+        "salary_position": job.salary_position or "average",
+    }
+
+
+def refresh_job_features(job: Job) -> bool:
+    """Recompute the stored features if their inputs changed; returns True if they did"""
+    # Imported here because job_index imports this module for the listeners below
+    from app.services.job_index import job_to_dict
+
+    job_dict = job_to_dict(job)
+    fingerprint = feature_fingerprint(job_dict)
+    if fingerprint == job.features_fingerprint:
+        return False
+
+    features = derive_job_features(job_dict)
+    job.culture_analysis = features["culture_analysis"]
+    job.growth_potential = features["growth_potential"]
+    job.salary_position = features["salary_position"]
+    job.features_fingerprint = fingerprint
+    return True
+
+
+@event.listens_for(Job, "before_insert")
+@event.listens_for(Job, "before_update")
+def _refresh_features_on_write(mapper, connection, target: Job) -> None:
+    # The salary position feature reads the parsed salary columns
+    apply_parsed_salary(target)
+    refresh_job_features(target)
@@ -0,0 +1,354 @@
+"""Streaming bulk importer for JSONL / CSV job feeds.
+
+Feeds are read one record at a time and written in batches through an
+executemany INSERT ... ON CONFLICT (source, source_url) DO UPDATE, so memory
+stays flat regardless of feed size. Every row written by a run is stamped
+with the run id; a full feed then deactivates the postings of its sources
+that the run did not touch.
+
+A malformed record (unparseable line, date, team size or growth signals) is
+counted as an error and the import carries on. Postings whose record failed
+are left as they are, so a full feed does not deactivate them either.
+
+Usage:
+    python -m app.services.job_importer feed.jsonl [--full] [--batch-size 5000]
+"""
+
+import argparse
+import csv
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import func, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.job import Job
+from app.services.job_features import derive_job_features, feature_fingerprint
+from app.services.salary_parser import parse_salary
+from app.services.skill_canonicalizer import skill_canonicalizer
+
+LIST_FIELDS = ["required_skills", "preferred_skills", "benefits", "culture_values"]
+TEXT_FIELDS = [
+    "title", "company", "headline", "description", "requirements", "location", "salary",
+    "job_type", "remote_status", "experience_level", "source", "source_url", "company_stage",
+]
+DATE_FIELDS = ["posted_at", "expires_at"]
+
+MAX_ERROR_SAMPLES = 20
+
+# Jobs whose materialized matches are re-scored together after an import
+MATCH_REFRESH_BATCH = 500
+
+# Columns an upsert overwrites on conflict; created_at and the key columns are left alone
+_UPDATE_COLUMNS = (
+    [f for f in TEXT_FIELDS if f not in ("source", "source_url")]
+    + LIST_FIELDS + DATE_FIELDS
+    + ["team_size", "growth_signals", "is_active", "import_run_id",
+       "salary_min", "salary_max", "salary_currency", "salary_period",
+       "culture_analysis", "growth_potential", "salary_position", "features_fingerprint"]
+)
+
+
+@dataclass
+class ImportStats:
+    run_id: str
+    rows: int = 0
+    written: int = 0
+    skipped: int = 0
+    errors: int = 0
+    deactivated: int = 0
+    seconds: float = 0.0
+    error_samples: List[str] = field(default_factory=list)  # first MAX_ERROR_SAMPLES error messages
+
+    def record_error(self, message: str) -> None:
+        self.errors += 1
+        if len(self.error_samples) < MAX_ERROR_SAMPLES:
+            self.error_samples.append(f"record {self.rows}: {message}")
+
+    @property
+    def rows_per_second(self) -> float:
+        return round(self.rows / self.seconds, 1) if self.seconds else float(self.rows)
+
+
+class MalformedRecord(ValueError):
+    """A feed record that cannot be read or mapped onto jobs columns"""
+
+
+def iter_feed(path: str, fmt: Optional[str] = None) -> Iterator[Any]:
+    """Yield raw records from a JSONL or CSV feed without loading it into memory.
+
+    A JSONL line that is not valid JSON is yielded as a MalformedRecord so
+    the importer can count it and read on.
+    """
+    fmt = fmt or ("csv" if path.lower().endswith(".csv") else "jsonl")
+    with open(path, newline="", encoding="utf-8") as handle:
+        if fmt == "csv":
+            yield from csv.DictReader(handle)
+        else:
+            for line in handle:
+                line = line.strip()
+                if line:
+                    try:
+                        yield json.loads(line)
+                    except ValueError as e:
+                        yield MalformedRecord(f"invalid JSON: {e}")
+
+
+def _parse_list(value: Any) -> List[str]:
+    if value is None or value == "":
+        return []
+    if isinstance(value, list):
+        return [str(item).strip() for item in value if str(item).strip()]
+    text = str(value).strip()
+    if text.startswith("["):
+        return _parse_list(json.loads(text))
+    separator = "|" if "|" in text else ";" if ";" in text else ","
+    return [item.strip() for item in text.split(separator) if item.strip()]
+
+
+def _parse_date(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+
+
+def _record_key(record: Any, default_source: Optional[str]) -> Optional[Tuple[str, str]]:
+    """(source, source_url) of a raw record, if it names both"""
+    if not isinstance(record, dict):
+        return None
+    source = str(record.get("source") or default_source or "").strip()
+    source_url = str(record.get("source_url") or "").strip()
+    return (source, source_url) if source and source_url else None
+
+
+def normalize_record(record: Dict[str, Any], default_source: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Map a feed record onto jobs columns, or None if it cannot be keyed.
+
+    Raises MalformedRecord for a record with a value that cannot be parsed.
+    """
+    if isinstance(record, MalformedRecord):
+        raise record
+    if not isinstance(record, dict):
+        raise MalformedRecord(f"expected an object, got {type(record).__name__}")
+    try:
+        return _normalize_record(record, default_source)
+    except (ValueError, TypeError) as e:
+        raise MalformedRecord(str(e)) from e
+
+
+def _normalize_record(record: Dict[str, Any], default_source: Optional[str]) -> Optional[Dict[str, Any]]:
+    row: Dict[str, Any] = {}
+    for name in TEXT_FIELDS:
+        value = record.get(name)
+        row[name] = str(value).strip() if value not in (None, "") else None
+    row["source"] = row["source"] or default_source
+
+    if not (row["title"] and row["company"] and row["source"] and row["source_url"]):
+        return None
+
+    for name in LIST_FIELDS:
+        row[name] = _parse_list(record.get(name))
+    # Core inserts bypass the mapper listeners, so canonicalize skills here too
+    for name in ("required_skills", "preferred_skills"):
+        row[name] = skill_canonicalizer.canonical_list(row[name])
+    for name in DATE_FIELDS:
+        row[name] = _parse_date(record.get(name))
+
+    signals = record.get("growth_signals") or {}
+    row["growth_signals"] = json.loads(signals) if isinstance(signals, str) else dict(signals)
+    team_size = record.get("team_size")
+    row["team_size"] = int(team_size) if team_size not in (None, "") else None
+    row["is_active"] = True
+
+    # Likewise parse the salary and derive the stored features
+    salary = parse_salary(row["salary"] or "")
+    row["salary_min"], row["salary_max"] = salary.min, salary.max
+    row["salary_currency"], row["salary_period"] = salary.currency, salary.period
+    job_view = {
+        "description": row["description"] or "",
+        "salary": row["salary"] or "",
+        "salary_max": row["salary_max"],
+        "experience_level": row["experience_level"] or "",
+        "growth_signals": row["growth_signals"],
+        "team_size": row["team_size"] if row["team_size"] is not None else 50,
+    }
+    features = derive_job_features(job_view)
+    row["culture_analysis"] = features["culture_analysis"]
+    row["growth_potential"] = features["growth_potential"]
+    row["salary_position"] = features["salary_position"]
+    row["features_fingerprint"] = feature_fingerprint(job_view)
+    return row
+
+
+def _upsert_statement(db: Session):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        insert = postgresql.insert
+    elif dialect == "sqlite":
+        insert = sqlite.insert
+    else:
+        raise ValueError(f"Bulk job import is not supported on {dialect}")
+
+    statement = insert(Job.__table__)
+    return statement.on_conflict_do_update(
+        index_elements=["source", "source_url"],
+        set_={
+            **{name: statement.excluded[name] for name in _UPDATE_COLUMNS},
+            "updated_at": func.now(),
+        },
+    )
+
+
+def _write_batch(db: Session, batch: Dict[Tuple[str, str], Dict[str, Any]]) -> List[int]:
+    """Upsert one batch; returns the ids of the jobs written"""
+    job_ids = db.execute(_upsert_statement(db).returning(Job.__table__.c.id), list(batch.values())).scalars().all()
+    db.commit()
+    return job_ids
+
+
+def import_jobs(
+    db: Session,
+    records: Iterable[Any],
+    full_feed: bool = False,
+    batch_size: int = 1000,
+    default_source: Optional[str] = None,
+    progress: Optional[Callable[[ImportStats], None]] = None,
+) -> ImportStats:
+    """Upsert feed records into the jobs table in batches.
+
+    Records sharing a (source, source_url) key within a batch are deduplicated,
+    last one wins. With ``full_feed`` the feed is treated as the complete
+    catalog of its sources: active jobs from those sources that this run did
+    not write are deactivated. Malformed records are counted in
+    ``stats.errors`` and skipped; their postings are never deactivated.
+    """
+    stats = ImportStats(run_id=uuid.uuid4().hex)
+    started = time.perf_counter()
+    sources: Set[str] = set()
+    batch: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    failed_keys: Set[Tuple[str, str]] = set()  # keys of malformed records
+    changed_ids: List[int] = []  # jobs inserted, updated or deactivated by this run
+
+    for record in records:
+        stats.rows += 1
+        try:
+            row = normalize_record(record, default_source)
+        except MalformedRecord as e:
+            stats.record_error(str(e))
+            key = _record_key(record, default_source)
+            if key:
+                failed_keys.add(key)
+            continue
+        if row is None:
+            stats.skipped += 1
+            continue
+        row["import_run_id"] = stats.run_id
+        sources.add(row["source"])
+        batch[(row["source"], row["source_url"])] = row
+        if len(batch) >= batch_size:
+            written = _write_batch(db, batch)
+            stats.written += len(written)
+            changed_ids.extend(written)
+            batch = {}
+            stats.seconds = time.perf_counter() - started
+            if progress:
+                progress(stats)
+
+    if batch:
+        written = _write_batch(db, batch)
+        stats.written += len(written)
+        changed_ids.extend(written)
+
+    if full_feed and sources:
+        # Postings whose record failed are still in the feed: keep them active
+        failed_urls: Dict[str, List[str]] = {}
+        for source, source_url in failed_keys:
+            failed_urls.setdefault(source, []).append(source_url)
+        for source, source_urls in failed_urls.items():
+            for start in range(0, len(source_urls), 500):
+                db.execute(
+                    update(Job.__table__)
+                    .where(Job.source == source)
+                    .where(Job.source_url.in_(source_urls[start:start + 500]))
+                    .values(import_run_id=stats.run_id)
+                )
+        deactivated = db.execute(
+            update(Job.__table__)
+            .where(Job.source.in_(sources))
+            .where(Job.is_active.isnot(False))
+            .where((Job.import_run_id.is_(None)) | (Job.import_run_id != stats.run_id))
+            .values(is_active=False, updated_at=func.now())
+            .returning(Job.__table__.c.id)
+        ).scalars().all()
+        stats.deactivated = len(deactivated)
+        changed_ids.extend(deactivated)
+        db.commit()
+
+    stats.seconds = time.perf_counter() - started
+    _refresh_job_index(db, changed_ids)
+    return stats
+
+
+def _refresh_job_index(db: Session, job_ids: List[int]) -> None:
+    """Core writes skip the session hooks: reload the indexes and re-score the written jobs' matches"""
+    from app.services.job_index import job_index
+    from app.services.match_materializer import match_materializer
+    from app.services.similar_jobs import similar_jobs_index
+
+    if job_index.loaded:
+        job_index.rebuild(db)
+    if similar_jobs_index.loaded:
+        similar_jobs_index.catch_up(db)
+    job_ids = list(dict.fromkeys(job_ids))  # a posting can be written by several batches
+    for start in range(0, len(job_ids), MATCH_REFRESH_BATCH):
+        match_materializer.refresh_jobs(db, job_ids[start:start + MATCH_REFRESH_BATCH])
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Import a JSONL or CSV job feed into the jobs table")
+    parser.add_argument("path", help="Feed file (.jsonl or .csv)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Override format detection")
+    parser.add_argument("--full", action="store_true", help="Deactivate jobs of the feed's sources missing from it")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--source", help="Source for records that do not name one")
+    args = parser.parse_args(argv)
+
+    from app.core.database import Base, SessionLocal, engine
+    from app.models import user, assessment, job, community  # noqa: F401 - register models
+
+    Base.metadata.create_all(bind=engine)
+
+    def report(stats: ImportStats) -> None:
+        print(f"{stats.rows} rows read, {stats.written} written ({stats.rows_per_second} rows/s)")
+
+    db = SessionLocal()
+    try:
+        stats = import_jobs(
+            db,
+            iter_feed(args.path, args.format),
+            full_feed=args.full,
+            batch_size=args.batch_size,
+            default_source=args.source,
+            progress=report,
+        )
+    finally:
+        db.close()
+
+    print(
+        f"Import {stats.run_id}: {stats.rows} rows, {stats.written} written, {stats.skipped} skipped, "
+        f"{stats.errors} errors, {stats.deactivated} deactivated in {stats.seconds:.1f}s "
+        f"({stats.rows_per_second} rows/s)"
+    )
+    for message in stats.error_samples:
+        print(f"Warning: Skipped malformed {message}")
+
+
+if __name__ == "__main__":
+    main()
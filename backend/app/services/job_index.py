@@ -0,0 +1,380 @@
+"""In-memory job catalog with an inverted skill index used by job matching"""
+
+import logging
+import threading
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.job import Job
+from app.services.job_features import derive_job_features, stored_features
+from app.services.semantic_matcher import SEMANTIC_DIMENSIONS, HashedTfidfVectorizer, analyze, job_text
+from app.services.similar_jobs import similar_jobs_index
+from app.services.skill_canonicalizer import skill_canonicalizer
+
+logger = logging.getLogger(__name__)
+
+# Title keywords behind the career-interest bonus, one bit each
+INTEREST_TITLE_KEYWORDS = ["Frontend", "Backend", "Full Stack"]
+
+_INITIAL_CAPACITY = 64
+
+
+def job_to_dict(job: Job) -> Dict[str, Any]:
+    """Convert a Job row into the dict shape used by the matching code"""
+    return {
+        "id": job.id,
+        "title": job.title,
+        "company": job.company,
+        "headline": job.headline,
+        "description": job.description or "",
+        "requirements": job.requirements or "",
+        "location": job.location or "",
+        "salary": job.salary or "",
+        "salary_min": job.salary_min,
+        "salary_max": job.salary_max,
+        "salary_currency": job.salary_currency,
+        "salary_period": job.salary_period,
+        "job_type": job.job_type or "",
+        "remote_status": job.remote_status or "",
+        "experience_level": job.experience_level or "",
+        "required_skills": list(job.required_skills or []),
+        "preferred_skills": list(job.preferred_skills or []),
+        "benefits": list(job.benefits or []),
+        "posted_at": job.posted_at.strftime("%Y-%m-%d") if job.posted_at else "",
+        "source": job.source or "",
+        "source_url": job.source_url,
+        "company_stage": job.company_stage or "",
+        "team_size": job.team_size if job.team_size is not None else 50,
+        "culture_values": list(job.culture_values or []),
+        "growth_signals": dict(job.growth_signals or {}),
+        "is_active": job.is_active is not False,
+    }
+
+
+class JobIndex:
+    """Active jobs keyed by id plus skill id -> posting list of job ids.
+
+    Every job also owns a slot in a set of NumPy columns (skill counts,
+    experience level, precomputed job features, a hashed TF-IDF vector of
+    its text) so the match scorer can evaluate all candidates of a user in
+    one vectorized pass.
+
+    The index is loaded from the ``jobs`` table on first use and then kept
+    current by session hooks that replay committed Job inserts, updates and
+    deletes, so match requests never scan the table.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._jobs: Dict[int, Dict[str, Any]] = {}
+        self._features: Dict[int, Dict[str, Any]] = {}
+        self._slot_of: Dict[int, int] = {}
+        self._free_slots: List[int] = []
+        self._size = 0
+        self._remote_codes: Dict[str, int] = {}
+        self._experience_codes: Dict[str, int] = {}
+        # skill id -> {slot: multiplicity}; multiplicity keeps duplicate skills counted like the scalar scorer
+        self._required: Dict[int, Dict[int, int]] = defaultdict(dict)
+        self._preferred: Dict[int, Dict[int, int]] = defaultdict(dict)
+        self._posting_cache: Dict[tuple, np.ndarray] = {}
+        self.vectorizer = HashedTfidfVectorizer()
+        self._allocate(_INITIAL_CAPACITY)
+        self._loaded = False
+
+    def _allocate(self, capacity: int) -> None:
+        self.job_ids = np.zeros(capacity, dtype=np.int64)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.required_count = np.zeros(capacity, dtype=np.int32)
+        self.preferred_count = np.zeros(capacity, dtype=np.int32)
+        self.experience_code = np.zeros(capacity, dtype=np.int32)
+        self.remote_code = np.full(capacity, -1, dtype=np.int32)
+        self.title_flags = np.zeros(capacity, dtype=np.int32)
+        self.culture_high = np.zeros(capacity, dtype=np.int32)
+        self.culture_medium = np.zeros(capacity, dtype=np.int32)
+        self.growth_score = np.zeros(capacity, dtype=np.float64)
+        self.compensation = np.zeros(capacity, dtype=np.float64)
+        self.semantic_vectors = np.zeros((capacity, SEMANTIC_DIMENSIONS), dtype=np.float32)
+
+    _COLUMNS = [
+        "job_ids", "active", "required_count", "preferred_count", "experience_code",
+        "remote_code", "title_flags", "culture_high", "culture_medium", "growth_score", "compensation",
+        "semantic_vectors",
+    ]
+
+    def _grow(self) -> None:
+        capacity = len(self.job_ids) * 2
+        for name in self._COLUMNS:
+            old = getattr(self, name)
+            shape = (capacity,) + old.shape[1:]
+            new = np.zeros(shape, dtype=old.dtype) if name != "remote_code" else np.full(shape, -1, dtype=old.dtype)
+            new[: len(old)] = old
+            setattr(self, name, new)
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    @property
+    def size(self) -> int:
+        """Number of slots in use, including freed ones; columns are valid up to here"""
+        return self._size
+
+    @property
+    def experience_codes(self) -> Dict[str, int]:
+        return self._experience_codes
+
+    @property
+    def remote_codes(self) -> Dict[str, int]:
+        return self._remote_codes
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def ensure_loaded(self, db: Session) -> None:
+        """Build the index from the database if it has not been built yet"""
+        if not self._loaded:
+            self.rebuild(db)
+
+    def rebuild(self, db: Session) -> None:
+        """Rebuild the whole index from the active rows of the jobs table"""
+        jobs = db.query(Job).filter(Job.is_active.isnot(False)).order_by(Job.id).all()
+        with self._lock:
+            self._reset()
+            job_dicts = [job_to_dict(job) for job in jobs]
+            # Count document frequencies first so every vector is weighted alike
+            for job in job_dicts:
+                self.vectorizer.add_document(analyze(job_text(job)))
+            for job, row in zip(job_dicts, jobs):
+                self._add(job, stored_features(row), count_terms=False)
+            self._loaded = True
+
+    def upsert(self, job: Dict[str, Any], features: Optional[Dict[str, Any]] = None) -> None:
+        """Insert or replace a job; inactive jobs are dropped from the index.
+
+        ``features`` are the job's stored derived features; they are derived
+        on the spot when missing.
+        """
+        with self._lock:
+            self._remove(job["id"])
+            if job.get("is_active", True):
+                self._add(job, features)
+
+    def remove(self, job_id: int) -> None:
+        with self._lock:
+            self._remove(job_id)
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        return self._jobs.get(job_id)
+
+    def features(self, job_id: int) -> Dict[str, Any]:
+        return self._features[job_id]
+
+    def slots_of(self, job_ids: Iterable[int]) -> np.ndarray:
+        """Column slots of the given jobs; ids not in the index are skipped"""
+        slots = [self._slot_of[job_id] for job_id in job_ids if job_id in self._slot_of]
+        return np.array(slots, dtype=np.int64)
+
+    def iter_jobs(self) -> Iterable[Dict[str, Any]]:
+        return iter(list(self._jobs.values()))
+
+    def semantic_top_k(self, vector: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        """(job id, cosine similarity) of the ``k`` jobs closest to ``vector``, best first"""
+        with self._lock:
+            size = self._size
+            similarity = self.semantic_vectors[:size] @ vector
+            job_ids = self.job_ids[:size].copy()
+            similarity[~self.active[:size]] = -np.inf
+        k = min(k, len(self._jobs))
+        if k <= 0:
+            return []
+        top = np.argpartition(-similarity, k - 1)[:k]
+        top = top[np.lexsort((job_ids[top], -similarity[top]))]
+        return [(int(job_ids[slot]), float(similarity[slot])) for slot in top]
+
+    def candidates(self, skills: Iterable[str]) -> List[Dict[str, Any]]:
+        """Jobs sharing at least one required or preferred skill, ordered by id"""
+        job_ids: Set[int] = set()
+        for skill_id in skill_canonicalizer.id_set(skills):
+            for postings in (self._required, self._preferred):
+                posting = postings.get(skill_id)
+                if posting:
+                    job_ids.update(int(self.job_ids[slot]) for slot in posting)
+        return [self._jobs[job_id] for job_id in sorted(job_ids) if job_id in self._jobs]
+
+    def posting_slots(self, kind: str, skill_id: int) -> np.ndarray:
+        """Slots listing the skill as required/preferred, repeated by multiplicity"""
+        key = (kind, skill_id)
+        cached = self._posting_cache.get(key)
+        if cached is None:
+            posting = (self._required if kind == "required" else self._preferred).get(skill_id, {})
+            slots = np.fromiter(posting.keys(), dtype=np.int64, count=len(posting))
+            counts = np.fromiter(posting.values(), dtype=np.int64, count=len(posting))
+            cached = np.repeat(slots, counts)
+            self._posting_cache[key] = cached
+        return cached
+
+    def posting_lists(self, kind: str):
+        """All posting lists of one kind in CSR form: (skill names, indptr, slots).
+
+        The slots of ``skills[k]`` are ``slots[indptr[k]:indptr[k + 1]]``.
+        Skills are given by canonical name so other processes can map them to
+        their own ids.
+        """
+        with self._lock:
+            skill_ids = sorted(self._required if kind == "required" else self._preferred)
+            postings = [self.posting_slots(kind, skill_id) for skill_id in skill_ids]
+        skills = [skill_canonicalizer.name(skill_id) for skill_id in skill_ids]
+        indptr = np.zeros(len(skills) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(posting) for posting in postings])
+        slots = np.concatenate(postings) if postings else np.zeros(0, dtype=np.int64)
+        return skills, indptr, slots
+
+    def _code(self, codes: Dict[str, int], value: str) -> int:
+        if value not in codes:
+            codes[value] = len(codes)
+        return codes[value]
+
+    def _add(self, job: Dict[str, Any], features: Optional[Dict[str, Any]] = None, count_terms: bool = True) -> None:
+        job_id = job["id"]
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            if self._size == len(self.job_ids):
+                self._grow()
+            slot = self._size
+            self._size += 1
+
+        if features is None:
+            features = derive_job_features(job)
+        culture_levels = Counter(features["culture_analysis"].values())
+
+        self._jobs[job_id] = job
+        self._features[job_id] = features
+        self._slot_of[job_id] = slot
+        self.job_ids[slot] = job_id
+        self.active[slot] = True
+        self.required_count[slot] = len(job["required_skills"])
+        self.preferred_count[slot] = len(job["preferred_skills"])
+        self.experience_code[slot] = self._code(self._experience_codes, job["experience_level"])
+        self.remote_code[slot] = self._code(self._remote_codes, job["remote_status"].lower())
+        self.title_flags[slot] = sum(
+            1 << bit for bit, keyword in enumerate(INTEREST_TITLE_KEYWORDS) if keyword in job["title"]
+        )
+        self.culture_high[slot] = culture_levels.get("high", 0)
+        self.culture_medium[slot] = culture_levels.get("medium", 0)
+        self.growth_score[slot] = features["growth_potential"]["score"]
+        self.compensation[slot] = 80 if features["salary_position"] == "above_average" else 65
+
+        text = analyze(job_text(job))
+        if count_terms:
+            self.vectorizer.add_document(text)
+        self.semantic_vectors[slot] = self.vectorizer.transform(text)
+
+        for postings, kind, skills in (
+            (self._required, "required", job["required_skills"]),
+            (self._preferred, "preferred", job["preferred_skills"]),
+        ):
+            for skill_id, count in Counter(skill_canonicalizer.ids(skills)).items():
+                postings[skill_id][slot] = count
+                self._posting_cache.pop((kind, skill_id), None)
+
+    def _remove(self, job_id: int) -> None:
+        job = self._jobs.pop(job_id, None)
+        if not job:
+            return
+        self._features.pop(job_id, None)
+        slot = self._slot_of.pop(job_id)
+        self.active[slot] = False
+        self.semantic_vectors[slot] = 0
+        self.vectorizer.remove_document(analyze(job_text(job)))
+        self._free_slots.append(slot)
+        for postings, kind, skills in (
+            (self._required, "required", job["required_skills"]),
+            (self._preferred, "preferred", job["preferred_skills"]),
+        ):
+            for skill_id in skill_canonicalizer.id_set(skills):
+                posting = postings.get(skill_id)
+                if posting is not None:
+                    posting.pop(slot, None)
+                    if not posting:
+                        del postings[skill_id]
+                self._posting_cache.pop((kind, skill_id), None)
+
+
+job_index = JobIndex()
+
+_PENDING_KEY = "job_index_pending"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_job_changes(session: Session, flush_context) -> None:
+    """Snapshot Job rows touched by a flush; they are applied on commit"""
+    pending = session.info.setdefault(_PENDING_KEY, {})
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Job) and obj.id is not None:
+            pending[obj.id] = (job_to_dict(obj), stored_features(obj))
+    for obj in session.deleted:
+        if isinstance(obj, Job) and obj.id is not None:
+            pending[obj.id] = None
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_job_changes(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    if job_index.loaded:
+        for job_id, change in pending.items():
+            if change is None:
+                job_index.remove(job_id)
+            else:
+                job_index.upsert(*change)
+    if similar_jobs_index.loaded:
+        for job_id, change in pending.items():
+            if change is None:
+                similar_jobs_index.remove(job_id)
+            else:
+                similar_jobs_index.upsert(change[0])
+    _refresh_job_matches(session, pending)
+
+
+def _refresh_job_matches(session: Session, pending: Dict[int, Any]) -> None:
+    """Re-score the materialized (user, job) pairs of the committed jobs in a fresh session.
+
+    This needs the loaded index; a process without one, or a failed re-score,
+    marks the affected users' matches stale instead, so their next read
+    recomputes them.
+    """
+    # Imported here because the materializer depends on this module
+    from app.services.match_materializer import MatchMaterializer, job_skills
+
+    materializer = MatchMaterializer(job_index)
+    job_ids = list(pending)
+    db = Session(bind=session.get_bind())
+    try:
+        if job_index.loaded:
+            try:
+                materializer.refresh_jobs(db, job_ids)
+                return
+            except Exception:
+                db.rollback()
+                logger.exception("Failed to re-score job matches of jobs %s, marking them stale", job_ids)
+        skills = job_skills(change[0] for change in pending.values() if change is not None)
+        materializer.invalidate_jobs(db, job_ids, skills)
+    except Exception:
+        db.rollback()
+        logger.exception("Failed to invalidate job matches of jobs %s", job_ids)
+    finally:
+        db.close()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_job_changes(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,180 @@
+"""Ranked full-text search over jobs.
+
+SQLite keeps an external-content FTS5 table (``jobs_fts``) and PostgreSQL a
+weighted ``search_vector`` tsvector column with a GIN index; in both cases
+triggers on ``jobs`` keep the search data in sync with every write, including
+bulk Core upserts. Results are ordered by a rank where lower is better (bm25,
+or the negated ts_rank_cd) with the job id as tie-breaker, which makes
+(rank, id) a stable keyset for pagination. The rank column is aliased
+``score`` because ``rank`` is a reserved hidden column of FTS5 tables.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.models.job import Job
+
+# Column weights: title, company, description, requirements
+SEARCH_WEIGHTS = (10.0, 5.0, 1.0, 1.0)
+
+_SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+        title, company, description, requirements,
+        content='jobs', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+        INSERT INTO jobs_fts(rowid, title, company, description, requirements)
+        VALUES (new.id, new.title, new.company, new.description, new.requirements);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, company, description, requirements)
+        VALUES ('delete', old.id, old.title, old.company, old.description, old.requirements);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF title, company, description, requirements ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, company, description, requirements)
+        VALUES ('delete', old.id, old.title, old.company, old.description, old.requirements);
+        INSERT INTO jobs_fts(rowid, title, company, description, requirements)
+        VALUES (new.id, new.title, new.company, new.description, new.requirements);
+    END
+    """,
+]
+
+_POSTGRES_VECTOR = """
+    setweight(to_tsvector('english', coalesce({row}.title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce({row}.company, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce({row}.description, '')), 'C') ||
+    setweight(to_tsvector('english', coalesce({row}.requirements, '')), 'D')
+"""
+
+_POSTGRES_DDL = [
+    "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    "CREATE INDEX IF NOT EXISTS ix_jobs_search_vector ON jobs USING GIN (search_vector)",
+    f"""
+    CREATE OR REPLACE FUNCTION jobs_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := {_POSTGRES_VECTOR.format(row="NEW")};
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS jobs_search_vector_trigger ON jobs",
+    """
+    CREATE TRIGGER jobs_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, company, description, requirements ON jobs
+    FOR EACH ROW EXECUTE FUNCTION jobs_search_vector_update()
+    """,
+    f"UPDATE jobs SET search_vector = {_POSTGRES_VECTOR.format(row='jobs')} WHERE search_vector IS NULL",
+]
+
+
+def install_search_index(bind) -> None:
+    """Create the search table/column, its triggers, and backfill existing jobs.
+
+    Idempotent; safe to run on every startup.
+    """
+    if isinstance(bind, Engine):
+        with bind.begin() as connection:
+            _install(connection)
+    else:
+        _install(bind)
+
+
+def _install(connection: Connection) -> None:
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        existed = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs_fts'")
+        ).first()
+        for statement in _SQLITE_DDL:
+            connection.execute(text(statement))
+        if not existed:
+            connection.execute(text("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')"))
+    elif dialect == "postgresql":
+        for statement in _POSTGRES_DDL:
+            connection.execute(text(statement))
+    else:
+        print(f"Warning: Full-text job search is not supported on {dialect}")
+
+
+@event.listens_for(Job.__table__, "after_create")
+def _install_after_create(target, connection, **kw) -> None:
+    _install(connection)
+
+
+def _fts5_query(query: str) -> str:
+    """Quote every word so user input can never break FTS5 query syntax"""
+    return " ".join(f'"{word}"*' for word in re.findall(r"\w+", query))
+
+
+def search_jobs(
+    db: Session,
+    query: str,
+    remote_status: Optional[str] = None,
+    experience_level: Optional[str] = None,
+    job_type: Optional[str] = None,
+    limit: int = 20,
+    after: Optional[Tuple[int, float]] = None,
+    min_salary: Optional[int] = None,
+) -> List[Tuple[int, float]]:
+    """(job id, rank) of active jobs matching ``query``, best first.
+
+    ``after`` is the last (job id, rank) hit of the previous page.
+    ``min_salary`` keeps jobs whose annual band reaches at least that amount.
+    """
+    dialect = db.get_bind().dialect.name
+    params: Dict[str, Any] = {"limit": limit}
+
+    if dialect == "sqlite":
+        params["query"] = _fts5_query(query)
+        if not params["query"]:
+            return []
+        weights = ", ".join(str(weight) for weight in SEARCH_WEIGHTS)
+        ranked = f"""
+            SELECT jobs.id AS id, bm25(jobs_fts, {weights}) AS score
+            FROM jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid
+            WHERE jobs_fts MATCH :query AND coalesce(jobs.is_active, 1) = 1
+        """
+    elif dialect == "postgresql":
+        params["query"] = query
+        ranked = """
+            SELECT jobs.id AS id,
+                   (-ts_rank_cd(jobs.search_vector, websearch_to_tsquery('english', :query)))::float8 AS score
+            FROM jobs
+            WHERE jobs.search_vector @@ websearch_to_tsquery('english', :query) AND jobs.is_active IS NOT FALSE
+        """
+    else:
+        raise ValueError(f"Full-text job search is not supported on {dialect}")
+
+    for column, value in (
+        ("remote_status", remote_status),
+        ("experience_level", experience_level),
+        ("job_type", job_type),
+    ):
+        if value:
+            ranked += f" AND lower(jobs.{column}) = :{column}"
+            params[column] = value.lower()
+    if min_salary is not None:
+        ranked += " AND jobs.salary_max >= :min_salary"
+        params["min_salary"] = min_salary
+
+    keyset = ""
+    if after is not None:
+        keyset = "WHERE score > :after_rank OR (score = :after_rank AND id > :after_id)"
+        params["after_id"], params["after_rank"] = after
+
+    rows = db.execute(
+        text(f"SELECT id, score FROM ({ranked}) AS ranked {keyset} ORDER BY score, id LIMIT :limit"),
+        params,
+    ).all()
+    return [(int(job_id), float(rank)) for job_id, rank in rows]
@@ -0,0 +1,131 @@
+"""Learning activity log and its time-bucketed rollups.
+
+Every change in learning progress appends one compact ``learning_activity``
+row (user, resource, minutes, time) and adds the same minutes to the user's
+``learning_activity_daily`` and ``learning_activity_weekly`` rows in the
+same transaction. Velocity metrics then read a fixed number of rollup rows
+per user, however long their history is.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.assessment import (
+    LearningActivity,
+    LearningActivityDaily,
+    LearningActivityWeekly,
+    LearningPath,
+    LearningResource,
+)
+
+RECENT_DAYS = 30
+VELOCITY_WEEKS = 4  # the current week and the three before it
+
+
+def week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def minutes_from_progress(resource: LearningResource, old_percentage: int, new_percentage: int) -> int:
+    """Learning time a progress increase stands for; decreases log nothing"""
+    gained = max(0, new_percentage - old_percentage)
+    return gained * (resource.duration_hours or 0) * 60 // 100
+
+
+def path_total_hours(path: LearningPath) -> int:
+    """Planned hours of a learning path, from the timeline stored with its resources"""
+    timeline = (path.resources or {}).get("timeline") or {}
+    return timeline.get("total_hours") or 0
+
+
+def _insert(db: Session):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert
+    if dialect == "sqlite":
+        return sqlite.insert
+    raise ValueError(f"Learning activity rollups are not supported on {dialect}")
+
+
+def record_activity(
+    db: Session,
+    user_id: int,
+    resource_id: Optional[int],
+    delta_minutes: int,
+    occurred_at: Optional[datetime] = None,
+) -> None:
+    """Log learning time and add it to the daily and weekly rollups; the caller commits"""
+    if delta_minutes <= 0:
+        return
+    occurred_at = occurred_at or datetime.utcnow()
+    db.add(LearningActivity(
+        user_id=user_id, resource_id=resource_id, delta_minutes=delta_minutes, occurred_at=occurred_at
+    ))
+
+    insert = _insert(db)
+    day = occurred_at.date()
+    for table, key, bucket in (
+        (LearningActivityDaily.__table__, "day", day),
+        (LearningActivityWeekly.__table__, "week_start", week_start(day)),
+    ):
+        statement = insert(table).values(user_id=user_id, minutes=delta_minutes, **{key: bucket})
+        db.execute(statement.on_conflict_do_update(
+            index_elements=["user_id", key],
+            set_={"minutes": table.c.minutes + statement.excluded.minutes},
+        ))
+
+
+@dataclass
+class ActivitySummary:
+    """A user's recent learning time, read from the rollups"""
+
+    minutes_last_30_days: int = 0
+    minutes_by_week: List[int] = field(default_factory=lambda: [0] * VELOCITY_WEEKS)  # oldest first
+
+    @property
+    def hours_last_30_days(self) -> float:
+        return self.minutes_last_30_days / 60
+
+    @property
+    def hours_per_week(self) -> float:
+        return sum(self.minutes_by_week) / len(self.minutes_by_week) / 60
+
+    @property
+    def hours_per_day(self) -> float:
+        """Average daily learning time over the last 30 days"""
+        return self.minutes_last_30_days / RECENT_DAYS / 60
+
+
+def load_activity_summaries(
+    db: Session, user_ids: Iterable[int], today: Optional[date] = None
+) -> Dict[int, ActivitySummary]:
+    """Recent learning time of each user: two indexed range reads for all of them"""
+    summaries = {user_id: ActivitySummary() for user_id in user_ids}
+    if not summaries:
+        return summaries
+    today = today or datetime.utcnow().date()
+    ids = list(summaries)
+
+    daily = db.query(LearningActivityDaily.user_id, LearningActivityDaily.minutes).filter(
+        LearningActivityDaily.user_id.in_(ids),
+        LearningActivityDaily.day > today - timedelta(days=RECENT_DAYS),
+        LearningActivityDaily.day <= today,
+    )
+    for user_id, minutes in daily:
+        summaries[user_id].minutes_last_30_days += minutes
+
+    first_week = week_start(today) - timedelta(weeks=VELOCITY_WEEKS - 1)
+    weekly = db.query(
+        LearningActivityWeekly.user_id, LearningActivityWeekly.week_start, LearningActivityWeekly.minutes
+    ).filter(
+        LearningActivityWeekly.user_id.in_(ids),
+        LearningActivityWeekly.week_start >= first_week,
+        LearningActivityWeekly.week_start <= today,
+    )
+    for user_id, start, minutes in weekly:
+        summaries[user_id].minutes_by_week[(start - first_week).days // 7] += minutes
+    return summaries
@@ -0,0 +1,157 @@
+"""Market data snapshot shared by the career analytics.
+
+Segment trends, trending skills, salary benchmarks and per-skill market
+figures come from one local file (``MARKET_DATA_PATH``) that analysts
+update without a deploy. It is compiled into an immutable, versioned
+``MarketSnapshot`` whose per-skill tables are keyed by canonical skill id,
+so lookups never rebuild a literal.
+
+The store checks the file's modification time at most every
+``MARKET_DATA_CHECK_SECONDS`` and swaps in a new snapshot atomically once
+it has parsed completely; a file that fails to parse is reported and the
+previous snapshot stays in service. Readers take one snapshot per request
+and key cached results by its ``version``.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from app.services.skill_canonicalizer import skill_canonicalizer
+
+DEFAULT_MARKET_DATA_PATH = Path(__file__).resolve().parent.parent / "data" / "market_data.json"
+MARKET_DATA_PATH = os.getenv("MARKET_DATA_PATH") or str(DEFAULT_MARKET_DATA_PATH)
+CHECK_INTERVAL_SECONDS = float(os.getenv("MARKET_DATA_CHECK_SECONDS", "10"))
+
+# Per-skill figures of the file's "skills" rows, each with a default in "skill_defaults"
+SKILL_FIELDS = ("market_value", "learning_hours", "salary_impact", "salary_premium", "learning_gap")
+
+
+def _frozen(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({key: _frozen(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_frozen(item) for item in value)
+    return value
+
+
+@dataclass(frozen=True)
+class MarketSnapshot:
+    """One version of the market data; never mutated after it is built"""
+
+    version: str
+    segment_trends: Mapping[str, Mapping[str, float]]
+    default_segment_trend: Mapping[str, float]
+    trending_skills: Tuple[Mapping[str, Any], ...]
+    trending_skill_ids: Tuple[int, ...]
+    salary_benchmarks: Mapping[str, Mapping[str, int]]
+    default_salary_benchmark: str
+    job_average_salaries: Mapping[str, int]
+    default_job_average_salary: int
+    skill_defaults: Mapping[str, Any]
+    skill_tables: Mapping[str, Mapping[int, Any]]  # field -> canonical skill id -> value
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MarketSnapshot":
+        skill_tables = {field: {} for field in SKILL_FIELDS}
+        for name, figures in data["skills"].items():
+            skill_id = skill_canonicalizer.skill_id(name)
+            for field, value in figures.items():
+                if field not in skill_tables:
+                    raise ValueError(f"Unknown market data field {field} for skill {name}")
+                skill_tables[field][skill_id] = _frozen(value)
+        skill_defaults = data["skill_defaults"]
+        missing = [field for field in SKILL_FIELDS if field not in skill_defaults]
+        if missing:
+            raise ValueError(f"Market data has no default for {', '.join(missing)}")
+        if data["default_salary_benchmark"] not in data["salary_benchmarks"]:
+            raise ValueError("Market data default salary benchmark is not a benchmark")
+
+        trending = data["trending_skills"]
+        return cls(
+            version=str(data["version"]),
+            segment_trends=_frozen(data["segment_trends"]),
+            default_segment_trend=_frozen(data["default_segment_trend"]),
+            trending_skills=_frozen(trending),
+            trending_skill_ids=tuple(skill_canonicalizer.ids(row["skill"] for row in trending)),
+            salary_benchmarks=_frozen(data["salary_benchmarks"]),
+            default_salary_benchmark=data["default_salary_benchmark"],
+            job_average_salaries=_frozen(data["job_average_salaries"]),
+            default_job_average_salary=data["default_job_average_salary"],
+            skill_defaults=_frozen(skill_defaults),
+            skill_tables=MappingProxyType({field: MappingProxyType(table) for field, table in skill_tables.items()}),
+        )
+
+    def skill_figure(self, field: str, skill_name: str) -> Any:
+        """A per-skill figure (see SKILL_FIELDS), or its default for skills without one"""
+        return self.skill_tables[field].get(skill_canonicalizer.skill_id(skill_name), self.skill_defaults[field])
+
+    def segment_trend(self, segment: str) -> Mapping[str, float]:
+        return self.segment_trends.get(segment, self.default_segment_trend)
+
+    def salary_benchmark(self, experience_level: str) -> Mapping[str, int]:
+        return self.salary_benchmarks.get(experience_level, self.salary_benchmarks[self.default_salary_benchmark])
+
+    def job_average_salary(self, experience_level: Optional[str]) -> int:
+        return self.job_average_salaries.get(experience_level or "", self.default_job_average_salary)
+
+
+def load_snapshot(path: str) -> MarketSnapshot:
+    with open(path) as f:
+        return MarketSnapshot.from_dict(json.load(f))
+
+
+class MarketDataStore:
+    """The current market snapshot, reloaded when its file changes"""
+
+    def __init__(self, path: str = MARKET_DATA_PATH, check_interval: float = CHECK_INTERVAL_SECONDS):
+        self.path = path
+        self.check_interval = check_interval
+        self._reload_lock = threading.Lock()
+        self._mtime = os.stat(path).st_mtime_ns
+        self._snapshot = load_snapshot(path)
+        self._checked_at = time.monotonic()
+
+    @property
+    def version(self) -> str:
+        return self.current().version
+
+    def current(self) -> MarketSnapshot:
+        """The latest snapshot; callers keep it for the rest of their request"""
+        if time.monotonic() - self._checked_at >= self.check_interval:
+            self.reload_if_changed()
+        return self._snapshot
+
+    def reload_if_changed(self) -> bool:
+        """Swap in the file's snapshot if it changed since the last load; True if it did"""
+        # One thread checks at a time; the others keep serving the current snapshot
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        try:
+            self._checked_at = time.monotonic()
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError as e:
+                print(f"Warning: Market data file unavailable, keeping version {self._snapshot.version}: {e}")
+                return False
+            if mtime == self._mtime:
+                return False
+            try:
+                snapshot = load_snapshot(self.path)
+            except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+                print(f"Warning: Ignoring unreadable market data, keeping version {self._snapshot.version}: {e}")
+                return False
+            finally:
+                self._mtime = mtime
+            self._snapshot = snapshot
+            return True
+        finally:
+            self._reload_lock.release()
+
+
+market_data = MarketDataStore()
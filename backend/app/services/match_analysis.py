@@ -0,0 +1,266 @@
+"""Per-job match analysis: skill and experience match, culture, growth and market insights.
+
+These are the scalar, one-job-at-a-time helpers behind a match payload.
+They only read their arguments (and the market data snapshot), so the jobs
+router, the stored job features and the match materializer all share them;
+``match_scoring`` reproduces their numbers for every candidate at once.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from app.services.market_data import market_data
+from app.services.skill_canonicalizer import skill_canonicalizer
+
+EXPERIENCE_YEARS = {
+    "Entry Level (0-2 years)": 1,
+    "Mid Level (2-5 years)": 3.5,
+    "Senior Level (5+ years)": 7,
+    "Lead/Principal Level": 10
+}
+
+DEFAULT_CULTURE_PREFERENCES = ["fast_paced", "innovative", "collaborative"]
+
+# Culture type -> description keywords; one keyword rates the type "medium", two or more "high"
+CULTURE_INDICATORS = {
+    "fast_paced": ["fast-paced", "dynamic", "rapidly", "quickly", "startup", "agile"],
+    "innovative": ["innovative", "cutting-edge", "forward-thinking", "creative", "disrupt"],
+    "collaborative": ["team", "collaborative", "together", "cross-functional", "partnership"],
+    "structured": ["established", "process", "methodology", "structured", "formal"],
+    "growth_focused": ["growth", "learn", "develop", "mentor", "training", "career"]
+}
+
+
+def calculate_skill_match(user_skills: Dict[str, str], job_required: List[str], job_preferred: List[str]) -> Dict[str, Any]:
+    """Calculate skill match score and analysis"""
+    user_skill_ids = skill_canonicalizer.id_set(user_skills)
+    required_ids = skill_canonicalizer.ids(job_required)
+    
+    # Required skills match (most important)
+    required_matches = len([skill_id for skill_id in required_ids if skill_id in user_skill_ids])
+    required_score = (required_matches / len(job_required)) if job_required else 0
+    
+    # Preferred skills match (bonus)
+    preferred_matches = len([skill_id for skill_id in skill_canonicalizer.ids(job_preferred) if skill_id in user_skill_ids])
+    preferred_score = (preferred_matches / len(job_preferred)) if job_preferred else 0
+    
+    # Overall skill score (70% required, 30% preferred)
+    skill_score = (required_score * 0.7) + (preferred_score * 0.3)
+    
+    # Identify skill gaps
+    skill_gaps = [skill for skill, skill_id in zip(job_required, required_ids) if skill_id not in user_skill_ids]
+    
+    # Identify matching reasons
+    match_reasons = []
+    if required_matches >= len(job_required) * 0.8:
+        match_reasons.append(f"Strong skill match ({required_matches}/{len(job_required)} required skills)")
+    
+    if preferred_matches >= len(job_preferred) * 0.5:
+        match_reasons.append(f"Bonus skills ({preferred_matches} preferred skills)")
+    
+    return {
+        "score": skill_score * 100,
+        "required_matches": required_matches,
+        "preferred_matches": preferred_matches,
+        "skill_gaps": skill_gaps,
+        "match_reasons": match_reasons
+    }
+
+def calculate_experience_match(user_experience: str, job_experience: str) -> float:
+    """Calculate experience level match"""
+    user_level = EXPERIENCE_YEARS.get(user_experience, 0)
+    job_level = EXPERIENCE_YEARS.get(job_experience, 0)
+    
+    # Perfect match = 1.0
+    if abs(user_level - job_level) <= 1:
+        return 1.0
+    # Close match = 0.7
+    elif abs(user_level - job_level) <= 2:
+        return 0.7
+    # Overqualified = 0.5
+    elif user_level > job_level:
+        return 0.5
+    # Underqualified = 0.3
+    else:
+        return 0.3
+
+def analyze_company_culture(job_description: str) -> Dict[str, str]:
+    """Analyze company culture from job description"""
+    description_lower = job_description.lower()
+    
+    culture_scores = {}
+    for culture_type, keywords in CULTURE_INDICATORS.items():
+        score = sum(1 for keyword in keywords if keyword in description_lower)
+        if score > 0:
+            culture_scores[culture_type] = "high" if score >= 2 else "medium"
+    
+    return culture_scores
+
+def calculate_market_intelligence(job: Dict[str, Any], match_score: float) -> Dict[str, Any]:
+    """Calculate market intelligence for the job match"""
+    avg_salary = market_data.current().job_average_salary(job.get("experience_level"))
+    
+    # Top of the band, parsed from the salary text when the job was written
+    job_max_salary = job.get("salary_max") or avg_salary
+    
+    salary_position = "average"
+    if job_max_salary > avg_salary * 1.2:
+        salary_position = "above_average"
+    elif job_max_salary < avg_salary * 0.8:
+        salary_position = "below_average"
+    
+    # Competition analysis (mock data)
+    competition_level = "high" if match_score > 80 else "medium" if match_score > 60 else "low"
+    
+    return {
+        "salary_comparison": {
+            "position": salary_position,
+            "industry_average": avg_salary,
+            "job_max": job_max_salary
+        },
+        "competition_level": competition_level,
+        "success_probability": min(95, max(20, match_score + 10)),
+        "time_to_hire": "2-4 weeks" if competition_level == "low" else "4-6 weeks" if competition_level == "medium" else "6-8 weeks"
+    }
+
+
+def derive_culture_fit(user_preferences: List[str], culture_analysis: Dict[str, str]) -> Dict[str, Any]:
+    """Derive cultural compatibility insights."""
+    if not user_preferences:
+        user_preferences = DEFAULT_CULTURE_PREFERENCES
+
+    overlaps = [value for value in culture_analysis.values() if value in user_preferences]
+    gaps = [pref for pref in user_preferences if pref not in culture_analysis.values()]
+
+    score = 60 + len(overlaps) * 10 - len(gaps) * 5
+    score = max(30, min(95, score))
+
+    summary = "Aligned" if score >= 75 else "Worth a conversation" if score >= 55 else "Probe during interviews"
+
+    highlights = [f"Company leans {value.replace('_', ' ')}" for value in overlaps]
+    watchouts = [f"Culture may be lighter on {gap.replace('_', ' ')}" for gap in gaps]
+
+    return {
+        "score": round(score, 1),
+        "summary": summary,
+        "highlights": highlights[:3],
+        "watchouts": watchouts[:3]
+    }
+
+
+def evaluate_growth_potential(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Evaluate growth potential based on company signals."""
+    signals = job.get("growth_signals", {})
+    revenue_growth = signals.get("revenue_growth", 0.15)
+    headcount_growth = signals.get("headcount_growth", 0.1)
+    runway = signals.get("runway_months", 18)
+
+    score = (revenue_growth * 150) + (headcount_growth * 120) + (runway / 36 * 20)
+    score = max(20, min(95, score))
+
+    momentum = "rocket" if revenue_growth > 0.3 else "growing" if revenue_growth > 0.15 else "steady"
+    runway_class = "healthy" if runway >= 24 else "moderate" if runway >= 18 else "tight"
+
+    metrics = {
+        "revenue_growth_pct": round(revenue_growth * 100, 1),
+        "headcount_growth_pct": round(headcount_growth * 100, 1),
+        "runway_months": runway,
+        "momentum": momentum,
+        "runway_health": runway_class,
+    }
+
+    narrative = "Series C rocketship" if momentum == "rocket" else "Confident climb" if momentum == "growing" else "Measured pace"
+
+    return {
+        "score": round(score, 1),
+        "narrative": narrative,
+        "metrics": metrics,
+        "signal": {
+            "career_ceiling": "Leadership potential" if score > 70 else "Solid IC growth",
+            "team_visibility": "High" if job.get("team_size", 50) < 120 else "Medium"
+        }
+    }
+
+
+def generate_negotiation_playbook(job: Dict[str, Any], market_intel: Dict[str, Any], skill_analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Generate salary negotiation guidance."""
+    salary_comparison = market_intel.get("salary_comparison", {})
+    max_offer = salary_comparison.get("job_max", 0)
+    industry_avg = salary_comparison.get("industry_average", max_offer)
+    anchor = int(max(max_offer, industry_avg * 1.1))
+
+    leverage = []
+    if skill_analysis.get("score", 0) > 80:
+        leverage.append("You cover nearly every critical skill they asked for")
+    if salary_comparison.get("position") == "below_average":
+        leverage.append("Market data shows peers at a higher band")
+    if job.get("company_stage") in {"Series C", "Series B"}:
+        leverage.append("High growth stage typically budgets aggressively for top talent")
+
+    red_flags = []
+    if salary_comparison.get("position") == "below_average":
+        red_flags.append("Salary band trends below market average")
+    if market_intel.get("competition_level") == "high":
+        red_flags.append("Competition is intense – speed will matter")
+
+    closing = "Frame an ask around the upper band with evidence and offer to review comp again at the 6-month mark"
+
+    return {
+        "salary_anchor": f"${anchor:,}",
+        "counter_floor": f"${int(anchor * 0.95):,}",
+        "leverage_points": leverage[:3],
+        "risk_flags": red_flags[:2],
+        "closing_move": closing
+    }
+
+
+def calculate_score_breakdown(skill_analysis: Dict[str, Any], experience_match: float, culture_fit: Dict[str, Any], growth: Dict[str, Any], market_intel: Dict[str, Any], semantic: Optional[float] = None) -> Dict[str, float]:
+    """Provide a normalized score breakdown for UI.
+
+    ``semantic`` is the 0-100 resume/job text similarity; when the user has
+    a resume it takes a tenth of the weight from skills.
+    """
+    skills = min(100, skill_analysis.get("score", 0))
+    experience = round(experience_match * 100, 1)
+    culture = culture_fit.get("score", 60)
+    growth_score = growth.get("score", 60)
+    compensation = 80 if market_intel.get("salary_comparison", {}).get("position") == "above_average" else 65
+
+    breakdown = {
+        "skills": round(skills, 1),
+        "experience": round(experience, 1),
+        "culture": round(culture, 1),
+        "growth": round(growth_score, 1),
+        "compensation": round(compensation, 1),
+    }
+    if semantic is None:
+        total = min(100, round(skills * 0.45 + experience * 0.2 + culture * 0.15 + growth_score * 0.1 + compensation * 0.1, 1))
+    else:
+        total = min(100, round(skills * 0.35 + experience * 0.2 + culture * 0.15 + growth_score * 0.1 + compensation * 0.1 + semantic * 0.1, 1))
+        breakdown["semantic"] = round(semantic, 1)
+    breakdown["total"] = total
+    return breakdown
+
+def describe_match(job: Dict[str, Any], features: Dict[str, Any], match: Dict[str, Any], user_skills: Dict[str, str], answers: Dict[str, Any]) -> Dict[str, Any]:
+    """Skill analysis, culture fit and match reasons for one scored job"""
+    skill_analysis = calculate_skill_match(user_skills, job["required_skills"], job["preferred_skills"])
+    culture_fit = derive_culture_fit(answers.get("work_culture", []), features["culture_analysis"])
+    growth_potential = features["growth_potential"]
+    
+    # Generate match reasons
+    all_match_reasons = skill_analysis["match_reasons"].copy()
+    if match["experience_match"] >= 0.7:
+        all_match_reasons.append("Experience level aligns well")
+    if match["location_bonus"] > 0:
+        all_match_reasons.append("Matches your location preferences")
+    if match["interest_bonus"] > 0:
+        all_match_reasons.append("Aligns with your career interests")
+    if culture_fit["score"] >= 70:
+        all_match_reasons.append(f"Culture fit looks {culture_fit['summary'].lower()}")
+    if growth_potential["score"] >= 70:
+        all_match_reasons.append("High trajectory role with strong growth signals")
+    
+    return {
+        "skill_analysis": skill_analysis,
+        "culture_fit": culture_fit,
+        "match_reasons": all_match_reasons
+    }
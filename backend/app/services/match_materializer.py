@@ -0,0 +1,206 @@
+"""Materialized job matches.
+
+Match scores are written to ``job_matches`` once per (user, job) pair and
+recomputed only for the pairs an edit can affect: all of a user's rows when
+their skills or assessment change, and the rows of the touched jobs when a
+job is created, edited or deactivated. Reading a user's matches is then an
+indexed range scan over (user_id, rank_key).
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.assessment import Assessment, JobMatch, UserSkill
+from app.services.dashboard_cache import dashboard_cache
+from app.services.job_index import JobIndex, job_index
+from app.services.match_analysis import describe_match
+from app.services.match_scoring import SCORING_VERSION, UserMatchProfile, score_candidates
+from app.services.semantic_matcher import load_resume_vectors
+
+# Match score from which a materialized match is flagged as recommended
+RECOMMENDED_SCORE = 70
+
+
+def match_from_row(row: JobMatch) -> Dict[str, Any]:
+    """The ``match`` dict build_job_match expects, from a materialized row"""
+    return {
+        **(row.score_signals or {}),
+        "match_score": row.match_score,
+        "score_breakdown": row.score_breakdown or {},
+    }
+
+
+def job_skills(jobs: Iterable[Optional[Dict[str, Any]]]) -> Set[str]:
+    """Required and preferred skills of the given job dicts, skipping missing jobs"""
+    skills: Set[str] = set()
+    for job in jobs:
+        if job:
+            skills.update(job["required_skills"])
+            skills.update(job["preferred_skills"])
+    return skills
+
+
+def load_user_skills(db: Session, user_ids: Iterable[int]) -> Dict[int, Dict[str, str]]:
+    """skill name -> proficiency for each user, one query for all of them"""
+    skills: Dict[int, Dict[str, str]] = {user_id: {} for user_id in user_ids}
+    if skills:
+        rows = db.query(UserSkill).filter(UserSkill.user_id.in_(list(skills))).all()
+        for skill in rows:
+            skills[skill.user_id][skill.skill_name] = skill.proficiency_level
+    return skills
+
+
+class MatchMaterializer:
+    """Keeps ``job_matches`` in step with users, assessments and the job index"""
+
+    def __init__(self, index: JobIndex):
+        self.index = index
+
+    def refresh_user(self, db: Session, user_id: int) -> int:
+        """Recompute every match of one user; returns the number of rows written"""
+        assessment = db.query(Assessment).filter(Assessment.user_id == user_id).first()
+        self.index.ensure_loaded(db)
+
+        rows: List[Dict[str, Any]] = []
+        if assessment:
+            user_skills = load_user_skills(db, [user_id])[user_id]
+            resume_vector = load_resume_vectors(db, [user_id], self.index.vectorizer).get(user_id)
+            rows = self.score_rows(user_id, user_skills, assessment.career_interests or {}, resume_vector=resume_vector)
+        self.replace_user_matches(db, [user_id], rows)
+        return len(rows)
+
+    def affected_users(self, db: Session, job_ids: List[int], skills: Iterable[str]) -> Set[int]:
+        """Users who hold one of the jobs' ``skills`` now or had a match with one of them before.
+
+        Job and user skills are both stored under their canonical names
+        (see canonicalize_user_skills for rows saved before that), so the
+        skill lookup is an exact match on those names.
+        """
+        user_ids = {
+            user_id for (user_id,) in db.query(JobMatch.user_id).filter(JobMatch.job_id.in_(job_ids)).distinct()
+        }
+        skills = list(set(skills))
+        if skills:
+            user_ids.update(
+                user_id for (user_id,) in db.query(UserSkill.user_id).filter(UserSkill.skill_name.in_(skills)).distinct()
+            )
+        return user_ids
+
+    def refresh_jobs(self, db: Session, job_ids: Iterable[int]) -> int:
+        """Recompute the (user, job) pairs of the given jobs for every user they can affect.
+
+        Returns the number of rows written. Users whose matches are already
+        stale are skipped; their next read recomputes everything anyway.
+        """
+        job_ids = list(job_ids)
+        if not job_ids:
+            return 0
+        self.index.ensure_loaded(db)
+        user_ids = self.affected_users(db, job_ids, job_skills(self.index.get(job_id) for job_id in job_ids))
+
+        assessments = []
+        if user_ids:
+            assessments = db.query(Assessment).filter(
+                Assessment.user_id.in_(user_ids),
+                Assessment.matches_version == SCORING_VERSION,
+            ).all()
+        fresh_ids = [assessment.user_id for assessment in assessments]
+        user_skills = load_user_skills(db, fresh_ids)
+        resume_vectors = load_resume_vectors(db, fresh_ids, self.index.vectorizer)
+
+        rows: List[Dict[str, Any]] = []
+        for assessment in assessments:
+            rows.extend(self.score_rows(
+                assessment.user_id, user_skills[assessment.user_id], assessment.career_interests or {}, job_ids,
+                resume_vectors.get(assessment.user_id),
+            ))
+        self.replace_user_matches(db, fresh_ids, rows, job_ids)
+        return len(rows)
+
+    def invalidate_jobs(self, db: Session, job_ids: Iterable[int], skills: Iterable[str]) -> int:
+        """Mark the matches of every user the given jobs can affect stale; returns the number of users.
+
+        The fallback when their pairs cannot be re-scored: each user's next
+        read recomputes all of their matches.
+        """
+        job_ids = list(job_ids)
+        if not job_ids:
+            return 0
+        user_ids = self.affected_users(db, job_ids, skills)
+        if user_ids:
+            db.query(Assessment).filter(Assessment.user_id.in_(user_ids)).update(
+                {Assessment.matches_version: None}, synchronize_session=False
+            )
+        db.commit()
+        return len(user_ids)
+
+    def replace_user_matches(
+        self, db: Session, user_ids: List[int], rows: List[Dict[str, Any]], job_ids: Optional[List[int]] = None
+    ) -> None:
+        """Swap in freshly scored rows for the given users.
+
+        Without ``job_ids`` all of their rows are replaced and their matches
+        stamped current; with it, only their rows of those jobs. Their cached
+        dashboards are invalidated in the same transaction.
+        """
+        if not user_ids:
+            return
+        stale_rows = db.query(JobMatch).filter(JobMatch.user_id.in_(user_ids))
+        if job_ids is not None:
+            stale_rows = stale_rows.filter(JobMatch.job_id.in_(job_ids))
+        stale_rows.delete(synchronize_session=False)
+        if rows:
+            db.execute(insert(JobMatch), rows)
+        if job_ids is None:
+            db.query(Assessment).filter(Assessment.user_id.in_(user_ids)).update(
+                {Assessment.matches_version: SCORING_VERSION}, synchronize_session=False
+            )
+        # Match scores feed the dashboard's benchmarks and promotion analytics
+        dashboard_cache.invalidate_many(db, user_ids)
+        db.commit()
+
+    def score_rows(
+        self,
+        user_id: int,
+        user_skills: Dict[str, str],
+        answers: Dict[str, Any],
+        job_ids: Optional[List[int]] = None,
+        resume_vector: Optional[np.ndarray] = None,
+    ) -> List[Dict[str, Any]]:
+        """job_matches rows for one user, optionally limited to ``job_ids``"""
+        profile = UserMatchProfile.from_answers(user_skills.keys(), answers, resume_vector)
+        scores = score_candidates(self.index, profile, job_ids)
+        rank_keys = scores.rank_keys()
+
+        rows = []
+        for i, job_id in enumerate(scores.job_ids.tolist()):
+            job = self.index.get(job_id)
+            if job is None:
+                continue
+            features = self.index.features(job_id)
+            signals = scores.signals(i)
+            match = {
+                **signals,
+                "match_score": float(scores.match_score[i]),
+                "score_breakdown": scores.score_breakdown(i),
+            }
+            description = describe_match(job, features, match, user_skills, answers)
+            rows.append({
+                "user_id": user_id,
+                "job_id": job_id,
+                "match_score": match["match_score"],
+                "rank_key": int(rank_keys[i]),
+                "score_breakdown": match["score_breakdown"],
+                "score_signals": signals,
+                "scoring_version": SCORING_VERSION,
+                "skill_gaps": description["skill_analysis"]["skill_gaps"],
+                "match_reasons": description["match_reasons"],
+                "recommended": match["match_score"] >= RECOMMENDED_SCORE,
+            })
+        return rows
+
+
+match_materializer = MatchMaterializer(job_index)
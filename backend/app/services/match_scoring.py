@@ -0,0 +1,265 @@
+"""Vectorized job match scoring over the columns of the job index.
+
+Reproduces, for every candidate job at once, the numbers the scalar helpers
+in ``app.services.match_analysis`` (calculate_skill_match, calculate_experience_match,
+derive_culture_fit, calculate_score_breakdown) produce for a single job.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.services.job_index import INTEREST_TITLE_KEYWORDS, JobIndex
+from app.services.match_analysis import DEFAULT_CULTURE_PREFERENCES, EXPERIENCE_YEARS
+from app.services.skill_canonicalizer import skill_canonicalizer
+
+# Bump whenever the scoring formulas change so materialized matches get recomputed
+SCORING_VERSION = 3
+
+# Career interests that unlock the title bonus, aligned with INTEREST_TITLE_KEYWORDS
+INTEREST_TRIGGERS = ["Frontend Developer", "Backend Developer", "Full Stack"]
+
+# round(x * 100, 1) for every value calculate_experience_match can return
+_EXPERIENCE_PERCENT = {value: round(value * 100, 1) for value in (1.0, 0.7, 0.5, 0.3)}
+
+
+def python_round_1(values: np.ndarray) -> np.ndarray:
+    """Element-wise equivalent of Python's ``round(x, 1)``.
+
+    ``np.round`` scales by ten before rounding, which disagrees with Python on
+    values sitting next to a .x5 boundary (e.g. 0.15). Those few elements are
+    rounded with Python itself so results stay bit-identical.
+    """
+    scaled = values * 10
+    rounded = np.round(scaled) / 10
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        idx = np.flatnonzero(near_tie)
+        rounded[idx] = [round(value, 1) for value in values[idx].tolist()]
+    return rounded
+
+
+@dataclass
+class UserMatchProfile:
+    """The parts of a user's skills and assessment answers that drive matching"""
+
+    skills: List[str]
+    experience_level: str = ""
+    location_preferences: List[str] = field(default_factory=list)
+    career_interests: List[str] = field(default_factory=list)
+    culture_preferences: List[str] = field(default_factory=list)
+    resume_vector: Optional[np.ndarray] = None  # hashed TF-IDF vector of the user's resume
+
+    @classmethod
+    def from_answers(
+        cls, user_skills: Iterable[str], answers: Dict[str, Any], resume_vector: Optional[np.ndarray] = None
+    ) -> "UserMatchProfile":
+        return cls(
+            skills=list(user_skills),
+            experience_level=answers.get("experience_level", ""),
+            location_preferences=answers.get("location_preferences", []) or [],
+            career_interests=answers.get("career_interests", []) or [],
+            culture_preferences=answers.get("work_culture", []) or [],
+            resume_vector=resume_vector,
+        )
+
+
+def semantic_similarity(job_vectors: np.ndarray, resume_vector: np.ndarray) -> np.ndarray:
+    """Resume/job cosine similarity as a 0-100 score with one decimal, one per job vector"""
+    cosine = job_vectors.astype(np.float64) @ resume_vector.astype(np.float64)
+    return python_round_1(np.clip(cosine, 0, 1) * 100)
+
+
+@dataclass
+class MatchScores:
+    """Column-wise scores for a user's candidate jobs (one entry per job)"""
+
+    job_ids: np.ndarray
+    required_matches: np.ndarray
+    preferred_matches: np.ndarray
+    skill_score: np.ndarray
+    experience_match: np.ndarray
+    location_bonus: np.ndarray
+    interest_bonus: np.ndarray
+    preliminary_score: np.ndarray
+    skills: np.ndarray
+    experience: np.ndarray
+    culture: np.ndarray
+    growth: np.ndarray
+    compensation: np.ndarray
+    total: np.ndarray
+    match_score: np.ndarray
+    semantic: Optional[np.ndarray] = None  # only when the user has a resume
+
+    def __len__(self) -> int:
+        return len(self.job_ids)
+
+    def score_breakdown(self, i: int) -> Dict[str, float]:
+        """The calculate_score_breakdown dict for the i-th candidate"""
+        breakdown = {
+            "skills": round(float(self.skills[i]), 1),
+            "experience": round(float(self.experience[i]), 1),
+            "culture": round(int(self.culture[i]), 1),
+            "growth": round(float(self.growth[i]), 1),
+            "compensation": round(int(self.compensation[i]), 1),
+        }
+        if self.semantic is not None:
+            breakdown["semantic"] = float(self.semantic[i])
+        breakdown["total"] = float(self.total[i])
+        return breakdown
+
+    def signals(self, i: int) -> Dict[str, float]:
+        """Intermediate terms of the i-th candidate that the match payload reuses"""
+        return {
+            "experience_match": float(self.experience_match[i]),
+            "location_bonus": int(self.location_bonus[i]),
+            "interest_bonus": int(self.interest_bonus[i]),
+            "preliminary_score": float(self.preliminary_score[i]),
+        }
+
+    def ranking(self) -> np.ndarray:
+        """Candidate positions by match score, best first, ties by job id"""
+        return np.lexsort((self.job_ids, -self.match_score))
+
+    def rank_keys(self) -> np.ndarray:
+        """Sortable int64 key per candidate: ascending key == ranking order.
+
+        Match scores carry one decimal in [0, 100], so they fit in the high
+        bits as tenths; the job id breaks ties in the low 40 bits.
+        """
+        tenths = np.rint(self.match_score * 10).astype(np.int64)
+        return ((1000 - tenths) << 40) | self.job_ids
+
+    def top_k(self, k: int, after_key: Optional[int] = None) -> np.ndarray:
+        """Positions of the best ``k`` candidates ranked after ``after_key``.
+
+        Uses a partial selection (argpartition) so only the returned page is
+        fully sorted, whatever the number of candidates.
+        """
+        keys = self.rank_keys()
+        positions = np.arange(len(keys))
+        if after_key is not None:
+            positions = positions[keys > after_key]
+        if len(positions) > k:
+            positions = positions[np.argpartition(keys[positions], k - 1)[:k]]
+        return positions[np.argsort(keys[positions], kind="stable")]
+
+
+def score_candidates(
+    index: JobIndex, profile: UserMatchProfile, job_ids: Optional[Iterable[int]] = None
+) -> MatchScores:
+    """Score every job sharing a skill with the user in one vectorized pass.
+
+    ``job_ids`` restricts scoring to those jobs, for incremental refreshes.
+    """
+    skill_ids = skill_canonicalizer.id_set(profile.skills)
+    with index._lock:
+        size = index.size
+        required_hits = [index.posting_slots("required", skill_id) for skill_id in skill_ids]
+        preferred_hits = [index.posting_slots("preferred", skill_id) for skill_id in skill_ids]
+        required_counts = np.bincount(
+            np.concatenate(required_hits) if required_hits else np.zeros(0, dtype=np.int64), minlength=size
+        )[:size]
+        preferred_counts = np.bincount(
+            np.concatenate(preferred_hits) if preferred_hits else np.zeros(0, dtype=np.int64), minlength=size
+        )[:size]
+
+        slots = np.flatnonzero(((required_counts + preferred_counts) > 0) & index.active[:size])
+        if job_ids is not None:
+            slots = slots[np.isin(slots, index.slots_of(job_ids))]
+
+        required_matches = required_counts[slots]
+        preferred_matches = preferred_counts[slots]
+        n_required = index.required_count[slots]
+        n_preferred = index.preferred_count[slots]
+        experience_code = index.experience_code[slots]
+        remote_code = index.remote_code[slots]
+        title_flags = index.title_flags[slots]
+        culture_high = index.culture_high[slots]
+        culture_medium = index.culture_medium[slots]
+        growth = index.growth_score[slots]
+        compensation = index.compensation[slots]
+        job_vectors = index.semantic_vectors[slots] if profile.resume_vector is not None else None
+        job_ids = index.job_ids[slots]
+        experience_codes = dict(index.experience_codes)
+        remote_codes = dict(index.remote_codes)
+
+    # Skill coverage (70% required, 30% preferred)
+    required_score = np.divide(
+        required_matches, n_required, out=np.zeros(len(slots)), where=n_required > 0
+    )
+    preferred_score = np.divide(
+        preferred_matches, n_preferred, out=np.zeros(len(slots)), where=n_preferred > 0
+    )
+    skill_score = ((required_score * 0.7) + (preferred_score * 0.3)) * 100
+
+    # Experience distance
+    years_by_code = np.zeros(max(len(experience_codes), 1))
+    for level, code in experience_codes.items():
+        years_by_code[code] = EXPERIENCE_YEARS.get(level, 0)
+    user_years = EXPERIENCE_YEARS.get(profile.experience_level, 0)
+    job_years = years_by_code[experience_code]
+    distance = np.abs(user_years - job_years)
+    experience_match = np.where(
+        distance <= 1, 1.0,
+        np.where(distance <= 2, 0.7, np.where(user_years > job_years, 0.5, 0.3))
+    )
+
+    # Location and career-interest bonuses
+    preferred_remote = [remote_codes[pref.lower()] for pref in profile.location_preferences if pref.lower() in remote_codes]
+    location_bonus = np.where(np.isin(remote_code, preferred_remote), 10, 0)
+    interest_mask = sum(
+        1 << bit for bit, trigger in enumerate(INTEREST_TRIGGERS) if trigger in profile.career_interests
+    )
+    interest_bonus = np.where((title_flags & interest_mask) != 0, 15, 0)
+
+    preliminary_score = skill_score * 0.6 + experience_match * 100 * 0.25 + location_bonus + interest_bonus
+
+    # Culture fit: only the "high"/"medium" labels of the culture analysis are compared to preferences
+    preferences = profile.culture_preferences or DEFAULT_CULTURE_PREFERENCES
+    wants_high = preferences.count("high")
+    wants_medium = preferences.count("medium")
+    overlaps = culture_high * (wants_high > 0) + culture_medium * (wants_medium > 0)
+    gaps = len(preferences) - wants_high * (culture_high > 0) - wants_medium * (culture_medium > 0)
+    culture = np.clip(60 + overlaps * 10 - gaps * 5, 30, 95)
+
+    # Weighted breakdown, mirroring calculate_score_breakdown term by term
+    skills = np.minimum(100, skill_score)
+    experience = np.where(
+        experience_match == 1.0, _EXPERIENCE_PERCENT[1.0],
+        np.where(experience_match == 0.7, _EXPERIENCE_PERCENT[0.7],
+                 np.where(experience_match == 0.5, _EXPERIENCE_PERCENT[0.5], _EXPERIENCE_PERCENT[0.3]))
+    )
+    semantic = None
+    if job_vectors is None:
+        total = np.minimum(100, python_round_1(
+            skills * 0.45 + experience * 0.2 + culture * 0.15 + growth * 0.1 + compensation * 0.1
+        ))
+    else:
+        semantic = semantic_similarity(job_vectors, profile.resume_vector)
+        total = np.minimum(100, python_round_1(
+            skills * 0.35 + experience * 0.2 + culture * 0.15 + growth * 0.1 + compensation * 0.1 + semantic * 0.1
+        ))
+    match_score = python_round_1(np.minimum(
+        100, total + np.where(location_bonus > 0, 5, 0) + np.minimum(5, interest_bonus)
+    ))
+
+    return MatchScores(
+        job_ids=job_ids,
+        required_matches=required_matches,
+        preferred_matches=preferred_matches,
+        skill_score=skill_score,
+        experience_match=experience_match,
+        location_bonus=location_bonus,
+        interest_bonus=interest_bonus,
+        preliminary_score=preliminary_score,
+        skills=skills,
+        experience=experience,
+        culture=culture,
+        growth=growth,
+        compensation=compensation,
+        total=total,
+        match_score=match_score,
+        semantic=semantic,
+    )
@@ -0,0 +1,139 @@
+"""Sparse fieldsets for API responses.
+
+A SectionRegistry names the sections of a response and how to build each
+one from a per-request context object. Routers resolve the client's
+``fields=`` / ``include=`` selection against the registry and only the
+selected builders run; contexts use cached properties so work shared by
+several sections happens at most once, and only when one of them is asked
+for.
+
+Async endpoints build their sections with ``build_concurrently``: each
+section runs in a shared, bounded thread pool so the event loop stays free,
+and a section that fails or exceeds its timeout is replaced by its
+empty-state value instead of failing the response. Sections must not touch
+the database session from the pool; contexts load their rows up front.
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+SectionBuilder = Callable[[Any], Any]
+
+SECTION_WORKERS = int(os.getenv("SECTION_WORKERS", "4"))
+SECTION_TIMEOUT_SECONDS = float(os.getenv("SECTION_TIMEOUT_SECONDS", "5"))
+
+section_executor = ThreadPoolExecutor(max_workers=SECTION_WORKERS, thread_name_prefix="sections")
+
+
+@dataclass
+class SectionRun:
+    """Built sections plus how long each took and which ones fell back to their empty state"""
+
+    values: Dict[str, Any] = field(default_factory=dict)
+    seconds: Dict[str, float] = field(default_factory=dict)
+    degraded: Dict[str, str] = field(default_factory=dict)  # section -> "timeout" or "error"
+
+    def server_timing(self) -> str:
+        """``Server-Timing`` header value, one metric per section in milliseconds"""
+        metrics = []
+        for name, seconds in self.seconds.items():
+            metric = f"{name};dur={seconds * 1000:.1f}"
+            if name in self.degraded:
+                metric += f';desc="{self.degraded[name]}"'
+            metrics.append(metric)
+        return ", ".join(metrics)
+
+
+class SectionRegistry:
+    """Ordered name -> builder map for one response shape"""
+
+    def __init__(self, sections: Iterable[Tuple[str, SectionBuilder]] = ()):
+        self._builders: Dict[str, SectionBuilder] = dict(sections)
+
+    def section(self, name: str) -> Callable[[SectionBuilder], SectionBuilder]:
+        """Decorator registering ``builder(context)`` as the section ``name``"""
+        def register(builder: SectionBuilder) -> SectionBuilder:
+            self._builders[name] = builder
+            return builder
+        return register
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._builders)
+
+    def select(self, *selections: Optional[str]) -> List[str]:
+        """Sections named in comma-separated ``fields=`` / ``include=`` values.
+
+        Every section is selected when no value is given. Raises ValueError
+        for unknown names.
+        """
+        requested = set()
+        given = False
+        for selection in selections:
+            if selection is None:
+                continue
+            given = True
+            requested.update(name.strip() for name in selection.split(",") if name.strip())
+        if not given:
+            return self.names
+
+        unknown = requested - set(self._builders)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        return [name for name in self._builders if name in requested]
+
+    def build(self, context: Any, names: Iterable[str]) -> Dict[str, Any]:
+        """Run the builders of ``names``, in registry order"""
+        wanted = set(names)
+        return {name: builder(context) for name, builder in self._builders.items() if name in wanted}
+
+    async def build_concurrently(
+        self,
+        context: Any,
+        names: Iterable[str],
+        fallbacks: Dict[str, Any],
+        timeout: float = SECTION_TIMEOUT_SECONDS,
+        executor: Optional[Executor] = None,
+    ) -> SectionRun:
+        """Run the builders of ``names`` in the section pool, values in registry order.
+
+        A section that raises or takes longer than ``timeout`` seconds
+        (queueing included) gets ``fallbacks[name]``. A timed-out builder is
+        not interrupted; it finishes in the background and its result is
+        dropped.
+        """
+        loop = asyncio.get_running_loop()
+        executor = executor or section_executor
+        wanted = set(names)
+
+        def timed(builder: SectionBuilder) -> Tuple[Any, float]:
+            started = time.perf_counter()
+            value = builder(context)
+            return value, time.perf_counter() - started
+
+        async def run(name: str) -> Tuple[str, Any, float, Optional[str]]:
+            started = time.perf_counter()
+            try:
+                value, seconds = await asyncio.wait_for(
+                    loop.run_in_executor(executor, timed, self._builders[name]), timeout
+                )
+                return name, value, seconds, None
+            except asyncio.TimeoutError:
+                print(f"Warning: Section {name} timed out after {timeout}s")
+                return name, fallbacks[name], time.perf_counter() - started, "timeout"
+            except Exception as e:
+                print(f"Warning: Section {name} failed: {e}")
+                return name, fallbacks[name], time.perf_counter() - started, "error"
+
+        section_run = SectionRun()
+        results = await asyncio.gather(*(run(name) for name in self._builders if name in wanted))
+        for name, value, seconds, failure in results:
+            section_run.values[name] = value
+            section_run.seconds[name] = seconds
+            if failure:
+                section_run.degraded[name] = failure
+        return section_run
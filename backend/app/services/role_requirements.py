@@ -0,0 +1,109 @@
+"""Skills each role requires, compiled into bitsets.
+
+Role definitions come from ``role_requirements.json``. At startup every
+required skill gets a bit, keyed by its canonical skill id, and each role
+becomes a packed bitset of its skills (one row of ``masks``). A user's
+skills become a bitset over the same bits, so aliases ("python", "ReactJS")
+count as the skill they stand for, the overlap with every role at once is
+one AND and a popcount per row, and the union of several roles'
+requirements is one OR.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.services.skill_canonicalizer import skill_canonicalizer
+
+DEFAULT_ROLE_REQUIREMENTS_PATH = Path(__file__).resolve().parent.parent / "data" / "role_requirements.json"
+
+# Set bits of every byte value
+_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.int64)
+
+
+class RoleRequirements:
+    """Required skills of every known role as rows of packed bits"""
+
+    def __init__(self, role_skills: Dict[str, List[str]], version: int = 0):
+        self.version = version
+        self.roles = list(role_skills)
+        self._role_index = {role: i for i, role in enumerate(self.roles)}
+        self._skills = {role: list(skills) for role, skills in role_skills.items()}
+        # canonical skill id -> bit; skill_names[bit] is the first spelling the roles use
+        self._bit: Dict[int, int] = {}
+        self.skill_names: List[str] = []
+        for skills in role_skills.values():
+            for skill in skills:
+                skill_id = skill_canonicalizer.skill_id(skill)
+                if skill_id not in self._bit:
+                    self._bit[skill_id] = len(self.skill_names)
+                    self.skill_names.append(skill)
+        self._role_bits = {
+            role: [self._bit[skill_canonicalizer.skill_id(skill)] for skill in skills]
+            for role, skills in role_skills.items()
+        }
+
+        required = np.zeros((len(self.roles), len(self.skill_names)), dtype=bool)
+        for role, bits in self._role_bits.items():
+            required[self._role_index[role], bits] = True
+        self.masks = np.packbits(required, axis=1)
+        self.sizes = required.sum(axis=1)
+        self._empty = np.zeros(self.masks.shape[1], dtype=np.uint8)
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_ROLE_REQUIREMENTS_PATH) -> "RoleRequirements":
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data["roles"], data["version"])
+
+    def __contains__(self, role: str) -> bool:
+        return role in self._role_index
+
+    def skills(self, role: str) -> List[str]:
+        """Required skills of a role; none for unknown roles"""
+        return self._skills.get(role, [])
+
+    def bit(self, skill_name: str) -> Optional[int]:
+        """Bit of a skill (or any alias of it), or None if no role requires it"""
+        return self._bit.get(skill_canonicalizer.skill_id(skill_name))
+
+    def bits(self, role: str) -> List[int]:
+        """Bits of a role's required skills, in the role's order"""
+        return self._role_bits.get(role, [])
+
+    def mask(self, skill_names: Iterable[str]) -> np.ndarray:
+        """Bitset of the given skills; skills no role requires are left out"""
+        bits = np.zeros(len(self.skill_names), dtype=bool)
+        bits[[bit for bit in map(self.bit, skill_names) if bit is not None]] = True
+        return np.packbits(bits)
+
+    def role_mask(self, role: str) -> np.ndarray:
+        index = self._role_index.get(role)
+        return self.masks[index] if index is not None else self._empty
+
+    def held(self, role: str, mask: np.ndarray) -> List[bool]:
+        """For each required skill of the role, whether the mask has it"""
+        bits = np.unpackbits(mask, count=len(self.skill_names))
+        return [bool(bits[bit]) for bit in self.bits(role)]
+
+    def missing(self, roles: Iterable[str], mask: np.ndarray) -> List[str]:
+        """Skills any of the roles requires that the mask lacks, in bit order"""
+        required = np.bitwise_or.reduce([self._empty, *(self.role_mask(role) for role in roles)])
+        bits = np.unpackbits(required & ~mask, count=len(self.skill_names))
+        return [self.skill_names[bit] for bit in np.flatnonzero(bits)]
+
+    def overlap_counts(self, mask: np.ndarray) -> np.ndarray:
+        """Number of each role's required skills the mask has, for all roles in one pass"""
+        return _POPCOUNT[self.masks & mask].sum(axis=1)
+
+    def rank(self, mask: np.ndarray, limit: Optional[int] = None) -> List[str]:
+        """Roles by the share of their required skills the mask has, best first (file order on ties)"""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            overlap = np.where(self.sizes > 0, self.overlap_counts(mask) / self.sizes, 0.0)
+        order = np.argsort(-overlap, kind="stable")
+        return [self.roles[index] for index in order[:limit].tolist()]
+
+
+role_requirements = RoleRequirements.load()
@@ -0,0 +1,83 @@
+"""Free-text salary parsing.
+
+Job salaries arrive as text ("$120k - $180k base + equity", "€45-55/hour").
+They are parsed once when a job is written into numeric ``salary_min`` /
+``salary_max`` columns, annualized so ranges are comparable and filterable,
+plus the currency and the pay period the posting used.
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from app.models.job import Job
+
+CURRENCY_SYMBOLS = {"$": "USD", "€": "EUR", "£": "GBP", "₹": "INR", "¥": "JPY"}
+CURRENCY_CODES = {"USD", "EUR", "GBP", "CAD", "AUD", "INR", "JPY", "CHF", "SEK"}
+
+# Pay period -> periods per year, used to annualize amounts
+PERIODS_PER_YEAR = {"year": 1, "month": 12, "week": 52, "day": 260, "hour": 2080}
+_PERIOD_PATTERNS: List[Tuple[str, re.Pattern]] = [
+    ("hour", re.compile(r"/\s*h(ou)?r\b|\bper\s+hour\b|\bhourly\b|\ban?\s+hour\b", re.IGNORECASE)),
+    ("day", re.compile(r"/\s*day\b|\bper\s+day\b|\bdaily\b", re.IGNORECASE)),
+    ("week", re.compile(r"/\s*w(ee)?k\b|\bper\s+week\b|\bweekly\b", re.IGNORECASE)),
+    ("month", re.compile(r"/\s*mo(nth)?\b|\bper\s+month\b|\bmonthly\b", re.IGNORECASE)),
+]
+
+_AMOUNT = r"[$€£₹¥]?\s*\d[\d,]*(?:\.\d+)?\s*[kKmM]?(?![\w])"
+_RANGE = re.compile(rf"(?P<low>{_AMOUNT})(?:\s*(?:-|–|—|to)\s*(?P<high>{_AMOUNT}))?")
+_AMOUNT_PARTS = re.compile(r"(?P<symbol>[$€£₹¥])?\s*(?P<number>[\d,.]+)\s*(?P<suffix>[kKmM])?")
+_CODE = re.compile(r"\b(" + "|".join(sorted(CURRENCY_CODES)) + r")\b")
+_MULTIPLIERS = {"k": 1_000, "m": 1_000_000}
+
+
+@dataclass(frozen=True)
+class ParsedSalary:
+    min: Optional[int] = None  # annualized
+    max: Optional[int] = None  # annualized
+    currency: Optional[str] = None
+    period: Optional[str] = None  # pay period as posted: year, month, week, day, hour
+
+
+def _amount(text: str) -> Tuple[Optional[str], float, Optional[str]]:
+    parts = _AMOUNT_PARTS.match(text.strip())
+    number = float(parts.group("number").replace(",", ""))
+    return parts.group("symbol"), number, (parts.group("suffix") or "").lower() or None
+
+
+@lru_cache(maxsize=8192)
+def parse_salary(text: str) -> ParsedSalary:
+    """Parse the first salary amount or range in a string; unknown parts come back as None"""
+    if not text:
+        return ParsedSalary()
+
+    for match in _RANGE.finditer(text):
+        low = _amount(match.group("low"))
+        high = _amount(match.group("high")) if match.group("high") else low
+        symbol = low[0] or high[0]
+        # Bare small numbers are years, counts or bullet numbers, not pay
+        if symbol or low[2] or high[2] or low[1] >= 1000:
+            break
+    else:
+        return ParsedSalary()
+
+    # "$120-180k": a trailing suffix also applies to the bare first number
+    low_suffix = low[2] or (high[2] if low[1] < high[1] else None)
+    values = [low[1] * _MULTIPLIERS.get(low_suffix or "", 1), high[1] * _MULTIPLIERS.get(high[2] or "", 1)]
+
+    code = _CODE.search(text)
+    currency = code.group(1) if code else CURRENCY_SYMBOLS.get(symbol) if symbol else None
+
+    period = next((name for name, pattern in _PERIOD_PATTERNS if pattern.search(text)), "year")
+    per_year = PERIODS_PER_YEAR[period]
+    return ParsedSalary(round(min(values) * per_year), round(max(values) * per_year), currency, period)
+
+
+def apply_parsed_salary(job: Job) -> None:
+    """Store the parsed salary of a Job row in its numeric salary columns"""
+    parsed = parse_salary(job.salary or "")
+    job.salary_min = parsed.min
+    job.salary_max = parsed.max
+    job.salary_currency = parsed.currency
+    job.salary_period = parsed.period
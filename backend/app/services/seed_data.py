@@ -9,6 +9,7 @@ from app.models.community import (
     QuestionStatus, CohortRole, SquadRole
 )
 from app.models.user import User
+from app.models.job import Job
 
 
 def seed_community_data(db: Session):
@@ -223,3 +224,98 @@ def seed_community_data(db: Session):
     }
 
 
+
+
+# Starter job catalog used until real feeds are imported
+SAMPLE_JOBS = [
+    {
+        "title": "Senior Frontend Developer",
+        "company": "TechCorp",
+        "headline": "Scale design systems and motion for a product that ships weekly.",
+        "description": "We're looking for a senior frontend developer to join our team and evolve our design system, micro-interactions, and accessibility story across millions of users.",
+        "location": "San Francisco, CA / Remote",
+        "salary": "$120k - $180k base + equity",
+        "job_type": "Full-time",
+        "remote_status": "Remote",
+        "experience_level": "Senior Level",
+        "required_skills": ["React", "TypeScript", "JavaScript", "CSS"],
+        "preferred_skills": ["Next.js", "GraphQL", "AWS"],
+        "benefits": ["Health insurance", "401k", "Remote work", "Learning budget"],
+        "posted_at": "2024-01-15",
+        "source": "LinkedIn",
+        "company_stage": "Series C",
+        "team_size": 180,
+        "culture_values": ["fast_paced", "innovative", "collaborative"],
+        "growth_signals": {
+            "revenue_growth": 0.32,
+            "headcount_growth": 0.18,
+            "runway_months": 30
+        }
+    },
+    {
+        "title": "Full Stack Engineer",
+        "company": "StartupXYZ",
+        "headline": "Own product verticals end-to-end in a hungry, product-led startup.",
+        "description": "Join our fast-growing startup as a full stack engineer owning customer-facing features, experimentation, and shipping impact weekly.",
+        "location": "New York, NY",
+        "salary": "$90k - $140k + equity",
+        "job_type": "Full-time",
+        "remote_status": "Hybrid",
+        "experience_level": "Mid Level",
+        "required_skills": ["JavaScript", "Node.js", "React", "SQL"],
+        "preferred_skills": ["Docker", "AWS", "MongoDB"],
+        "benefits": ["Equity", "Health insurance", "Flexible hours"],
+        "posted_at": "2024-01-10",
+        "source": "Indeed",
+        "company_stage": "Series B",
+        "team_size": 85,
+        "culture_values": ["collaborative", "growth_focused", "innovative"],
+        "growth_signals": {
+            "revenue_growth": 0.24,
+            "headcount_growth": 0.22,
+            "runway_months": 24
+        }
+    },
+    {
+        "title": "Junior Web Developer",
+        "company": "Digital Agency",
+        "headline": "Ship high-visibility client work while you build your stack.",
+        "description": "Looking for junior developers to work on exciting client projects, landing pages, and interactive experiences across multiple industries.",
+        "location": "Austin, TX",
+        "salary": "$60k - $80k",
+        "job_type": "Full-time",
+        "remote_status": "On-site",
+        "experience_level": "Entry Level",
+        "required_skills": ["HTML", "CSS", "JavaScript"],
+        "preferred_skills": ["React", "WordPress", "SEO"],
+        "benefits": ["Training program", "Health insurance"],
+        "posted_at": "2024-01-12",
+        "source": "Company website",
+        "company_stage": "Private",
+        "team_size": 45,
+        "culture_values": ["structured", "collaborative", "client_service"],
+        "growth_signals": {
+            "revenue_growth": 0.12,
+            "headcount_growth": 0.1,
+            "runway_months": 18
+        }
+    }
+]
+
+
+def seed_job_data(db: Session):
+    """Seed the starter job catalog when the jobs table is empty"""
+    if db.query(Job).count() == 0:
+        for j_data in SAMPLE_JOBS:
+            job = Job(
+                **{key: value for key, value in j_data.items() if key != "posted_at"},
+                posted_at=datetime.strptime(j_data["posted_at"], "%Y-%m-%d"),
+                is_active=True
+            )
+            db.add(job)
+        
+        db.commit()
+    
+    return {
+        "jobs_seeded": db.query(Job).count()
+    }
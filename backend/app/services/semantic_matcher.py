@@ -0,0 +1,148 @@
+"""Hashed TF-IDF vectors for job and resume text.
+
+Terms (words and word bigrams) are hashed twice: into a large table of
+document frequencies for the IDF, and with a random sign into a small dense
+vector (the hashing trick), so no vocabulary is kept and every vector is a
+fixed-size float32 array. Job vectors live as a column of the job index;
+cosine similarity is then one matrix-vector product over the index.
+
+Document frequencies follow the catalog incrementally: a job's vector uses
+the frequencies at the time it was indexed, and a rebuild re-weights all
+jobs against the same frequencies.
+"""
+
+import hashlib
+import re
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator
+
+import numpy as np
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+
+from app.models.assessment import Assessment
+from app.models.user import Resume
+
+SEMANTIC_DIMENSIONS = 256
+_DF_BUCKETS = 1 << 18
+
+_WORD = re.compile(r"[a-z0-9+#]+")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it", "of", "on",
+    "or", "our", "that", "the", "this", "to", "we", "will", "with", "you", "your",
+}
+
+
+@dataclass
+class AnalyzedText:
+    """Distinct hashed terms of one text and their sublinear term frequencies"""
+
+    buckets: np.ndarray  # document-frequency bucket per term
+    dims: np.ndarray  # vector dimension per term
+    weights: np.ndarray  # signed 1 + log(count) per term
+
+
+@lru_cache(maxsize=1 << 17)
+def _term_hash(term: str) -> int:
+    return int.from_bytes(hashlib.blake2b(term.encode(), digest_size=8).digest(), "little")
+
+
+def analyze(text: str) -> AnalyzedText:
+    words = [word for word in _WORD.findall(text.lower()) if len(word) > 1 and word not in _STOPWORDS]
+    terms = Counter(words)
+    terms.update(f"{first} {second}" for first, second in zip(words, words[1:]))
+
+    hashes = np.fromiter((_term_hash(term) for term in terms), dtype=np.uint64, count=len(terms))
+    counts = np.fromiter(terms.values(), dtype=np.float64, count=len(terms))
+    signs = np.where((hashes >> np.uint64(63)) == 1, -1.0, 1.0)
+    return AnalyzedText(
+        buckets=(hashes % np.uint64(_DF_BUCKETS)).astype(np.int64),
+        dims=((hashes >> np.uint64(32)) % np.uint64(SEMANTIC_DIMENSIONS)).astype(np.int64),
+        weights=signs * (1 + np.log(counts)),
+    )
+
+
+class HashedTfidfVectorizer:
+    """Document frequencies of the indexed corpus, and the TF-IDF transform over them"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.df = np.zeros(_DF_BUCKETS, dtype=np.int32)
+        self.documents = 0
+
+    def add_document(self, text: AnalyzedText) -> None:
+        self.df[np.unique(text.buckets)] += 1
+        self.documents += 1
+
+    def remove_document(self, text: AnalyzedText) -> None:
+        self.df[np.unique(text.buckets)] -= 1
+        self.documents -= 1
+
+    def transform(self, text: AnalyzedText) -> np.ndarray:
+        """L2-normalized float32 vector; all zeros for text without terms"""
+        idf = np.log((1 + self.documents) / (1 + self.df[text.buckets])) + 1
+        vector = np.bincount(text.dims, weights=text.weights * idf, minlength=SEMANTIC_DIMENSIONS)
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm > 0 else vector).astype(np.float32)
+
+
+def job_text(job: Dict[str, Any]) -> str:
+    return " ".join([
+        job.get("title") or "",
+        " ".join(job.get("required_skills") or []),
+        " ".join(job.get("preferred_skills") or []),
+        job.get("requirements") or "",
+        job.get("description") or "",
+    ])
+
+
+def _strings(value: Any) -> Iterator[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _strings(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _strings(item)
+
+
+def resume_text(content: Dict[str, Any]) -> str:
+    """Every string in a resume's JSON content, in document order"""
+    return " ".join(_strings(content or {}))
+
+
+def load_resume_vectors(db: Session, user_ids: Iterable[int], vectorizer: HashedTfidfVectorizer) -> Dict[int, np.ndarray]:
+    """Vector of each user's most recent active resume; users without one are left out"""
+    user_ids = list(user_ids)
+    if not user_ids:
+        return {}
+    resumes = (
+        db.query(Resume)
+        .filter(Resume.user_id.in_(user_ids), Resume.is_active.isnot(False))
+        .order_by(Resume.user_id, Resume.updated_at, Resume.id)
+        .all()
+    )
+    latest = {resume.user_id: resume for resume in resumes}
+    vectors = {}
+    for user_id, resume in latest.items():
+        vector = vectorizer.transform(analyze(resume_text(resume.content)))
+        if vector.any():
+            vectors[user_id] = vector
+    return vectors
+
+
+@event.listens_for(Resume, "after_insert")
+@event.listens_for(Resume, "after_update")
+@event.listens_for(Resume, "after_delete")
+def _invalidate_matches_on_resume_change(mapper, connection, target: Resume) -> None:
+    """Resume text feeds the semantic match score, so the user's matches go stale"""
+    connection.execute(
+        update(Assessment.__table__)
+        .where(Assessment.__table__.c.user_id == target.user_id)
+        .values(matches_version=None)
+    )
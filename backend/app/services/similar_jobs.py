@@ -0,0 +1,288 @@
+"""Similar-job lookup with MinHash signatures and LSH banding.
+
+Each job is reduced to two token sets, its canonical skill names and the word
+3-shingles of its description, and each set gets half of a MinHash
+signature so neither side drowns out the other. Signatures are cut into
+bands and every band is hashed into a bucket; jobs sharing at least one
+bucket are candidates, ranked by their estimated Jaccard similarity. A
+lookup therefore touches a handful of buckets instead of the whole catalog.
+
+The index follows committed Job writes through the job index session hooks
+and is snapshotted to disk (``SIMILAR_JOBS_SNAPSHOT``). On startup the
+snapshot is loaded and only jobs written since it was taken are re-hashed.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.job import Job
+from app.services.skill_canonicalizer import normalize_skill_key, skill_canonicalizer
+
+NUM_PERM = 64  # first half hashes the skills, second half the description shingles
+BANDS = 16
+ROWS_PER_BAND = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+# Below this many jobs every job is a candidate; banding only pays off on larger catalogs
+BRUTE_FORCE_LIMIT = 2000
+SNAPSHOT_VERSION = 2
+
+SNAPSHOT_PATH = os.getenv("SIMILAR_JOBS_SNAPSHOT", "./similar_jobs.npz")
+
+_PRIME = (1 << 31) - 1
+_EMPTY = np.uint32(0xFFFFFFFF)  # signature value of an empty token set
+_HALF = NUM_PERM // 2
+
+# Fixed seed: signatures must stay comparable across processes and snapshots
+_rng = np.random.RandomState(20240611)
+_PERM_A = _rng.randint(1, _PRIME, size=NUM_PERM).astype(np.uint64)
+_PERM_B = _rng.randint(0, _PRIME, size=NUM_PERM).astype(np.uint64)
+
+_WORD = re.compile(r"[a-z0-9+#]+")
+
+
+def _token_hashes(tokens: Iterable[str]) -> np.ndarray:
+    """Stable 31-bit hashes; Python's own str hash is salted per process"""
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(token.encode(), digest_size=4).digest(), "little") % _PRIME for token in tokens),
+        dtype=np.uint64,
+    )
+
+
+def _minhash(tokens: Set[str], a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    if not tokens:
+        return np.full(len(a), _EMPTY, dtype=np.uint32)
+    hashes = _token_hashes(tokens)
+    return ((a[:, None] * hashes[None, :] + b[:, None]) % _PRIME).min(axis=1).astype(np.uint32)
+
+
+def job_tokens(job: Dict[str, Any]):
+    """(skill tokens, description shingles) of a job dict"""
+    # Skill ids of unlisted skills depend on what each process saw first; normalized
+    # canonical names are the same everywhere, so snapshots survive restarts
+    skills = {
+        normalize_skill_key(name)
+        for name in skill_canonicalizer.canonical_list(list(job["required_skills"]) + list(job["preferred_skills"]))
+    }
+    words = _WORD.findall((job.get("description") or "").lower())
+    if 0 < len(words) < SHINGLE_SIZE:
+        shingles = {" ".join(words)}
+    else:
+        shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    return skills, shingles
+
+
+def job_signature(job: Dict[str, Any]) -> np.ndarray:
+    skills, shingles = job_tokens(job)
+    return np.concatenate([
+        _minhash(skills, _PERM_A[:_HALF], _PERM_B[:_HALF]),
+        _minhash(shingles, _PERM_A[_HALF:], _PERM_B[_HALF:]),
+    ])
+
+
+def estimate_similarity(signature: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """Mean of the estimated skill and description Jaccard, one value per row of ``others``.
+
+    A half where either side has no tokens counts as zero similarity.
+    """
+    similarity = np.zeros(len(others), dtype=np.float64)
+    for half in (slice(0, _HALF), slice(_HALF, NUM_PERM)):
+        if signature[half][0] == _EMPTY:
+            continue
+        equal = (others[:, half] == signature[half]).mean(axis=1)
+        equal[others[:, half.start] == _EMPTY] = 0.0
+        similarity += equal / 2
+    return similarity
+
+
+def _band_keys(signature: np.ndarray) -> List[Optional[bytes]]:
+    """Bucket key of every band; bands of an empty half get no bucket"""
+    keys: List[Optional[bytes]] = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        keys.append(None if rows[0] == _EMPTY else rows.tobytes())
+    return keys
+
+
+class SimilarJobsIndex:
+    """Active job signatures plus one bucket table per LSH band"""
+
+    def __init__(self, snapshot_path: str = SNAPSHOT_PATH):
+        self.snapshot_path = snapshot_path
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._signatures: Dict[int, np.ndarray] = {}
+        self._buckets: List[Dict[bytes, Set[int]]] = [{} for _ in range(BANDS)]
+        self._watermark: Optional[datetime] = None
+        self._dirty = False
+        self._loaded = False
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def ensure_loaded(self, db: Session) -> None:
+        """Load the snapshot and catch up with the database, or build from scratch"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            if not self.load_snapshot():
+                self._reset()
+            self.catch_up(db)
+            self._loaded = True
+            self.save_snapshot()
+
+    def rebuild(self, db: Session) -> None:
+        with self._lock:
+            self._reset()
+            self.catch_up(db)
+            self._loaded = True
+
+    def catch_up(self, db: Session) -> int:
+        """Apply jobs written since the last sync; returns the number re-hashed.
+
+        Jobs that are no longer active are dropped, and active jobs that are
+        new or were updated at or after the watermark are (re)hashed.
+        """
+        # Imported here to avoid a circular import with the job index
+        from app.services.job_index import job_to_dict
+
+        with self._lock:
+            active_ids = {job_id for (job_id,) in db.query(Job.id).filter(Job.is_active.isnot(False))}
+            for job_id in set(self._signatures) - active_ids:
+                self._remove(job_id)
+
+            watermark = db.query(func.max(Job.updated_at)).scalar()
+            stale = active_ids - set(self._signatures)
+            if self._watermark is not None:
+                stale.update(
+                    job_id for (job_id,) in db.query(Job.id).filter(
+                        Job.is_active.isnot(False), Job.updated_at >= self._watermark
+                    )
+                )
+            stale_ids = sorted(stale)
+            for start in range(0, len(stale_ids), 500):
+                for job in db.query(Job).filter(Job.id.in_(stale_ids[start:start + 500])):
+                    self.upsert(job_to_dict(job))
+            self._watermark = watermark
+            return len(stale_ids)
+
+    def upsert(self, job: Dict[str, Any]) -> None:
+        """Insert or re-hash a job; inactive jobs are dropped"""
+        with self._lock:
+            self._remove(job["id"])
+            if job.get("is_active", True):
+                self._add(job["id"], job_signature(job))
+            self._dirty = True
+
+    def remove(self, job_id: int) -> None:
+        with self._lock:
+            self._remove(job_id)
+            self._dirty = True
+
+    def similar(self, job_id: int, k: int = 3) -> List[int]:
+        """Ids of the ``k`` jobs most similar to ``job_id``, most similar first"""
+        with self._lock:
+            signature = self._signatures.get(job_id)
+            if signature is None:
+                return []
+            if len(self._signatures) <= BRUTE_FORCE_LIMIT:
+                candidates = [other for other in self._signatures if other != job_id]
+            else:
+                found: Set[int] = set()
+                for band, key in enumerate(_band_keys(signature)):
+                    if key is not None:
+                        found.update(self._buckets[band].get(key, ()))
+                found.discard(job_id)
+                candidates = list(found)
+            if not candidates:
+                return []
+            others = np.stack([self._signatures[other] for other in candidates])
+
+        similarity = estimate_similarity(signature, others)
+        ids = np.array(candidates, dtype=np.int64)
+        # Most similar first, lower id on ties
+        order = np.lexsort((ids, -similarity))
+        return [int(ids[i]) for i in order[:k] if similarity[i] > 0]
+
+    def _add(self, job_id: int, signature: np.ndarray) -> None:
+        self._signatures[job_id] = signature
+        for band, key in enumerate(_band_keys(signature)):
+            if key is not None:
+                self._buckets[band].setdefault(key, set()).add(job_id)
+
+    def _remove(self, job_id: int) -> None:
+        signature = self._signatures.pop(job_id, None)
+        if signature is None:
+            return
+        for band, key in enumerate(_band_keys(signature)):
+            bucket = self._buckets[band].get(key) if key is not None else None
+            if bucket is not None:
+                bucket.discard(job_id)
+                if not bucket:
+                    del self._buckets[band][key]
+
+    def save_snapshot(self) -> None:
+        """Write signatures and the sync watermark to disk, atomically"""
+        with self._lock:
+            if not self._dirty and os.path.exists(self.snapshot_path):
+                return
+            ids = np.fromiter(self._signatures.keys(), dtype=np.int64, count=len(self._signatures))
+            signatures = (
+                np.stack(list(self._signatures.values())) if self._signatures
+                else np.zeros((0, NUM_PERM), dtype=np.uint32)
+            )
+            meta = {
+                "version": SNAPSHOT_VERSION,
+                "num_perm": NUM_PERM,
+                "bands": BANDS,
+                "watermark": self._watermark.isoformat() if self._watermark else None,
+            }
+            tmp_path = f"{self.snapshot_path}.tmp"
+            try:
+                with open(tmp_path, "wb") as f:
+                    np.savez(f, ids=ids, signatures=signatures, meta=np.array(json.dumps(meta)))
+                os.replace(tmp_path, self.snapshot_path)
+                self._dirty = False
+            except OSError as e:
+                print(f"Warning: Failed to save similar jobs snapshot: {e}")
+
+    def load_snapshot(self) -> bool:
+        """Replace the index with the snapshot on disk; False if there is no usable one"""
+        if not os.path.exists(self.snapshot_path):
+            return False
+        try:
+            with np.load(self.snapshot_path) as snapshot:
+                meta = json.loads(str(snapshot["meta"]))
+                ids = snapshot["ids"]
+                signatures = snapshot["signatures"]
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: Ignoring unreadable similar jobs snapshot: {e}")
+            return False
+        if (meta.get("version"), meta.get("num_perm"), meta.get("bands")) != (SNAPSHOT_VERSION, NUM_PERM, BANDS):
+            return False
+
+        with self._lock:
+            self._reset()
+            for job_id, signature in zip(ids.tolist(), signatures):
+                self._add(job_id, signature)
+            self._watermark = datetime.fromisoformat(meta["watermark"]) if meta["watermark"] else None
+        return True
+
+
+similar_jobs_index = SimilarJobsIndex()
@@ -0,0 +1,193 @@
+"""Skill canonicalization shared by every matcher.
+
+Raw skill strings ("React.js", "ReactJS", "react") are reduced to a
+normalized key and looked up in a compiled alias table that maps them to one
+small integer id per canonical skill. Job skills and user skills are stored
+under their canonical names at write time, and matchers compare ids.
+"""
+
+import re
+import threading
+from typing import Dict, Iterable, List, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.assessment import UserSkill
+from app.models.job import Job
+
+# Canonical skill name -> spellings that mean the same skill
+SKILL_ALIASES: Dict[str, List[str]] = {
+    "React": ["React.js", "ReactJS", "React JS"],
+    "React Native": ["ReactNative", "RN"],
+    "Next.js": ["NextJS", "Next JS"],
+    "Vue.js": ["Vue", "VueJS", "Vue JS"],
+    "Angular": ["AngularJS", "Angular.js", "Angular 2+"],
+    "Node.js": ["Node", "NodeJS", "Node JS"],
+    "JavaScript": ["JS", "ECMAScript", "ES6"],
+    "TypeScript": ["TS"],
+    "HTML": ["HTML5"],
+    "CSS": ["CSS3"],
+    "GraphQL": ["GQL"],
+    "Python": ["Python3", "Py"],
+    "Go": ["Golang"],
+    "Java": [],
+    "Rust": [],
+    "Ruby": [],
+    "PHP": [],
+    "C#": ["CSharp", "C Sharp"],
+    "C++": ["CPP"],
+    "Kotlin": [],
+    "Swift": [],
+    "Flutter": [],
+    "SQL": [],
+    "PostgreSQL": ["Postgres", "PSQL"],
+    "MongoDB": ["Mongo"],
+    "Redis": [],
+    "AWS": ["Amazon Web Services"],
+    "Azure": ["Microsoft Azure"],
+    "Docker": [],
+    "Kubernetes": ["K8s"],
+    "Terraform": [],
+    "DevOps": [],
+    "CI/CD": ["CICD", "Continuous Integration"],
+    "Machine Learning": ["ML"],
+    "AI": ["Artificial Intelligence"],
+    "TensorFlow": [],
+    "PyTorch": [],
+    "Data Science": [],
+    "Data Analysis": [],
+    "Big Data": [],
+    "Cybersecurity": ["Cyber Security"],
+    "Security": [],
+    "Encryption": [],
+    "Penetration Testing": ["Pentesting", "Pen Testing"],
+}
+
+_SEPARATORS = re.compile(r"[\s._\-/]+")
+
+
+def normalize_skill_key(raw: str) -> str:
+    """Case- and punctuation-insensitive key; keeps + and # (C++, C#)"""
+    return _SEPARATORS.sub("", raw.strip().lower())
+
+
+class SkillCanonicalizer:
+    """Maps raw skill strings to stable integer ids and canonical names.
+
+    Known skills get their ids from SKILL_ALIASES in declaration order;
+    skills outside the table are registered on first sight under their own
+    spelling, so equal keys still collapse to one id. Lookups of raw strings
+    are cached.
+    """
+
+    def __init__(self, aliases: Dict[str, List[str]] = SKILL_ALIASES):
+        self._lock = threading.Lock()
+        self._names: List[str] = []
+        self._ids_by_key: Dict[str, int] = {}
+        self._cache: Dict[str, int] = {}
+        for canonical, spellings in aliases.items():
+            skill_id = self._register(canonical)
+            for spelling in spellings:
+                self._ids_by_key.setdefault(normalize_skill_key(spelling), skill_id)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _register(self, name: str) -> int:
+        key = normalize_skill_key(name)
+        if key in self._ids_by_key:
+            return self._ids_by_key[key]
+        self._names.append(name)
+        self._ids_by_key[key] = len(self._names) - 1
+        return len(self._names) - 1
+
+    def skill_id(self, raw: str) -> int:
+        skill_id = self._cache.get(raw)
+        if skill_id is None:
+            with self._lock:
+                skill_id = self._ids_by_key.get(normalize_skill_key(raw))
+                if skill_id is None:
+                    skill_id = self._register(raw.strip())
+                self._cache[raw] = skill_id
+        return skill_id
+
+    def name(self, skill_id: int) -> str:
+        return self._names[skill_id]
+
+    def canonical(self, raw: str) -> str:
+        return self._names[self.skill_id(raw)]
+
+    def canonical_list(self, raws: Iterable[str]) -> List[str]:
+        """Canonical names in first-seen order, without duplicates"""
+        seen: Set[int] = set()
+        names = []
+        for raw in raws:
+            skill_id = self.skill_id(raw)
+            if skill_id not in seen:
+                seen.add(skill_id)
+                names.append(self._names[skill_id])
+        return names
+
+    def ids(self, raws: Iterable[str]) -> List[int]:
+        return [self.skill_id(raw) for raw in raws]
+
+    def id_set(self, raws: Iterable[str]) -> Set[int]:
+        return {self.skill_id(raw) for raw in raws}
+
+
+skill_canonicalizer = SkillCanonicalizer()
+
+
+@event.listens_for(Job, "before_insert")
+@event.listens_for(Job, "before_update")
+def _canonicalize_job_skills(mapper, connection, target: Job) -> None:
+    """Store job skills under their canonical names"""
+    for attribute in ("required_skills", "preferred_skills"):
+        skills = getattr(target, attribute)
+        if skills:
+            canonical = skill_canonicalizer.canonical_list(skills)
+            if canonical != list(skills):
+                setattr(target, attribute, canonical)
+
+
+@event.listens_for(UserSkill, "before_insert")
+@event.listens_for(UserSkill, "before_update")
+def _canonicalize_user_skill(mapper, connection, target: UserSkill) -> None:
+    """Store user skills under their canonical names"""
+    if target.skill_name:
+        canonical = skill_canonicalizer.canonical(target.skill_name)
+        if canonical != target.skill_name:
+            target.skill_name = canonical
+
+
+def canonicalize_user_skills(db: Session) -> int:
+    """Rename user skills saved before canonicalization; returns the number of rows changed.
+
+    A row that becomes a duplicate of another of the user's skills is
+    dropped, as saving an alias of a saved skill does.
+    """
+    renames: Dict[str, List[int]] = {}
+    duplicates: List[int] = []
+    current_user, seen = None, set()  # canonical names of the current user's rows so far
+    rows = db.query(UserSkill.id, UserSkill.user_id, UserSkill.skill_name).order_by(UserSkill.user_id, UserSkill.id)
+    for skill_id, user_id, name in rows.yield_per(1000):
+        if user_id != current_user:
+            current_user, seen = user_id, set()
+        canonical = skill_canonicalizer.canonical(name)
+        if canonical in seen:
+            duplicates.append(skill_id)
+            continue
+        seen.add(canonical)
+        if canonical != name:
+            renames.setdefault(canonical, []).append(skill_id)
+
+    for canonical, ids in renames.items():
+        for start in range(0, len(ids), 500):
+            db.query(UserSkill).filter(UserSkill.id.in_(ids[start:start + 500])).update(
+                {UserSkill.skill_name: canonical}, synchronize_session=False
+            )
+    for start in range(0, len(duplicates), 500):
+        db.query(UserSkill).filter(UserSkill.id.in_(duplicates[start:start + 500])).delete(synchronize_session=False)
+    db.commit()
+    return sum(len(ids) for ids in renames.values()) + len(duplicates)
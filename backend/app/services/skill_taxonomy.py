@@ -0,0 +1,141 @@
+"""Skill taxonomy shared by the career analytics.
+
+Every way the analytics group skills (market segments, role families, the
+in-demand skills checked for gaps) is a scheme of ``skill_taxonomy.json``.
+Categories carry ids fixed in the file, so they stay stable when
+categories are added or reordered.
+
+Each scheme is compiled once. Membership goes through canonical skill ids.
+Compound names ("Python scripting", "AWS Lambda") fall back to keyword
+containment, answered by an Aho-Corasick automaton over all of the
+scheme's keywords in one pass over the name, instead of one substring scan
+per keyword. Classifications are memoized.
+"""
+
+import json
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.services.skill_canonicalizer import skill_canonicalizer
+
+DEFAULT_TAXONOMY_PATH = Path(__file__).resolve().parent.parent / "data" / "skill_taxonomy.json"
+
+FALLBACK_CATEGORY = "General"
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton reporting the lowest-ranked keyword found in a text"""
+
+    def __init__(self, keywords: Dict[str, int]):
+        """keywords: keyword -> rank; a lower rank wins"""
+        self._goto: List[Dict[str, int]] = [{}]
+        self._best: List[Optional[int]] = [None]
+        for keyword, rank in keywords.items():
+            node = 0
+            for char in keyword:
+                if char not in self._goto[node]:
+                    self._goto.append({})
+                    self._best.append(None)
+                    self._goto[node][char] = len(self._goto) - 1
+                node = self._goto[node][char]
+            self._best[node] = rank if self._best[node] is None else min(self._best[node], rank)
+
+        # Breadth-first failure links (depth-one nodes fail to the root); each node also
+        # reports the best keyword ending at its suffixes
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                suffix_best = self._best[self._fail[child]]
+                if suffix_best is not None and (self._best[child] is None or suffix_best < self._best[child]):
+                    self._best[child] = suffix_best
+                queue.append(child)
+
+    def best_match(self, text: str) -> Optional[int]:
+        """Lowest rank of any keyword occurring in the text, None if none does"""
+        best = None
+        node = 0
+        for char in text:
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            rank = self._best[node]
+            if rank is not None and (best is None or rank < best):
+                best = rank
+        return best
+
+
+class TaxonomyScheme:
+    """One compiled grouping of skills into categories"""
+
+    def __init__(self, name: str, categories: List[Dict]):
+        self.name = name
+        self._ids = [category["id"] for category in categories]
+        if len(set(self._ids)) != len(self._ids):
+            raise ValueError(f"Duplicate category id in skill taxonomy scheme {name}")
+        self._names = {category["id"]: category["name"] for category in categories}
+        self._ids_by_name = {category["name"]: category["id"] for category in categories}
+        self._skills = {category["id"]: list(category["skills"]) for category in categories}
+
+        # Canonical skill id -> ids of the categories listing it, in scheme order
+        self._memberships: Dict[int, List[int]] = {}
+        keywords: Dict[str, int] = {}
+        for rank, category in enumerate(categories):
+            for skill in category["skills"]:
+                categories_of_skill = self._memberships.setdefault(skill_canonicalizer.skill_id(skill), [])
+                if category["id"] not in categories_of_skill:
+                    categories_of_skill.append(category["id"])
+                keywords.setdefault(skill.lower(), rank)
+        self._automaton = KeywordAutomaton(keywords)
+        self.classify = lru_cache(maxsize=4096)(self._classify)
+
+    @property
+    def category_ids(self) -> List[int]:
+        return list(self._ids)
+
+    def category_name(self, category_id: Optional[int]) -> str:
+        return self._names.get(category_id, FALLBACK_CATEGORY)
+
+    def category_id(self, category_name: str) -> Optional[int]:
+        return self._ids_by_name.get(category_name)
+
+    def skills(self, category_id: int) -> List[str]:
+        return list(self._skills.get(category_id, []))
+
+    def memberships(self, skill_name: str) -> List[int]:
+        """Ids of every category listing the skill, in scheme order"""
+        return list(self._memberships.get(skill_canonicalizer.skill_id(skill_name), []))
+
+    def _classify(self, skill_name: str) -> Optional[int]:
+        """First category listing the skill, else the first one whose keyword the name contains"""
+        categories = self._memberships.get(skill_canonicalizer.skill_id(skill_name))
+        if categories:
+            return categories[0]
+        rank = self._automaton.best_match(skill_name.lower())
+        return self._ids[rank] if rank is not None else None
+
+    def category_of(self, skill_name: str) -> str:
+        return self.category_name(self.classify(skill_name))
+
+
+class SkillTaxonomy:
+    """Every scheme of the taxonomy file, compiled"""
+
+    def __init__(self, path: Path = DEFAULT_TAXONOMY_PATH):
+        with open(path) as f:
+            data = json.load(f)
+        self.version: int = data["version"]
+        self.schemes = {name: TaxonomyScheme(name, scheme["categories"]) for name, scheme in data["schemes"].items()}
+
+    def __getitem__(self, scheme: str) -> TaxonomyScheme:
+        return self.schemes[scheme]
+
+
+skill_taxonomy = SkillTaxonomy()
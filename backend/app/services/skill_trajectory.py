@@ -0,0 +1,141 @@
+"""Five-year market trajectories of a user's skills.
+
+Complementary-skill bonuses come from a synergy matrix built once over
+the skills named in ``SYNERGIES``: a user's bonuses are one matrix-vector
+product with the indicator of the skills they hold. Value, demand, salary
+impact and automation risk are then projected for all skills and years as
+(skills x years) arrays.
+
+Projections only change when the user's skills do, so they are stored in
+``Assessment.skill_trajectory_predictions`` stamped with the assessment's
+``dashboard_version`` (bumped on every skill save), the projection year,
+``TRAJECTORY_VERSION`` and the skill taxonomy and market data versions;
+readers reuse them while the stamp matches.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.models.assessment import Assessment
+from app.services.market_data import MarketSnapshot
+from app.services.skill_taxonomy import skill_taxonomy
+
+TRAJECTORY_VERSION = 1
+TRAJECTORY_YEARS = 5
+
+# skill -> complementary skills; each one the user holds adds SYNERGY_STEP, up to MAX_SYNERGY_BONUS
+SYNERGIES = {
+    "React": ["JavaScript", "TypeScript", "HTML", "CSS"],
+    "Python": ["Machine Learning", "Data Science", "Django", "Flask"],
+    "AWS": ["Docker", "Kubernetes", "DevOps"],
+    "Docker": ["Kubernetes", "DevOps", "CI/CD"]
+}
+SYNERGY_STEP = 0.1
+MAX_SYNERGY_BONUS = 0.3
+
+AUTOMATION_RISK = {
+    "Manual Testing": 0.8,
+    "Basic HTML/CSS": 0.3,
+    "Data Entry": 0.9,
+    "React": 0.1,
+    "Machine Learning": 0.05,
+    "Cloud Architecture": 0.1,
+    "Cybersecurity": 0.05
+}
+DEFAULT_AUTOMATION_RISK = 0.2
+MAX_AUTOMATION_RISK = 0.95
+
+_YEAR_OFFSETS = np.arange(1, TRAJECTORY_YEARS + 1)
+
+
+class SynergyMatrix:
+    """matrix[i, j] is 1 when skill j complements skill i"""
+
+    def __init__(self, synergies: Dict[str, List[str]]):
+        names = sorted(set(synergies).union(*synergies.values()))
+        self.index = {name: i for i, name in enumerate(names)}
+        self.matrix = np.zeros((len(names), len(names)), dtype=np.float64)
+        for skill, complements in synergies.items():
+            self.matrix[self.index[skill], [self.index[name] for name in complements]] = 1
+
+    def bonuses(self, skill_names: Sequence[str]) -> np.ndarray:
+        """Synergy bonus of each skill given all of them are held"""
+        ids = np.array([self.index.get(name, -1) for name in skill_names], dtype=np.int64)
+        known = ids >= 0
+        held = np.zeros(len(self.index))
+        held[ids[known]] = 1
+        counts = np.zeros(len(ids))
+        counts[known] = self.matrix[ids[known]] @ held
+        return np.minimum(MAX_SYNERGY_BONUS, counts * SYNERGY_STEP)
+
+
+synergy_matrix = SynergyMatrix(SYNERGIES)
+
+
+@dataclass
+class TrajectoryProjection:
+    """Per-skill rows, per-year columns"""
+
+    years: List[int]
+    market_value: np.ndarray
+    demand_score: np.ndarray
+    salary_impact: np.ndarray
+    automation_risk: np.ndarray
+
+
+def project_trajectories(
+    skill_names: Sequence[str],
+    proficiency_levels: Sequence[str],
+    categories: Sequence[str],
+    current_year: int,
+    market: MarketSnapshot,
+) -> TrajectoryProjection:
+    """Project every skill over the next TRAJECTORY_YEARS years in one pass"""
+    trends = [market.segment_trend(category) for category in categories]
+    growth = np.array([trend["growth_rate"] for trend in trends], dtype=np.float64)
+    demand = np.array([trend["demand"] for trend in trends], dtype=np.float64)
+    premium = np.array([trend["salary_premium"] for trend in trends], dtype=np.int64)
+    # Only advanced skills carry market value today; it compounds with growth and synergies
+    current = np.array([level in ["Advanced", "Expert"] for level in proficiency_levels], dtype=np.float64)
+    base_risk = np.array([AUTOMATION_RISK.get(name, DEFAULT_AUTOMATION_RISK) for name in skill_names], dtype=np.float64)
+    rate = 1 + growth + synergy_matrix.bonuses(skill_names)
+
+    offsets = _YEAR_OFFSETS.astype(np.float64)
+    return TrajectoryProjection(
+        years=(current_year + _YEAR_OFFSETS).tolist(),
+        market_value=np.minimum(100, current[:, None] * rate[:, None] ** offsets * 100),
+        demand_score=np.minimum(100, demand[:, None] * (1 + offsets * 0.05)),
+        salary_impact=premium[:, None] * _YEAR_OFFSETS,
+        # Risk increases over time for routine skills
+        automation_risk=np.minimum(MAX_AUTOMATION_RISK, base_risk[:, None] * (1 + offsets * 0.1)),
+    )
+
+
+def stored_trajectories(assessment: Assessment, current_year: int, market: MarketSnapshot) -> Optional[Dict[str, Any]]:
+    """The assessment's stored predictions if they are still current"""
+    stored = assessment.skill_trajectory_predictions or {}
+    if (
+        stored.get("trajectory_version") == TRAJECTORY_VERSION
+        and stored.get("data_version") == (assessment.dashboard_version or 0)
+        and stored.get("year") == current_year
+        and stored.get("taxonomy_version") == skill_taxonomy.version
+        and stored.get("market_version") == market.version
+    ):
+        return stored.get("predictions")
+    return None
+
+
+def store_trajectories(
+    assessment: Assessment, predictions: Dict[str, Any], current_year: int, market: MarketSnapshot
+) -> None:
+    """Stamp and store predictions on the assessment; the caller commits"""
+    assessment.skill_trajectory_predictions = {
+        "trajectory_version": TRAJECTORY_VERSION,
+        "data_version": assessment.dashboard_version or 0,
+        "year": current_year,
+        "taxonomy_version": skill_taxonomy.version,
+        "market_version": market.version,
+        "predictions": predictions,
+    }
@@ -0,0 +1,68 @@
+"""Request-scoped user data for the career analytics.
+
+Dashboard and predictive endpoints run several CareerIntelligenceService
+analyses for the same user, and each used to re-query the user's
+assessment, skills, learning paths and job matches. A UserContext loads
+those rows once, with one query per table however many users are
+loaded, and is passed to every analysis of the request.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.assessment import Assessment, JobMatch, LearningPath, UserSkill
+
+
+@dataclass
+class UserContext:
+    """Everything the career analytics read about one user"""
+
+    user_id: int
+    assessment: Optional[Assessment] = None
+    skills: List[UserSkill] = field(default_factory=list)
+    learning_paths: List[LearningPath] = field(default_factory=list)
+    match_scores: List[float] = field(default_factory=list)  # of the user's materialized job matches
+
+    @property
+    def skill_levels(self) -> Dict[str, str]:
+        """skill name -> proficiency level"""
+        return {skill.skill_name: skill.proficiency_level for skill in self.skills}
+
+    @classmethod
+    def load(cls, db: Session, user_id: int, assessment: Optional[Assessment] = None) -> "UserContext":
+        """Context of one user; pass the assessment if the caller already has it"""
+        known = {user_id: assessment} if assessment is not None else None
+        return cls.load_many(db, [user_id], known)[user_id]
+
+    @classmethod
+    def load_many(
+        cls,
+        db: Session,
+        user_ids: Iterable[int],
+        assessments: Optional[Dict[int, Assessment]] = None,
+    ) -> Dict[int, "UserContext"]:
+        """Contexts of many users, one query per table; users without data get empty contexts"""
+        contexts = {user_id: cls(user_id) for user_id in user_ids}
+        if not contexts:
+            return contexts
+        ids = list(contexts)
+
+        if assessments is None:
+            # Oldest assessment first, the one Query.first() used to return
+            for assessment in db.query(Assessment).filter(Assessment.user_id.in_(ids)).order_by(Assessment.id):
+                if contexts[assessment.user_id].assessment is None:
+                    contexts[assessment.user_id].assessment = assessment
+        else:
+            for user_id, assessment in assessments.items():
+                contexts[user_id].assessment = assessment
+
+        for skill in db.query(UserSkill).filter(UserSkill.user_id.in_(ids)).order_by(UserSkill.id):
+            contexts[skill.user_id].skills.append(skill)
+        for path in db.query(LearningPath).filter(LearningPath.user_id.in_(ids)).order_by(LearningPath.id):
+            contexts[path.user_id].learning_paths.append(path)
+        scores = db.query(JobMatch.user_id, JobMatch.match_score).filter(JobMatch.user_id.in_(ids)).order_by(JobMatch.id)
+        for user_id, match_score in scores:
+            contexts[user_id].match_scores.append(match_score)
+        return contexts
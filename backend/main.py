@@ -25,23 +25,64 @@ async def lifespan(app: FastAPI):
     # Startup: Create database tables
     Base.metadata.create_all(bind=engine)
     
+    # Full-text job search table/index and its sync triggers
+    try:
+        from app.services.job_search import install_search_index
+        install_search_index(engine)
+    except Exception as e:
+        print(f"⚠️  Warning: Could not set up job search: {e}")
+    
+    # Rename user skills saved before skill canonicalization
+    try:
+        from app.core.database import SessionLocal
+        from app.services.skill_canonicalizer import canonicalize_user_skills
+        db = SessionLocal()
+        try:
+            changed = canonicalize_user_skills(db)
+            if changed:
+                print(f"✅ Canonicalized {changed} user skills")
+        finally:
+            db.close()
+    except Exception as e:
+        print(f"⚠️  Warning: Could not canonicalize user skills: {e}")
+    
     # Seed initial community data
     try:
         from app.core.database import SessionLocal
-        from app.services.seed_data import seed_community_data
+        from app.services.seed_data import seed_community_data, seed_job_data
         db = SessionLocal()
         try:
             result = seed_community_data(db)
             print(f"✅ Seeded community data: {result}")
         except Exception as e:
+            db.rollback()
             print(f"⚠️  Warning: Failed to seed community data: {e}")
+        try:
+            result = seed_job_data(db)
+            print(f"✅ Seeded job data: {result}")
+        except Exception as e:
+            db.rollback()
+            print(f"⚠️  Warning: Failed to seed job data: {e}")
         finally:
             db.close()
     except Exception as e:
         print(f"⚠️  Warning: Could not seed community data: {e}")
     
     yield
-    # Shutdown
+    # Shutdown: persist the similar-jobs index so the next start skips rehashing
+    try:
+        from app.services.similar_jobs import similar_jobs_index
+        if similar_jobs_index.loaded:
+            similar_jobs_index.save_snapshot()
+    except Exception as e:
+        print(f"⚠️  Warning: Could not save similar jobs index: {e}")
+    # ...and the benchmark histograms so the next start skips recounting users
+    try:
+        from app.services.benchmark_percentiles import benchmark_index
+        if benchmark_index.loaded:
+            benchmark_index.save_snapshot()
+    except Exception as e:
+        print(f"⚠️  Warning: Could not save benchmark index: {e}")
 
 app = FastAPI(
     title="JobEz Assessment Platform API",
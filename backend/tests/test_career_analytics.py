@@ -0,0 +1,319 @@
+from pathlib import Path
+import sys
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from app.core.database import Base
+from app.models import user, assessment, job, community  # noqa: F401 - register models
+from app.services import job_search  # noqa: F401 - installs the search index on create_all
+from app.services.seed_data import seed_job_data
+
+
+def get_test_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    return Session()
+
+
+def test_skill_trajectories_use_synergy_matrix_and_are_stored(monkeypatch):
+    from app.models.assessment import Assessment, UserSkill
+    from app.models.user import User
+    from app.services import career_intelligence
+    from app.services.career_intelligence import CareerIntelligenceService
+    from app.services.dashboard_cache import DashboardCache
+    from app.services.skill_trajectory import synergy_matrix
+
+    bonuses = synergy_matrix.bonuses(["Python", "Machine Learning", "Django", "Docker", "Kubernetes", "DevOps", "CI/CD", "Go"])
+    assert np.allclose(bonuses, [0.2, 0, 0, 0.3, 0, 0, 0, 0])
+
+    session = get_test_session()
+    try:
+        account = User(email="trajectory@example.com", hashed_password="x")
+        session.add(account)
+        session.flush()
+        session.add(Assessment(user_id=account.id, career_interests={}))
+        session.add_all([
+            UserSkill(user_id=account.id, skill_name=name, proficiency_level=level)
+            for name, level in [("Python", "Advanced"), ("Manual Testing", "Beginner"), ("Django", "Intermediate")]
+        ])
+        session.commit()
+
+        service = CareerIntelligenceService(session)
+        predictions = service.generate_skill_trajectory_predictions(account.id)
+        session.commit()
+        python = predictions["Python"]["trajectory"]
+        assert [year["salary_impact"] for year in python] == [25000, 50000, 75000, 100000, 125000]
+        assert python[0]["market_value"] == 100 and predictions["Django"]["trajectory"][0]["market_value"] == 0
+        manual = [year["automation_risk"] for year in predictions["Manual Testing"]["trajectory"]]
+        assert manual == pytest.approx([0.88, 0.95, 0.95, 0.95, 0.95])
+
+        # Stored predictions are served until a skill save bumps the data version
+        def fail(*args, **kwargs):
+            raise AssertionError("trajectories were recomputed")
+
+        monkeypatch.setattr(career_intelligence, "project_trajectories", fail)
+        assert service.generate_skill_trajectory_predictions(account.id) == predictions
+
+        monkeypatch.undo()
+        DashboardCache(shared_path=None).invalidate(session, account.id)
+        session.add(UserSkill(user_id=account.id, skill_name="Machine Learning", proficiency_level="Expert"))
+        session.commit()
+        refreshed = service.generate_skill_trajectory_predictions(account.id)
+        assert "Machine Learning" in refreshed and "Machine Learning" not in predictions
+    finally:
+        session.close()
+
+
+def test_taxonomy_automaton_agrees_with_keyword_scans():
+    from app.services.skill_taxonomy import KeywordAutomaton, skill_taxonomy
+
+    keywords = {"he": 3, "she": 1, "his": 2, "hers": 0, "e": 4}
+    automaton = KeywordAutomaton(keywords)
+    for text in ["ushers", "ahishe", "the", "xyz", "", "hhe", "sheer"]:
+        found = [rank for keyword, rank in keywords.items() if keyword in text]
+        assert automaton.best_match(text) == (min(found) if found else None)
+
+    segments = skill_taxonomy["market_segment"]
+    assert segments.category_of("React.js") == "Frontend"
+    assert segments.category_of("Python") == "AI/ML"  # listed twice, the first segment wins
+    assert segments.category_of("Python scripting") == "AI/ML"
+    assert segments.category_of("Spring Boot on Java") == "Backend"
+    assert segments.category_of("Underwater Basket Weaving") == "General"
+    assert segments.classify("AWS Lambda") == segments.category_id("Cloud/DevOps") == 2
+
+    roles = skill_taxonomy["role"]
+    assert [roles.category_name(category_id) for category_id in roles.memberships("Python")] == ["Backend", "Data"]
+    assert roles.memberships("Vue.js") == [roles.category_id("Frontend")]
+
+
+def test_market_data_hot_reloads_atomically(tmp_path):
+    import json
+    import os
+
+    from app.routers.dashboard import calculate_market_pulse
+    from app.services.market_data import DEFAULT_MARKET_DATA_PATH, MarketDataStore
+
+    with open(DEFAULT_MARKET_DATA_PATH) as f:
+        data = json.load(f)
+    path = tmp_path / "market_data.json"
+    path.write_text(json.dumps(data))
+    store = MarketDataStore(str(path), check_interval=0)
+
+    snapshot = store.current()
+    assert snapshot.version == data["version"]
+    assert snapshot.skill_figure("market_value", "ReactJS") == 95  # keyed by canonical skill id
+    assert snapshot.skill_figure("learning_hours", "Underwater Basket Weaving") == 60
+    with pytest.raises(TypeError):
+        snapshot.segment_trends["AI/ML"]["demand"] = 0
+
+    def rewrite(text):
+        mtime = os.stat(path).st_mtime_ns
+        path.write_text(text)
+        os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+
+    data["version"] = "next"
+    data["skills"]["React"]["market_value"] = 50
+    rewrite(json.dumps(data))
+    assert store.version == "next" and store.current().skill_figure("market_value", "React") == 50
+    assert snapshot.skill_figure("market_value", "React") == 95  # readers keep the snapshot they took
+
+    rewrite("{not json")
+    assert store.current().version == "next"
+
+    assessment = type("AssessmentRow", (), {"career_interests": {"experience_level": "Mid Level (2-5 years)"}})()
+    pulse = calculate_market_pulse({"React.js": "Advanced"}, assessment, store.current())
+    assert pulse["current_salary_premium"] == 8000 and pulse["salary_benchmark"]["avg"] == 100000
+    assert "React" not in [row["skill"] for row in pulse["opportunities"]]
+
+
+def test_malformed_market_data_keeps_the_current_snapshot(tmp_path):
+    import json
+    import os
+
+    from app.services.market_data import DEFAULT_MARKET_DATA_PATH, MarketDataStore
+
+    with open(DEFAULT_MARKET_DATA_PATH) as f:
+        data = json.load(f)
+    path = tmp_path / "market_data.json"
+    path.write_text(json.dumps(data))
+    store = MarketDataStore(str(path), check_interval=0)
+    snapshot = store.current()
+
+    def rewrite(text):
+        mtime = os.stat(path).st_mtime_ns
+        path.write_text(text)
+        os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+
+    incomplete = {key: value for key, value in data.items() if key != "skills"}
+    for text in ("", "{not json", "[]", json.dumps(incomplete), json.dumps({**data, "skills": ["React"]})):
+        rewrite(text)
+        assert not store.reload_if_changed()
+        assert store.current() is snapshot
+    # A bad file is not re-read until it changes again
+    assert not store.reload_if_changed()
+
+    path.unlink()
+    assert not store.reload_if_changed() and store.current() is snapshot
+
+    path.write_text(json.dumps({**data, "version": "fixed"}))
+    os.utime(path, ns=(10**18, 10**18))
+    assert store.reload_if_changed() and store.version == "fixed"
+
+
+def test_cohort_analytics_stream_matches_single_user_analytics(monkeypatch):
+    import json
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+    from sqlalchemy.pool import StaticPool
+
+    from app.core.database import get_db
+    from app.models.assessment import Assessment, JobMatch, LearningPath, UserSkill
+    from app.models.community import Cohort, CohortMembership
+    from app.models.user import User
+    from app.services.career_intelligence import CareerIntelligenceService
+    from main import app
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        seed_job_data(session)
+        users = [User(email=f"cohort{i}@example.com", hashed_password="x") for i in range(4)]
+        session.add_all(users)
+        session.flush()
+        senior, data, empty, unassessed = [account.id for account in users]
+        session.add(Assessment(user_id=senior, career_interests={
+            "career_interests": ["Technology"], "experience_level": "Senior Level (5+ years)"
+        }))
+        session.add(Assessment(user_id=data, career_interests={}, experience_level="Mid Level (2-5 years)"))
+        session.add(Assessment(user_id=empty, career_interests={}))
+        skills = {
+            senior: [("React", "Advanced"), ("TypeScript", "Expert"), ("Node.js", "Intermediate"),
+                     ("Leadership", "Advanced"), ("Manual Testing", "Beginner"), ("AWS", "Advanced")],
+            data: [("Python", "Advanced"), ("SQL", "Beginner"), ("Machine Learning", "Expert"), ("jQuery", "Beginner")],
+        }
+        session.add_all([
+            UserSkill(user_id=user_id, skill_name=name, proficiency_level=level)
+            for user_id, rows in skills.items() for name, level in rows
+        ])
+        session.add_all([LearningPath(user_id=senior, status=status) for status in ("completed", "completed", "in_progress")])
+        session.add_all([JobMatch(user_id=senior, job_id=job_id, match_score=score) for job_id, score in ((1, 70.5), (2, 91))])
+        cohort = Cohort(name="Coaching group", created_by=senior)
+        session.add(cohort)
+        session.flush()
+        session.add_all([CohortMembership(cohort_id=cohort.id, user_id=user_id) for user_id in (senior, empty, data)])
+        session.commit()
+
+        service = CareerIntelligenceService(session)
+
+        def single(user_id, target_role=None, target_roles=None):
+            return json.loads(json.dumps({
+                "promotion": service.calculate_promotion_probability(user_id, target_role),
+                "security": service.calculate_job_security_signals(user_id),
+                "pivot": service.calculate_pivot_readiness(user_id, target_roles),
+            }))
+
+        # All users' rows come from one query per table
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            results = list(service.calculate_cohort_analytics(
+                [data, unassessed, senior, empty], target_roles=["Data Scientist", "DevOps Engineer"], chunk_size=2
+            ))
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        assert len(statements) == 4
+        assert [user_id for user_id, _ in results] == [data, unassessed, senior, empty]
+        assert results[1][1] is None
+        for user_id, sections in results:
+            if sections is not None:
+                assert json.loads(json.dumps(sections)) == single(user_id, None, ["Data Scientist", "DevOps Engineer"])
+
+        monkeypatch.setitem(app.dependency_overrides, get_db, lambda: session)
+        response = TestClient(app).post(
+            "/api/predictive/analytics/cohort",
+            json={"user_ids": [unassessed, data], "cohort_id": cohort.id, "target_role": "Tech Lead"},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["user_id"] for line in lines] == [unassessed, data, senior, empty]
+        assert not lines[0]["has_assessment"] and lines[0]["promotion"]["target_role"] == "Tech Lead"
+        for line in lines[1:]:
+            assert line["has_assessment"]
+            assert {key: line[key] for key in ("promotion", "security", "pivot")} == single(line["user_id"], "Tech Lead")
+    finally:
+        session.close()
+
+
+def test_role_bitsets_rank_all_roles_like_list_scans():
+    import random
+
+    from app.models.assessment import Assessment, LearningPath, UserSkill
+    from app.models.user import User
+    from app.services.career_intelligence import CareerIntelligenceService
+    from app.services.role_requirements import RoleRequirements, role_requirements
+
+    rng = random.Random(25)
+    vocabulary = [f"Skill {i}" for i in range(120)]
+    roles = {f"Role {i}": rng.sample(vocabulary, rng.randint(1, 12)) for i in range(300)}
+    compiled = RoleRequirements(roles)
+    for _ in range(20):
+        held = rng.sample(vocabulary, rng.randint(0, 40)) + ["Unrequired skill"]
+        mask = compiled.mask(held)
+        expected = [sum(skill in held for skill in skills) for skills in roles.values()]
+        assert compiled.overlap_counts(mask).tolist() == expected
+        assert compiled.held("Role 7", mask) == [skill in held for skill in roles["Role 7"]]
+        picked = rng.sample(list(roles), 3)
+        assert set(compiled.missing(picked, mask)) == {s for role in picked for s in roles[role] if s not in held}
+        ratios = [count / len(skills) for count, skills in zip(expected, roles.values())]
+        assert compiled.rank(mask) == sorted(roles, key=lambda role: -ratios[int(role.split()[1])])
+    assert compiled.held("Unknown role", compiled.mask(vocabulary)) == []
+
+    # Bits are keyed by canonical skill id, so aliases of a required skill count as held
+    aliased = RoleRequirements({"Frontend": ["React", "JavaScript", "Node.js"]})
+    mask = aliased.mask(["ReactJS", "js", "python"])
+    assert aliased.held("Frontend", mask) == [True, True, False]
+    assert aliased.missing(["Frontend"], mask) == ["Node.js"]
+
+    service = CareerIntelligenceService(None)
+    for category in ["Frontend", "Backend", "DevOps", "Data", "General", "Other"]:
+        targets = service._suggest_pivot_targets(category, [])
+        assert targets and all(target in role_requirements for target in targets)
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        account = User(email="ranking@example.com", hashed_password="x")
+        session.add(account)
+        session.flush()
+        session.add(Assessment(user_id=account.id, career_interests={}))
+        session.add_all([
+            UserSkill(user_id=account.id, skill_name=name, proficiency_level="Advanced")
+            for name in ("Python", "SQL", "Machine Learning", "AWS", "Leadership")
+        ])
+        session.add(LearningPath(user_id=account.id, status="completed"))
+        session.commit()
+
+        service = CareerIntelligenceService(session)
+        ranking = service.rank_pivot_roles(account.id, limit=3)
+        assert ranking["roles_ranked"] == len(role_requirements.roles)
+        assert [row["target_role"] for row in ranking["rankings"]] == ["Data Scientist", "Full Stack Developer", "Backend Lead"]
+        # Every role scored alone agrees with the bitset ranking
+        readiness = service.calculate_pivot_readiness(account.id, role_requirements.roles)
+        assert ranking["rankings"] == readiness["pivot_analyses"][:3]
+        assert {gap["skill"] for gap in readiness["skill_gaps"]} <= set(role_requirements.skill_names)
+        assert "error" in service.rank_pivot_roles(account.id + 1)
+    finally:
+        session.close()
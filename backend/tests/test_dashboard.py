@@ -0,0 +1,286 @@
+from pathlib import Path
+import sys
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from app.core.database import Base
+from app.models import user, assessment, job, community  # noqa: F401 - register models
+from app.services import job_search  # noqa: F401 - installs the search index on create_all
+from app.services.seed_data import seed_job_data
+
+
+def get_test_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    return Session()
+
+
+def test_dashboard_cache_serves_until_user_data_changes(monkeypatch, tmp_path):
+    import asyncio
+
+    from app.models.assessment import Assessment
+    from app.models.user import User
+    from app.routers import dashboard
+    from app.services import assessment as assessment_service
+    from app.services.assessment import AssessmentService
+    from app.services import match_materializer
+    from app.services.dashboard_cache import DashboardCache
+    from app.services.job_index import JobIndex
+    from app.services.match_materializer import MatchMaterializer
+
+    cache = DashboardCache(max_entries=8, ttl_seconds=60, shared_path=str(tmp_path / "dashboard_cache.db"))
+    monkeypatch.setattr(dashboard, "dashboard_cache", cache)
+    monkeypatch.setattr(assessment_service, "dashboard_cache", cache)
+    monkeypatch.setattr(match_materializer, "dashboard_cache", cache)
+    built = []
+    monkeypatch.setattr(dashboard, "calculate_skill_gaps", lambda skills, assessment, market: built.append(dict(skills)) or {"skills": len(skills)})
+
+    session = get_test_session()
+    try:
+        account = User(email="cache@example.com", hashed_password="x")
+        session.add(account)
+        session.flush()
+        session.add(Assessment(user_id=account.id, career_interests={}))
+        session.commit()
+
+        def load():
+            return asyncio.run(dashboard.get_dashboard(str(account.id), fields="skill_gaps", include=None, db=session))
+
+        first = load()
+        assert load() == first and len(built) == 1
+
+        # Saving skills bumps the data version, so the next load recomputes
+        AssessmentService(session)._save_user_skills(account.id, {"React": "Advanced"})
+        assert load()["skill_gaps"] == {"skills": 1} and len(built) == 2
+
+        # Re-scored job matches feed the benchmarks, so they retire the entry too
+        MatchMaterializer(JobIndex()).replace_user_matches(session, [account.id], [])
+        assert load()["skill_gaps"] == {"skills": 1} and len(built) == 3
+
+        # Another worker with a cold local tier reads the shared one
+        cache._entries.clear()
+        assert load()["skill_gaps"] == {"skills": 1} and len(built) == 3
+        other_worker = DashboardCache(shared_path=cache.shared_path)
+        monkeypatch.setattr(dashboard, "dashboard_cache", other_worker)
+        assert load()["skill_gaps"] == {"skills": 1} and len(built) == 3
+    finally:
+        session.close()
+
+
+def test_dashboard_loads_user_rows_once_per_request(monkeypatch, tmp_path):
+    import asyncio
+
+    from sqlalchemy import event
+
+    from app.models.assessment import Assessment, JobMatch, LearningPath, UserSkill
+    from app.models.user import User
+    from app.routers import dashboard, predictive
+    from app.services.benchmark_percentiles import BenchmarkIndex
+    from app.services.career_intelligence import CareerIntelligenceService
+    from app.services.dashboard_cache import DashboardCache
+    from app.services.user_context import UserContext
+
+    monkeypatch.setattr(dashboard, "dashboard_cache", DashboardCache(shared_path=None))
+    session = get_test_session()
+    try:
+        seed_job_data(session)
+        users = [User(email=f"context{i}@example.com", hashed_password="x") for i in range(2)]
+        session.add_all(users)
+        session.flush()
+        for i, account in enumerate(users):
+            session.add(Assessment(user_id=account.id, career_interests={}, experience_level="Mid Level (2-5 years)"))
+            session.add_all([
+                UserSkill(user_id=account.id, skill_name=skill, proficiency_level="Advanced")
+                for skill in ["Python", "AWS", "Docker"][: i + 2]
+            ])
+            session.add_all([LearningPath(user_id=account.id, status="completed") for _ in range(1 - i)])
+            session.add(JobMatch(user_id=account.id, job_id=1, match_score=60 + i * 20))
+        session.commit()
+
+        contexts = UserContext.load_many(session, [account.id for account in users] + [999])
+        assert [len(contexts[account.id].skills) for account in users] == [2, 3]
+        assert [contexts[account.id].match_scores for account in users] == [[60], [80]]
+        assert [len(contexts[account.id].learning_paths) for account in users] == [1, 0]
+        assert contexts[999].assessment is None and contexts[999].skills == []
+
+        service = CareerIntelligenceService(session)
+        account = users[1]
+        assert service.calculate_promotion_probability(account.id, context=contexts[account.id]) == \
+            service.calculate_promotion_probability(account.id)
+
+        # Benchmark percentiles come from an index synced at most every few seconds
+        benchmarks = BenchmarkIndex(str(tmp_path / "benchmarks.npz"))
+        benchmarks.sync(session)
+        monkeypatch.setattr(dashboard, "benchmark_index", benchmarks)
+
+        user_id = str(account.id)
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(session.get_bind(), "before_cursor_execute", listener)
+        try:
+            result = asyncio.run(dashboard.get_dashboard(user_id, fields=None, include=None, db=session))
+            dashboard_queries = len(statements)
+            statements.clear()
+            analytics = asyncio.run(predictive.get_all_predictive_analytics(user_id, db=session))
+        finally:
+            event.remove(session.get_bind(), "before_cursor_execute", listener)
+
+        # The assessment, then skills, learning paths and match scores once each, then two rollup reads,
+        # then storing the freshly computed skill trajectories
+        assert dashboard_queries == 7
+        assert len(statements) == 4
+        assert result["benchmarks"]["user_metrics"]["avg_match_score"] == 80
+        assert analytics["has_assessment"] and analytics["promotion"]["score_breakdown"]["performance_score"] == 16
+    finally:
+        session.close()
+
+
+def test_sections_run_concurrently_and_degrade_to_empty_state():
+    import asyncio
+    import threading
+    import time
+
+    from app.services.response_sections import SectionRegistry
+
+    started = threading.Barrier(2, timeout=2)
+
+    def slow(ctx):
+        time.sleep(0.5)
+        return "late"
+
+    def broken(ctx):
+        raise RuntimeError("boom")
+
+    registry = SectionRegistry([
+        # Both wait for each other, so they only finish if they run at the same time
+        ("first", lambda ctx: started.wait() is not None and ctx["first"]),
+        ("second", lambda ctx: started.wait() is not None and ctx["second"]),
+        ("slow", slow),
+        ("broken", broken),
+    ])
+    fallbacks = {"first": 0, "second": 0, "slow": "empty", "broken": []}
+    run = asyncio.run(registry.build_concurrently({"first": 1, "second": 2}, registry.names, fallbacks, timeout=0.2))
+
+    assert run.values == {"first": 1, "second": 2, "slow": "empty", "broken": []}
+    assert list(run.values) == registry.names
+    assert run.degraded == {"slow": "timeout", "broken": "error"}
+    header = run.server_timing()
+    assert header.startswith("first;dur=") and 'slow;dur=' in header and 'desc="timeout"' in header
+
+
+def test_benchmark_percentiles_are_exact_and_incremental(tmp_path):
+    from app.models.assessment import Assessment, UserSkill
+    from app.models.user import User
+    from app.services.benchmark_percentiles import BenchmarkIndex, FenwickHistogram
+    from app.services.user_context import UserContext
+
+    def brute_force(values, value):
+        return (sum(v < value for v in values) + sum(v == value for v in values) / 2) / len(values) * 100
+
+    counts = np.array([3, 0, 5, 1, 0, 2])
+    histogram = FenwickHistogram.from_counts(counts)
+    for bucket in range(len(counts)):
+        assert histogram.count_through(bucket) == counts[: bucket + 1].sum()
+
+    session = get_test_session()
+    try:
+        skill_counts = [1, 2, 2, 3, 5, 8, 8, 8, 13]
+        users = [User(email=f"peer{i}@example.com", hashed_password="x") for i in range(len(skill_counts) + 1)]
+        session.add_all(users)
+        session.flush()
+        for account, skill_count in zip(users, skill_counts + [40]):
+            level = "Senior Level (5+ years)" if skill_count == 40 else "Mid Level (2-5 years)"
+            session.add(Assessment(user_id=account.id, career_interests={"experience_level": level}))
+            session.add_all([
+                UserSkill(user_id=account.id, skill_name=f"Skill {n}", proficiency_level="Advanced")
+                for n in range(skill_count)
+            ])
+        session.commit()
+
+        index = BenchmarkIndex(str(tmp_path / "benchmarks.npz"))
+        index.ensure_loaded(session)
+        assert index.population("Mid Level (2-5 years)") == len(skill_counts)
+        assert index.population("Senior Level (5+ years)") == 1
+        for value in (0, 2, 8, 13, 20):
+            metrics = {"skills": value, "match_score": 0, "learning_paths": 0, "completion_rate": 0}
+            ranks = index.percentiles("Mid Level (2-5 years)", metrics)
+            assert ranks["skills"] == brute_force(skill_counts, value)
+            assert ranks["match_score"] == 50
+        assert index.percentiles("Unknown", metrics)["skills"] == 50
+
+        # A user gaining skills moves one count; a fresh index from the snapshot agrees
+        session.add_all([
+            UserSkill(user_id=users[0].id, skill_name=f"New {n}", proficiency_level="Advanced") for n in range(20)
+        ])
+        session.commit()
+        index.update(UserContext.load(session, users[0].id))
+        skill_counts[0] = 21
+        metrics["skills"] = 8
+        assert index.percentiles("Mid Level (2-5 years)", metrics)["skills"] == brute_force(skill_counts, 8)
+
+        index.save_snapshot()
+        restored = BenchmarkIndex(index.snapshot_path)
+        assert restored.load_snapshot()
+        assert restored.percentiles("Mid Level (2-5 years)", metrics) == index.percentiles("Mid Level (2-5 years)", metrics)
+        assert restored.population("Senior Level (5+ years)") == 1
+    finally:
+        session.close()
+
+
+def test_timed_out_trajectory_section_stores_nothing(monkeypatch):
+    import asyncio
+    import time
+
+    from app.models.assessment import Assessment, UserSkill
+    from app.models.user import User
+    from app.routers import dashboard
+    from app.services import career_intelligence
+    from app.services.dashboard_cache import DashboardCache
+
+    monkeypatch.setattr(dashboard, "dashboard_cache", DashboardCache(shared_path=None))
+    project = career_intelligence.project_trajectories
+
+    def slow_projection(*args):
+        time.sleep(0.3)
+        return project(*args)
+
+    build = dashboard.dashboard_sections.build_concurrently
+    session = get_test_session()
+    try:
+        account = User(email="timeout@example.com", hashed_password="x")
+        session.add(account)
+        session.flush()
+        assessment = Assessment(user_id=account.id, career_interests={})
+        session.add(assessment)
+        session.add(UserSkill(user_id=account.id, skill_name="Python", proficiency_level="Advanced"))
+        session.commit()
+        user_id = str(account.id)
+
+        def load():
+            return asyncio.run(dashboard.get_dashboard(user_id, fields="skill_trajectories", include=None, db=session))
+
+        monkeypatch.setattr(career_intelligence, "project_trajectories", slow_projection)
+        monkeypatch.setattr(
+            dashboard.dashboard_sections, "build_concurrently",
+            lambda *args, **kwargs: build(*args, **kwargs, timeout=0.05),
+        )
+        assert load()["skill_trajectories"] == {}
+        # The abandoned builder finishes in the background without writing to the assessment
+        time.sleep(0.5)
+        assert assessment not in session.dirty
+        assert not assessment.skill_trajectory_predictions
+
+        monkeypatch.setattr(career_intelligence, "project_trajectories", project)
+        trajectories = load()["skill_trajectories"]
+        assert "Python" in trajectories
+        session.expire_all()
+        assert assessment.skill_trajectory_predictions["predictions"] == trajectories
+    finally:
+        session.close()
@@ -0,0 +1,832 @@
+from pathlib import Path
+import sys
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from app.core.database import Base
+from app.models import user, assessment, job, community  # noqa: F401 - register models
+from app.models.job import Job
+from app.services import job_index as job_index_module
+from app.services.job_index import JobIndex
+from app.services import job_search  # noqa: F401 - installs the search index on create_all
+from app.services.seed_data import seed_job_data
+
+
+def get_test_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    return Session()
+
+
+def test_candidates_share_at_least_one_skill():
+    session = get_test_session()
+    try:
+        seed_job_data(session)
+        index = JobIndex()
+        index.rebuild(session)
+
+        titles = [j["title"] for j in index.candidates(["Docker"])]
+        assert titles == ["Full Stack Engineer"]
+
+        titles = [j["title"] for j in index.candidates(["CSS", "Go"])]
+        assert titles == ["Senior Frontend Developer", "Junior Web Developer"]
+
+        assert index.candidates(["COBOL"]) == []
+    finally:
+        session.close()
+
+
+def test_index_follows_committed_job_changes(monkeypatch):
+    session = get_test_session()
+    try:
+        seed_job_data(session)
+        index = JobIndex()
+        index.rebuild(session)
+        monkeypatch.setattr(job_index_module, "job_index", index)
+
+        new_job = Job(title="Go Engineer", company="Gopher", required_skills=["Go"], preferred_skills=[])
+        session.add(new_job)
+        session.commit()
+        assert [j["title"] for j in index.candidates(["Go"])] == ["Go Engineer"]
+
+        new_job.required_skills = ["Rust"]
+        session.commit()
+        assert index.candidates(["Go"]) == []
+        assert [j["id"] for j in index.candidates(["Rust"])] == [new_job.id]
+
+        new_job.is_active = False
+        session.commit()
+        assert index.candidates(["Rust"]) == []
+        assert index.get(new_job.id) is None
+    finally:
+        session.close()
+
+
+def test_vectorized_scores_match_scalar_breakdown():
+    import random
+    from app.services.match_analysis import (
+        analyze_company_culture,
+        calculate_experience_match,
+        calculate_market_intelligence,
+        calculate_score_breakdown,
+        calculate_skill_match,
+        derive_culture_fit,
+        evaluate_growth_potential,
+    )
+    from app.services.match_scoring import EXPERIENCE_YEARS, UserMatchProfile, score_candidates
+
+    rng = random.Random(7)
+    skills = ["React", "TypeScript", "CSS", "Go", "SQL", "AWS", "Docker", "Python", "GraphQL", "Rust"]
+    levels = ["Entry Level", "Mid Level", "Senior Level"] + list(EXPERIENCE_YEARS)
+    words = ["fast-paced", "team", "process", "learn", "innovative", "startup", "mentor", "formal", "creative"]
+
+    index = JobIndex()
+    for job_id in range(1, 301):
+        index.upsert({
+            "id": job_id,
+            "title": rng.choice(["Frontend Engineer", "Backend Engineer", "Full Stack Dev", "Data Engineer"]),
+            "description": " ".join(rng.sample(words, rng.randint(0, 5))),
+            "salary": rng.choice(["$60k - $80k", "$150k - $200k", "", "$95k"]),
+            "remote_status": rng.choice(["Remote", "Hybrid", "On-site"]),
+            "experience_level": rng.choice(levels),
+            "required_skills": rng.sample(skills, rng.randint(0, 4)),
+            "preferred_skills": rng.sample(skills, rng.randint(0, 3)),
+            "growth_signals": {"revenue_growth": rng.random() / 2, "runway_months": rng.randint(6, 40)},
+            "team_size": rng.randint(5, 300),
+        })
+
+    for _ in range(25):
+        user_skills = {name: "Advanced" for name in rng.sample(skills, rng.randint(1, 6))}
+        answers = {
+            "experience_level": rng.choice(list(EXPERIENCE_YEARS)),
+            "location_preferences": rng.sample(["Remote", "hybrid", "On-Site"], rng.randint(0, 2)),
+            "career_interests": rng.sample(["Frontend Developer", "Backend Developer", "Full Stack"], rng.randint(0, 2)),
+            "work_culture": rng.choice([[], ["innovative"], ["high", "collaborative"], ["medium", "high", "medium"]]),
+        }
+        scores = score_candidates(index, UserMatchProfile.from_answers(user_skills, answers))
+
+        expected_ids = [job["id"] for job in index.candidates(user_skills)]
+        assert sorted(scores.job_ids.tolist()) == expected_ids
+
+        for i, job_id in enumerate(scores.job_ids.tolist()):
+            job = index.get(job_id)
+            skill_analysis = calculate_skill_match(user_skills, job["required_skills"], job["preferred_skills"])
+            experience_match = calculate_experience_match(answers["experience_level"], job["experience_level"])
+            culture_fit = derive_culture_fit(answers["work_culture"], analyze_company_culture(job["description"]))
+            market_intel = calculate_market_intelligence(job, 0)
+            breakdown = calculate_score_breakdown(
+                skill_analysis, experience_match, culture_fit, evaluate_growth_potential(job), market_intel
+            )
+            assert scores.score_breakdown(i) == breakdown
+            assert scores.required_matches[i] == skill_analysis["required_matches"]
+            assert scores.preferred_matches[i] == skill_analysis["preferred_matches"]
+
+
+def test_top_k_pages_follow_full_ranking():
+    from app.services.match_scoring import UserMatchProfile, score_candidates
+
+    index = JobIndex()
+    for job_id in range(1, 41):
+        index.upsert({
+            "id": job_id,
+            "title": "Engineer",
+            "description": "",
+            "salary": "",
+            "remote_status": "Remote",
+            "experience_level": "Mid Level",
+            "required_skills": ["Go", "SQL", "AWS"][: 1 + job_id % 3],
+            "preferred_skills": ["Docker"] if job_id % 2 else [],
+        })
+    scores = score_candidates(index, UserMatchProfile(skills=["Go", "Docker"]))
+    full_ranking = scores.ranking().tolist()
+
+    paged, after_key = [], None
+    while True:
+        page = scores.top_k(7, after_key)
+        if not len(page):
+            break
+        paged.extend(page.tolist())
+        after_key = int(scores.rank_keys()[page[-1]])
+
+    assert paged == full_ranking
+
+
+def test_job_features_are_stored_and_refreshed_only_on_input_change(monkeypatch):
+    from app.services import job_features
+
+    session = get_test_session()
+    try:
+        calls = []
+        derive = job_features.derive_job_features
+        monkeypatch.setattr(job_features, "derive_job_features", lambda job: calls.append(job["id"]) or derive(job))
+
+        job_row = Job(title="Platform Engineer", company="Acme", description="Fast-paced startup team", salary="$90k")
+        session.add(job_row)
+        session.commit()
+        assert len(calls) == 1
+        assert job_row.culture_analysis == {"fast_paced": "high", "collaborative": "medium"}
+        assert job_row.salary_position == "average"
+
+        job_row.title = "Staff Platform Engineer"
+        session.commit()
+        assert len(calls) == 1
+
+        job_row.salary = "$200k"
+        session.commit()
+        assert len(calls) == 2
+        assert job_row.salary_position == "above_average"
+
+        index = JobIndex()
+        monkeypatch.setattr(job_index_module, "derive_job_features", lambda job: calls.append(job["id"]) or derive(job))
+        index.rebuild(session)
+        assert len(calls) == 2
+        assert index.features(job_row.id)["salary_position"] == "above_average"
+    finally:
+        session.close()
+
+
+def test_bulk_import_upserts_and_deactivates_missing_postings(tmp_path):
+    import json
+
+    from app.services.job_importer import import_jobs, iter_feed
+
+    session = get_test_session()
+    try:
+        feed = tmp_path / "jobs.csv"
+        feed.write_text(
+            "title,company,source,source_url,salary,required_skills\n"
+            "Go Engineer,Gopher,Board,https://board/1,$90k,Go|SQL\n"
+            "Data Engineer,Acme,Board,https://board/2,,Python;SQL\n"
+            "Duplicate Go Engineer,Gopher,Board,https://board/1,$95k,Go\n"
+            "No Url,Acme,Board,,,\n"
+        )
+        stats = import_jobs(session, iter_feed(str(feed)), batch_size=2)
+        assert (stats.rows, stats.skipped) == (4, 1)
+        assert session.query(Job).count() == 2
+        first = session.query(Job).filter(Job.source_url == "https://board/1").one()
+        assert first.title == "Duplicate Go Engineer"
+        assert first.required_skills == ["Go"]
+        assert first.features_fingerprint
+
+        stats = import_jobs(
+            session,
+            [{"title": "Go Engineer", "company": "Gopher", "source": "Board", "source_url": "https://board/1"}],
+            full_feed=True,
+        )
+        session.expire_all()
+        assert stats.deactivated == 1
+        assert [(j.source_url, j.is_active) for j in session.query(Job).order_by(Job.id)] == [
+            ("https://board/1", True),
+            ("https://board/2", False),
+        ]
+
+        # Malformed records are counted and skipped; the rest of the feed still lands
+        feed = tmp_path / "jobs.jsonl"
+        records = [
+            {"title": "Bad Date", "company": "Acme", "source": "Board", "source_url": "https://board/1", "posted_at": "Jan 5"},
+            {"title": "Bad Team", "company": "Acme", "source": "Board", "source_url": "https://board/3", "team_size": "50-100"},
+            {"title": "Bad Signals", "company": "Acme", "source": "Board", "source_url": "https://board/4", "growth_signals": "{oops"},
+            {"title": "Good", "company": "Acme", "source": "Board", "source_url": "https://board/5", "team_size": "12"},
+        ]
+        feed.write_text("\n".join([json.dumps(records[0]), "{not json", *map(json.dumps, records[1:])]) + "\n")
+        stats = import_jobs(session, iter_feed(str(feed)), full_feed=True, batch_size=1)
+        session.expire_all()
+        assert (stats.rows, stats.written, stats.errors, stats.skipped) == (5, 1, 4, 0)
+        assert len(stats.error_samples) == 4 and stats.error_samples[1].startswith("record 2: invalid JSON")
+        # The posting whose record failed is still in the feed, so it stays active
+        assert stats.deactivated == 0
+        assert session.query(Job).filter(Job.source_url == "https://board/1").one().is_active
+        assert session.query(Job).filter(Job.source_url == "https://board/5").one().team_size == 12
+    finally:
+        session.close()
+
+
+def test_materialized_matches_follow_job_and_assessment_changes(monkeypatch):
+    from app.models.assessment import Assessment, JobMatch, UserSkill
+    from app.models.user import User
+    from sqlalchemy import insert
+
+    from app.services import match_materializer as match_materializer_module
+    from app.services.job_importer import import_jobs
+    from app.services.match_materializer import MatchMaterializer
+    from app.services.match_scoring import SCORING_VERSION
+    from app.services.skill_canonicalizer import canonicalize_user_skills
+
+    session = get_test_session()
+    try:
+        seed_job_data(session)
+        index = JobIndex()
+        index.rebuild(session)
+        monkeypatch.setattr(job_index_module, "job_index", index)
+
+        user_ids = {}
+        for email, skill in (("go@example.com", "Go"), ("react@example.com", "React")):
+            account = User(email=email, hashed_password="x")
+            session.add(account)
+            session.flush()
+            session.add(Assessment(user_id=account.id, career_interests={"experience_level": "Mid Level (2-5 years)"}))
+            user_ids[skill] = account.id
+        session.commit()
+        # Rows saved before canonicalization, written past the ORM hooks
+        session.execute(insert(UserSkill.__table__), [
+            {"user_id": user_ids["Go"], "skill_name": "golang", "proficiency_level": "Advanced"},
+            {"user_id": user_ids["React"], "skill_name": "ReactJS", "proficiency_level": "Advanced"},
+            {"user_id": user_ids["React"], "skill_name": "react", "proficiency_level": "Beginner"},
+        ])
+        session.commit()
+        assert canonicalize_user_skills(session) == 3
+        assert sorted(name for (name,) in session.query(UserSkill.skill_name)) == ["Go", "React"]
+        assert canonicalize_user_skills(session) == 0
+
+        materializer = MatchMaterializer(index)
+        for user_id in user_ids.values():
+            materializer.refresh_user(session, user_id)
+
+        def is_stale(user_id):
+            return session.query(Assessment.matches_version).filter(Assessment.user_id == user_id).scalar() is None
+
+        def matched_titles(user_id):
+            # As the read path does, stale matches are recomputed first
+            if is_stale(user_id):
+                materializer.refresh_user(session, user_id)
+            rows = session.query(JobMatch).filter(JobMatch.user_id == user_id).order_by(JobMatch.rank_key).all()
+            return [index.get(row.job_id)["title"] for row in rows]
+
+        assert matched_titles(user_ids["Go"]) == []
+        assert len(matched_titles(user_ids["React"])) == 3
+
+        # A job commit re-scores only its own pairs; every user stays current
+        new_job = Job(title="Go Engineer", company="Gopher", required_skills=["Go"], preferred_skills=[])
+        session.add(new_job)
+        session.commit()
+        assert not is_stale(user_ids["Go"]) and not is_stale(user_ids["React"])
+        assert matched_titles(user_ids["Go"]) == ["Go Engineer"]
+        assert "Go Engineer" not in matched_titles(user_ids["React"])
+
+        react_rows = len(matched_titles(user_ids["React"]))
+        new_job.required_skills = ["React"]
+        session.commit()
+        session.expire_all()
+        assert not is_stale(user_ids["Go"]) and not is_stale(user_ids["React"])
+        assert matched_titles(user_ids["Go"]) == []
+        assert "Go Engineer" in matched_titles(user_ids["React"])
+        assert len(matched_titles(user_ids["React"])) == react_rows + 1
+
+        row = session.query(JobMatch).filter(JobMatch.job_id == new_job.id).one()
+        assert row.scoring_version == SCORING_VERSION
+        assert row.score_breakdown["total"] <= row.match_score
+        full = materializer.score_rows(
+            user_ids["React"], {"React": "Advanced"}, {"experience_level": "Mid Level (2-5 years)"}, [new_job.id]
+        )
+        assert (row.match_score, row.rank_key) == (full[0]["match_score"], full[0]["rank_key"])
+
+        # When the re-score fails, the affected users are marked stale and recomputed on read
+        def fail(*args, **kwargs):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(MatchMaterializer, "refresh_jobs", fail)
+        new_job.required_skills = ["Go"]
+        session.commit()
+        assert is_stale(user_ids["Go"]) and is_stale(user_ids["React"])
+        monkeypatch.undo()
+        monkeypatch.setattr(job_index_module, "job_index", index)
+        assert matched_titles(user_ids["Go"]) == ["Go Engineer"]
+        assert "Go Engineer" not in matched_titles(user_ids["React"])
+
+        # A feed import re-scores the pairs of the jobs it wrote or deactivated, and nothing else
+        monkeypatch.setattr(match_materializer_module, "match_materializer", materializer)
+        untouched = {row.job_id: row.rank_key for row in session.query(JobMatch).filter(JobMatch.job_id != new_job.id)}
+        stats = import_jobs(session, [{
+            "title": "React Developer", "company": "Feed", "source": "Board", "source_url": "https://board/react",
+            "required_skills": ["ReactJS"],
+        }])
+        session.expire_all()
+        imported = session.query(Job).filter(Job.source_url == "https://board/react").one()
+        assert stats.written == 1 and not is_stale(user_ids["React"])
+        assert "React Developer" in matched_titles(user_ids["React"])
+        assert {row.job_id: row.rank_key for row in session.query(JobMatch).filter(
+            JobMatch.job_id.notin_([new_job.id, imported.id])
+        )} == untouched
+        import_jobs(session, [{"title": "Other", "company": "Feed", "source": "Board", "source_url": "https://board/x"}], full_feed=True)
+        assert "React Developer" not in matched_titles(user_ids["React"])
+        assert session.query(Assessment).filter(Assessment.user_id == user_ids["React"]).one().matches_version == SCORING_VERSION
+    finally:
+        session.close()
+
+
+def test_batch_matcher_workers_agree_with_online_refresh(monkeypatch):
+    from app.models.assessment import Assessment, JobMatch, UserSkill
+    from app.models.user import User
+    from app.services.batch_matcher import SharedJobIndex, release_blocks, run_batch, share_job_index
+    from app.services.match_materializer import MatchMaterializer
+
+    session = get_test_session()
+    try:
+        seed_job_data(session)
+        index = JobIndex()
+        index.rebuild(session)
+        monkeypatch.setattr(job_index_module, "job_index", index)
+
+        skill_sets = [["React"], ["Go", "SQL"], ["CSS", "TypeScript", "Docker"], ["COBOL"], ["Python", "React"]]
+        for n, skills in enumerate(skill_sets):
+            account = User(email=f"user{n}@example.com", hashed_password="x")
+            session.add(account)
+            session.flush()
+            session.add(Assessment(user_id=account.id, career_interests={
+                "experience_level": "Senior Level (5+ years)",
+                "location_preferences": ["Remote"],
+                "career_interests": ["Frontend Developer"],
+            }))
+            for skill in skills:
+                session.add(UserSkill(user_id=account.id, skill_name=skill, proficiency_level="Advanced"))
+        session.commit()
+
+        def snapshot():
+            session.expire_all()
+            return sorted(
+                (row.user_id, row.job_id, row.match_score, row.rank_key, row.match_reasons, row.skill_gaps)
+                for row in session.query(JobMatch)
+            )
+
+        materializer = MatchMaterializer(index)
+        for (user_id,) in session.query(Assessment.user_id):
+            materializer.refresh_user(session, user_id)
+        online = snapshot()
+
+        session.query(JobMatch).delete()
+        session.commit()
+        stats = run_batch(session, workers=2, chunk_size=2, index=index)
+
+        assert stats.users == len(skill_sets)
+        assert stats.matches == len(online) > 0
+        assert snapshot() == online
+
+        # Workers read job skills and features from shared arrays; only lookup tables are pickled
+        blocks, descriptors, meta = share_job_index(index)
+        try:
+            assert set(meta) == {"size", "experience_codes", "remote_codes", "skills", "skill_names"}
+            arrays = {name: np.ndarray(shape, dtype=dtype, buffer=block.buf)
+                      for block, (name, (_, dtype, shape)) in zip(blocks, descriptors.items())}
+            shared = SharedJobIndex(arrays, meta)
+            assert len(shared) == len(index)
+            for job in index.iter_jobs():
+                assert shared.get(job["id"]) == {
+                    "id": job["id"], "required_skills": job["required_skills"], "preferred_skills": job["preferred_skills"]
+                }
+                features = shared.features(job["id"])
+                assert features["culture_analysis"] == index.features(job["id"])["culture_analysis"]
+                assert features["growth_potential"]["score"] == index.features(job["id"])["growth_potential"]["score"]
+            del arrays, shared
+        finally:
+            release_blocks(blocks)
+    finally:
+        session.close()
+
+
+def test_skill_aliases_match_as_one_canonical_skill():
+    from app.services.match_analysis import calculate_skill_match
+    from app.services.skill_canonicalizer import skill_canonicalizer
+
+    assert len({skill_canonicalizer.skill_id(raw) for raw in ["React", "React.js", "ReactJS", "react"]}) == 1
+    assert skill_canonicalizer.canonical("golang") == "Go"
+    assert skill_canonicalizer.canonical_list(["k8s", "Kubernetes", "Postgres"]) == ["Kubernetes", "PostgreSQL"]
+
+    session = get_test_session()
+    try:
+        job_row = Job(title="UI Engineer", company="Acme", required_skills=["ReactJS", "node"], preferred_skills=["TS"])
+        session.add(job_row)
+        session.commit()
+        assert job_row.required_skills == ["React", "Node.js"]
+
+        index = JobIndex()
+        index.rebuild(session)
+        assert [j["id"] for j in index.candidates(["react.js"])] == [job_row.id]
+
+        analysis = calculate_skill_match({"react": "Advanced", "typescript": "Beginner"}, ["React.js", "Node"], ["TS"])
+        assert (analysis["required_matches"], analysis["preferred_matches"]) == (1, 1)
+        assert analysis["skill_gaps"] == ["Node"]
+    finally:
+        session.close()
+
+
+def test_full_text_search_ranks_filters_and_pages():
+    from app.services.job_search import search_jobs
+
+    session = get_test_session()
+    try:
+        seed_job_data(session)
+        session.add_all([
+            Job(title="Platform Engineer", company="Kubeworks", description="Kubernetes operators in Go",
+                remote_status="Remote", job_type="Full-time"),
+            Job(title="Go Developer", company="Gopher", description="Backend services, some kubernetes",
+                remote_status="On-site", job_type="Contract"),
+            Job(title="Retired posting", company="Kubeworks", description="kubernetes", is_active=False),
+        ])
+        session.commit()
+
+        hits = search_jobs(session, "kubernetes")
+        titles = [session.get(Job, job_id).title for job_id, _ in hits]
+        assert "Retired posting" not in titles
+        assert titles[:2] == ["Platform Engineer", "Go Developer"]
+
+        assert [job_id for job_id, _ in search_jobs(session, "kubernetes", remote_status="remote")] == [hits[0][0]]
+        assert search_jobs(session, "kubernetes", job_type="Contract") == [hits[1]]
+
+        first_page = search_jobs(session, "kube", limit=1)
+        second_page = search_jobs(session, "kube", limit=1, after=first_page[-1])
+        assert first_page + second_page == search_jobs(session, "kube", limit=2)
+
+        job_row = session.query(Job).filter(Job.title == "Go Developer").one()
+        job_row.description = "Backend services"
+        session.commit()
+        assert [job_id for job_id, _ in search_jobs(session, "kubernetes")] == [hits[0][0]]
+        assert search_jobs(session, '"unbalanced * (') == []
+    finally:
+        session.close()
+
+
+def test_similar_jobs_follow_changes_and_survive_snapshots(monkeypatch, tmp_path):
+    from app.services import similar_jobs
+    from app.services.similar_jobs import SimilarJobsIndex
+
+    session = get_test_session()
+    try:
+        seed_job_data(session)
+        description = "Build data pipelines in Python and SQL for our analytics platform team"
+        original = Job(title="Data Engineer", company="Pipes", description=description,
+                       required_skills=["Python", "SQL"], preferred_skills=["AWS"])
+        session.add(original)
+        session.commit()
+
+        # Exercise the LSH buckets rather than the small-catalog full scan
+        monkeypatch.setattr(similar_jobs, "BRUTE_FORCE_LIMIT", 0)
+        snapshot = tmp_path / "similar.npz"
+        index = SimilarJobsIndex(str(snapshot))
+        index.ensure_loaded(session)
+        monkeypatch.setattr(job_index_module, "similar_jobs_index", index)
+        assert snapshot.exists()
+        assert index.similar(original.id) == []
+
+        twin = Job(title="Data Engineer II", company="Flows", description=description + " today",
+                   required_skills=["python", "Postgres", "SQL"], preferred_skills=["Amazon Web Services"])
+        session.add(twin)
+        session.commit()
+        assert index.similar(original.id) == [twin.id]
+
+        # The snapshot predates the twin; loading it catches up from the table
+        reloaded = SimilarJobsIndex(str(snapshot))
+        assert reloaded.load_snapshot() and len(reloaded) == len(index) - 1
+        reloaded.ensure_loaded(session)
+        assert reloaded.similar(original.id) == [twin.id]
+
+        twin.is_active = False
+        session.commit()
+        assert index.similar(original.id) == []
+    finally:
+        session.close()
+
+
+def test_similar_job_signatures_do_not_depend_on_skill_registration_order(tmp_path):
+    import subprocess
+
+    from app.services.similar_jobs import SimilarJobsIndex, job_signature
+
+    job = {"id": 1, "description": "Model the warehouse in dbt on Snowflake",
+           "required_skills": ["Snowflake", "dbt"], "preferred_skills": ["Looker", "SQL"]}
+    index = SimilarJobsIndex(str(tmp_path / "similar.npz"))
+    index.upsert(job)
+    index.save_snapshot()
+
+    # Another process registers other unlisted skills first, so its skill ids differ from ours
+    script = f"""
+import numpy as np
+from app.services.similar_jobs import SimilarJobsIndex, job_signature
+from app.services.skill_canonicalizer import skill_canonicalizer
+skill_canonicalizer.ids(["Airflow", "Looker", "dbt", "Fivetran", "snowflake"])
+index = SimilarJobsIndex({str(tmp_path / "similar.npz")!r})
+assert index.load_snapshot()
+assert np.array_equal(index._signatures[1], job_signature({job!r}))
+"""
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT_DIR, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert np.array_equal(index._signatures[1], job_signature(job))
+
+
+def test_hidden_gems_are_scored_in_one_pass_from_config(tmp_path):
+    import json
+    from datetime import date
+
+    from app.services.hidden_gem_matcher import DEFAULT_CONFIG_PATH, HiddenGemMatcher
+
+    user_skills = {"React": "advanced", "Go": "intermediate", "Docker": "beginner"}
+    jobs = [
+        {"id": i, "match_score": 90, "required_skills": ["ReactJS", "Golang"], "preferred_skills": [],
+         "posted_date": date.today().isoformat() if i % 2 else "not a date", "company_stage": "Series A"}
+        for i in range(8)
+    ] + [{"id": 8, "match_score": 50, "required_skills": ["Java"], "preferred_skills": []}]
+
+    gems = HiddenGemMatcher().find_hidden_gems(user_skills, {}, jobs, {})
+    assert [gem["id"] for gem in gems] == [1, 3, 5, 7, 0]
+    assert gems[0]["hidden_gem_score"] == 0.4 + 0.9 + 1.0
+    assert gems[0]["hidden_gem_reasons"][0] == "Unique skill combination that matches your profile"
+    assert gems[-1]["urgency"] == "high"
+
+    config = json.loads(DEFAULT_CONFIG_PATH.read_text())
+    config["signals"] = [signal for signal in config["signals"] if signal["key"] == "unique_requirements"]
+    config["min_gem_score"] = 0.4
+    config["top_k"] = 2
+    path = tmp_path / "signals.json"
+    path.write_text(json.dumps(config))
+    gems = HiddenGemMatcher(path).find_hidden_gems(user_skills, {}, jobs, {})
+    assert [(gem["id"], gem["urgency"]) for gem in gems] == [(0, "medium"), (1, "medium")]
+
+
+def test_hidden_gems_come_from_all_matches_not_the_page(monkeypatch):
+    import asyncio
+
+    from app.models.assessment import Assessment, UserSkill
+    from app.models.user import User
+    from app.routers import jobs
+    from app.services.match_materializer import MatchMaterializer
+
+    session = get_test_session()
+    try:
+        session.add_all([
+            Job(title=f"React Developer {i}", company="Steady", required_skills=["React"], preferred_skills=[])
+            for i in range(3)
+        ])
+        # Many required skills rank it last, strong growth makes it a gem
+        session.add(Job(
+            title="Rocketship Engineer", company="Rocket", required_skills=["React", "Rust", "Elixir", "Haskell"],
+            preferred_skills=[], growth_signals={"revenue_growth": 0.5, "headcount_growth": 0.3, "runway_months": 36},
+        ))
+        account = User(email="gems@example.com", hashed_password="x")
+        session.add(account)
+        session.flush()
+        session.add(Assessment(user_id=account.id, career_interests={"experience_level": "Mid Level (2-5 years)"}))
+        session.add(UserSkill(user_id=account.id, skill_name="React", proficiency_level="Advanced"))
+        session.commit()
+
+        index = JobIndex()
+        index.rebuild(session)
+        monkeypatch.setattr(jobs, "job_index", index)
+        monkeypatch.setattr(jobs, "match_materializer", MatchMaterializer(index))
+
+        def load(limit, cursor=None):
+            return asyncio.run(jobs.get_job_matches(
+                str(account.id), limit=limit, cursor=cursor, fields="id,title", include=None, min_salary=None, db=session
+            ))
+
+        # Gem signals read only cheap fields, so no candidate pays for a full match description
+        def not_needed(*args, **kwargs):
+            raise AssertionError("describe_match was called")
+
+        monkeypatch.setattr(jobs, "describe_match", not_needed)
+        first = load(1)
+        assert [match["title"] for match in first["matches"]] == ["React Developer 0"]
+        assert [gem["title"] for gem in first["hidden_gems"]] == ["Rocketship Engineer"]
+        gem = first["hidden_gems"][0]
+        assert set(gem) == {"id", "title", *jobs.HIDDEN_GEM_KEYS}
+        assert gem["hidden_gem_reasons"] == ["High growth trajectory - rocketship opportunity"]
+        assert load(20)["hidden_gems"] == first["hidden_gems"]
+        assert load(1, first["next_cursor"])["hidden_gems"] == []
+    finally:
+        session.close()
+
+
+def test_match_fields_only_build_requested_sections(monkeypatch):
+    from app.routers import jobs
+    from app.routers.dashboard import dashboard_sections
+    from app.services.match_scoring import UserMatchProfile, score_candidates
+
+    session = get_test_session()
+    try:
+        seed_job_data(session)
+        index = JobIndex()
+        index.rebuild(session)
+        user_skills = {"React": "advanced", "CSS": "intermediate"}
+        answers = {"experience_level": "Mid Level"}
+        scores = score_candidates(index, UserMatchProfile.from_answers(user_skills, answers))
+        job_id = int(scores.job_ids[0])
+        match = {**scores.signals(0), "match_score": float(scores.match_score[0]), "score_breakdown": scores.score_breakdown(0)}
+
+        full = jobs.build_job_match(index.get(job_id), index.features(job_id), match, user_skills, answers)
+        assert list(full) == jobs.match_fields.names
+
+        def not_requested(*args, **kwargs):
+            raise AssertionError("market intelligence was not requested")
+
+        monkeypatch.setattr(jobs, "calculate_market_intelligence", not_requested)
+        fields = jobs.match_fields.select("title,match_score", "id, skill_gaps")
+        card = jobs.build_job_match(index.get(job_id), index.features(job_id), match, user_skills, answers, fields)
+        assert card == {key: full[key] for key in ("id", "title", "match_score", "skill_gaps")}
+    finally:
+        session.close()
+
+    assert dashboard_sections.select(None, None) == dashboard_sections.names
+    assert dashboard_sections.select("benchmarks,skill_gaps", None) == ["skill_gaps", "benchmarks"]
+    with pytest.raises(ValueError):
+        dashboard_sections.select("skill_gaps,salary", None)
+
+
+def test_salaries_are_parsed_on_write_and_filterable():
+    from app.services.job_importer import import_jobs
+    from app.services.job_search import search_jobs
+    from app.services.salary_parser import parse_salary
+
+    assert parse_salary("$100k + 401k match") == parse_salary("$100k")
+    assert parse_salary("€45-55/hour").period == "hour"
+    assert (parse_salary("€45-55/hour").min, parse_salary("£3,000 per month").max) == (45 * 2080, 36000)
+    assert parse_salary("Competitive").max is None
+
+    session = get_test_session()
+    try:
+        seed_job_data(session)
+        senior = session.query(Job).filter(Job.salary == "$120k - $180k base + equity").one()
+        assert (senior.salary_min, senior.salary_max, senior.salary_currency, senior.salary_period) == (
+            120000, 180000, "USD", "year"
+        )
+
+        senior.salary = "$150k - $200k"
+        session.commit()
+        assert senior.salary_max == 200000
+
+        import_jobs(session, [{"title": "Kubernetes SRE", "company": "Ops", "source": "Board",
+                               "source_url": "https://board/sre", "salary": "$70-90k", "description": "kubernetes"}])
+        session.add(Job(title="Kubernetes intern", company="Ops", salary="Unpaid", description="kubernetes"))
+        session.commit()
+        sre = session.query(Job).filter(Job.title == "Kubernetes SRE").one()
+        assert (sre.salary_min, sre.salary_max) == (70000, 90000)
+
+        assert len(search_jobs(session, "kubernetes")) == 2
+        assert search_jobs(session, "kubernetes", min_salary=85000) == search_jobs(session, "kubernetes")[:1]
+        assert search_jobs(session, "kubernetes", min_salary=95000) == []
+    finally:
+        session.close()
+
+
+def test_match_stream_sends_previews_then_enriched_matches(monkeypatch):
+    import json
+
+    from fastapi.testclient import TestClient
+
+    from app.core.database import get_db
+    from app.models.assessment import Assessment, JobMatch, UserSkill
+    from app.models.user import User
+    from app.routers import jobs
+    from app.services.match_materializer import MatchMaterializer
+    from main import app
+    from sqlalchemy.pool import StaticPool
+
+    # The endpoint runs in the client's worker thread
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        seed_job_data(session)
+        index = JobIndex()
+        index.rebuild(session)
+        monkeypatch.setattr(jobs, "job_index", index)
+        account = User(email="stream@example.com", hashed_password="x")
+        session.add(account)
+        session.flush()
+        session.add(Assessment(user_id=account.id, career_interests={"experience_level": "Mid Level (2-5 years)"}))
+        session.add_all([
+            UserSkill(user_id=account.id, skill_name=skill, proficiency_level="Advanced")
+            for skill in ("React", "CSS", "Python")
+        ])
+        session.commit()
+        monkeypatch.setitem(app.dependency_overrides, get_db, lambda: session)
+        client = TestClient(app)
+
+        def stream(**params):
+            response = client.get(f"/api/jobs/matches/{account.id}/stream", params=params)
+            assert response.status_code == 200
+            return response
+
+        # Stale matches: scored on the fly, nothing materialized
+        events = [json.loads(line) for line in stream(fields="id,match_score").text.splitlines()]
+        assert [event["event"] for event in events] == ["ranked"] + ["match"] * 3 + ["hidden_gems", "done"]
+        preview_ids = [match["id"] for match in events[0]["data"]["matches"]]
+        assert [event["data"]["id"] for event in events[1:4]] == preview_ids
+        assert set(events[1]["data"]) == {"id", "match_score"}
+        assert session.query(JobMatch).count() == 0
+
+        # Fresh matches stream in materialized order
+        MatchMaterializer(index).refresh_user(session, account.id)
+        rows = session.query(JobMatch).order_by(JobMatch.rank_key).all()
+        assert preview_ids == [row.job_id for row in rows]
+        response = stream(format="sse", limit=1)
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.text.startswith("event: ranked\ndata: ")
+        assert response.text.count("event: match\n") == 1
+
+        line = jobs.encode_stream_event("match", {"score": np.float64(1.5), "id": np.int64(3)}, "ndjson")
+        assert line.endswith("\n") and json.loads(line) == {"event": "match", "data": {"score": 1.5, "id": 3}}
+    finally:
+        session.close()
+
+
+def test_resume_similarity_feeds_match_scores():
+    from app.models.assessment import Assessment
+    from app.models.user import Resume, User
+    from app.services.match_analysis import calculate_score_breakdown
+    from app.services.match_materializer import MatchMaterializer
+    from app.services.match_scoring import UserMatchProfile, score_candidates, semantic_similarity
+    from app.services.semantic_matcher import analyze, load_resume_vectors
+
+    session = get_test_session()
+    try:
+        seed_job_data(session)
+        index = JobIndex()
+        index.rebuild(session)
+        account = User(email="semantic@example.com", hashed_password="x")
+        session.add(account)
+        session.flush()
+        assessment = Assessment(user_id=account.id, career_interests={}, matches_version=0)
+        session.add(assessment)
+        session.commit()
+        assert load_resume_vectors(session, [account.id], index.vectorizer) == {}
+
+        resume = Resume(user_id=account.id, content={
+            "summary": "Frontend engineer building React and TypeScript interfaces",
+            "experience": [{"title": "Frontend Developer", "highlights": ["Shipped React component libraries"]}],
+        })
+        session.add(resume)
+        MatchMaterializer(index).refresh_user(session, account.id)
+        # Editing the resume makes the materialized matches stale again
+        resume.content["summary"] = "Frontend engineer building React interfaces"
+        session.commit()
+        session.refresh(assessment)
+        assert assessment.matches_version is None
+
+        vector = load_resume_vectors(session, [account.id], index.vectorizer)[account.id]
+        assert np.isclose(np.linalg.norm(vector), 1.0)
+        top = index.semantic_top_k(vector, 3)
+        assert len(top) == 3 and top[0][1] >= top[1][1] >= top[2][1] > 0
+        assert "React" in index.get(top[0][0])["required_skills"] + index.get(top[0][0])["preferred_skills"]
+        assert not index.vectorizer.transform(analyze("")).any()
+
+        plain = score_candidates(index, UserMatchProfile(skills=["React", "CSS"]))
+        semantic = score_candidates(index, UserMatchProfile(skills=["React", "CSS"], resume_vector=vector))
+        assert plain.semantic is None and "semantic" not in plain.score_breakdown(0)
+        for i, job_id in enumerate(semantic.job_ids.tolist()):
+            breakdown = semantic.score_breakdown(i)
+            similarity = semantic_similarity(index.semantic_vectors[index._slot_of[job_id]][None, :], vector)[0]
+            assert breakdown["semantic"] == similarity
+            assert breakdown == calculate_score_breakdown(
+                {"score": breakdown["skills"]}, breakdown["experience"] / 100, {"score": breakdown["culture"]},
+                {"score": breakdown["growth"]},
+                {"salary_comparison": {"position": "above_average" if breakdown["compensation"] == 80 else ""}},
+                semantic=breakdown["semantic"],
+            )
+    finally:
+        session.close()
@@ -0,0 +1,113 @@
+from pathlib import Path
+import sys
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from app.core.database import Base
+from app.models import user, assessment, job, community  # noqa: F401 - register models
+
+
+def get_test_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    return Session()
+
+
+def test_learning_activity_rolls_up_into_progress_velocity():
+    import asyncio
+    from datetime import datetime, timedelta
+
+    from app.models.assessment import (
+        LearningActivity, LearningActivityDaily, LearningActivityWeekly, LearningPath, LearningResource,
+    )
+    from app.models.user import User
+    from app.routers.dashboard import calculate_progress_velocity
+    from app.routers.learning import update_learning_progress
+    from app.services.learning_activity import load_activity_summaries, record_activity, week_start
+
+    session = get_test_session()
+    try:
+        account = User(email="learner@example.com", hashed_password="x")
+        session.add(account)
+        session.flush()
+        path = LearningPath(
+            user_id=account.id, status="in_progress", progress_percentage=50, hours_per_day=2,
+            resources={"timeline": {"total_hours": 40}},
+        )
+        resource = LearningResource(skill_name="Go", title="Go in practice", duration_hours=10)
+        session.add_all([path, resource])
+        session.commit()
+
+        # Progress updates log the learning time they stand for; going back logs nothing
+        for progress in (30, 60, 40):
+            asyncio.run(update_learning_progress(path.id, resource.id, progress, db=session))
+        assert [row.delta_minutes for row in session.query(LearningActivity)] == [180, 180]
+
+        today = datetime.utcnow().date()
+        record_activity(session, account.id, resource.id, 90, datetime.combine(today - timedelta(days=3), datetime.min.time()))
+        record_activity(session, account.id, resource.id, 600, datetime.combine(today - timedelta(days=45), datetime.min.time()))
+        session.commit()
+        assert session.query(LearningActivityDaily).filter_by(user_id=account.id, day=today).one().minutes == 360
+        weekly = {row.week_start: row.minutes for row in session.query(LearningActivityWeekly)}
+        assert sum(weekly.values()) == 1050 and weekly[week_start(today)] >= 360
+
+        activity = load_activity_summaries(session, [account.id, 999])[account.id]
+        assert activity.minutes_last_30_days == 450
+        assert sum(activity.minutes_by_week) == 450
+        assert load_activity_summaries(session, [999])[999].minutes_last_30_days == 0
+
+        session.refresh(path)
+        velocity = calculate_progress_velocity([path], [], activity)
+        assert velocity["hours_learned_last_30_days"] == 7.5
+        assert velocity["weekly_learning_hours"] == round(450 / 4 / 60, 1)
+        assert velocity["total_hours_planned"] == 40
+        # 40 planned hours, path at 40%: 24 hours left at 15 minutes a day
+        projected = datetime.fromisoformat(velocity["projected_completion_date"])
+        assert abs((projected - datetime.now()).days - 96) <= 1
+    finally:
+        session.close()
+
+
+def test_empty_activity_history_falls_back_to_planned_pace():
+    from datetime import datetime
+
+    from app.models.assessment import LearningActivityDaily, LearningActivityWeekly, LearningPath
+    from app.models.user import User
+    from app.routers.dashboard import calculate_progress_velocity
+    from app.services.learning_activity import ActivitySummary, load_activity_summaries
+
+    session = get_test_session()
+    try:
+        account = User(email="idle@example.com", hashed_password="x")
+        session.add(account)
+        session.flush()
+        path = LearningPath(
+            user_id=account.id, status="in_progress", progress_percentage=50, hours_per_day=2,
+            resources={"timeline": {"total_hours": 40}},
+        )
+        session.add(path)
+        session.commit()
+
+        assert load_activity_summaries(session, []) == {}
+        activity = load_activity_summaries(session, [account.id])[account.id]
+        assert activity == ActivitySummary()
+        assert session.query(LearningActivityDaily).count() == session.query(LearningActivityWeekly).count() == 0
+
+        # No paths and no activity: all zeros, no projection
+        idle = calculate_progress_velocity([], [], activity)
+        assert idle["hours_learned_last_30_days"] == idle["weekly_learning_hours"] == 0
+        assert idle["projected_completion_date"] is None
+
+        # No recent activity: 20 hours left at the planned 2 hours a day
+        velocity = calculate_progress_velocity([path], [], activity)
+        assert velocity["hours_learned_last_30_days"] == 0 and velocity["weekly_learning_hours"] == 0
+        projected = datetime.fromisoformat(velocity["projected_completion_date"])
+        assert abs((projected - datetime.now()).days - 10) <= 1
+    finally:
+        session.close()